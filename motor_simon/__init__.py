@@ -0,0 +1,16 @@
+# motor_simon: lógica del juego compartida por las dos interfaces
+# (simon_dice/ y proyecto_simon_version_2/). Cada una tiene en su main.py un
+# SimonGame delgado que hereda de MotorSimon y conserva sus callbacks.
+
+from motor_simon.compartida import SecuenciaCompartida, VistaSecuencia
+from motor_simon.dificultad import ControlDificultad
+from motor_simon.eventos import (BusEventos, Evento, PartidaIniciada, PartidaTerminada, Presion,
+                                 RondaCompleta, RondaIniciada)
+from motor_simon.motor import ACIERTO, FALLO, IGNORADA, RONDA_COMPLETA, MotorSimon
+
+__all__ = [
+    "MotorSimon", "ACIERTO", "FALLO", "IGNORADA", "RONDA_COMPLETA",
+    "BusEventos", "Evento", "PartidaIniciada", "RondaIniciada", "Presion",
+    "RondaCompleta", "PartidaTerminada", "ControlDificultad",
+    "SecuenciaCompartida", "VistaSecuencia",
+]
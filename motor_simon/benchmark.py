@@ -0,0 +1,295 @@
+# benchmark.py (Suite de benchmarks con línea base guardada)
+#
+# Mide los caminos calientes del motor, solo y a través del SimonGame de cada
+# interfaz, además de la persistencia del récord y la síntesis de sonidos, a
+# varias escalas. Los resultados se comparan con una línea base en JSON: si un
+# camino caliente empeora más que el umbral, el proceso termina con código 1.
+# El reporte legible queda también en bench_output.txt.
+#
+# Uso (desde la raíz del repositorio):
+#   python -m motor_simon.benchmark                   -> compara con bench_baseline.json
+#   python -m motor_simon.benchmark --guardar-base    -> (re)escribe la línea base
+#   python -m motor_simon.benchmark --umbral 0.10 --rapido
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from motor_simon import MotorSimon
+
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVO_BASE = os.path.join(RAIZ_REPO, "bench_baseline.json")
+ARCHIVO_REPORTE = os.path.join(RAIZ_REPO, "bench_output.txt")
+UMBRAL = 0.25   # 25 % más lento que la línea base = regresión
+
+ESCALAS = {
+    "presionar": (10, 1_000, 100_000),       # Largo de la secuencia que se responde
+    "agregar_paso": (100, 10_000),           # Rondas seguidas
+    "record": (10, 1_000),                   # Cargas/guardados seguidos
+    "sintesis": (0.5, 2.0, 8.0),             # Segundos de audio por nota (mínimo 0.3: ataque + cola)
+}
+ESCALAS_RAPIDAS = {
+    "presionar": (10, 1_000),
+    "agregar_paso": (100,),
+    "record": (10,),
+    "sintesis": (0.5,),
+}
+
+
+def cargar_modulo(carpeta, archivo, nombre):
+    """Importa un módulo de una interfaz con un nombre propio (las dos tienen main.py y sonidos.py)."""
+    ruta = os.path.join(RAIZ_REPO, carpeta, archivo)
+    spec = importlib.util.spec_from_file_location(nombre, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(modulo)
+    return modulo
+
+
+def _nada(*args):
+    pass
+
+# ============================================================================
+#  CASOS
+#  Cada caso prepara lo que necesita y devuelve (operaciones, segundos medidos).
+# ============================================================================
+
+def crear_juegos():
+    """(nombre, fábrica del juego, agregar_paso, presionar, traducir) para el motor y cada adaptador."""
+    v2 = cargar_modulo("proyecto_simon_version_2", "main.py", "main_version_2")
+    simon_dice = cargar_modulo("simon_dice", "main.py", "main_simon_dice")
+
+    def juego_sd():
+        juego = simon_dice.SimonGame(_nada, _nada, _nada)
+        juego._high_score = 0   # Sin leer el récord del disco
+        return juego
+
+    def motor_con_bus():
+        motor = MotorSimon()
+        motor.suscribir(_nada)   # Un suscriptor por lotes de todos los eventos
+        return motor
+
+    return [
+        ("motor", MotorSimon, "agregar_paso", "presionar", lambda i: i),
+        ("motor_bus", motor_con_bus, "agregar_paso", "presionar", lambda i: i),
+        ("version_2",
+         lambda: v2.SimonGame(on_update_score=_nada, on_game_over=_nada, on_sequence_done=_nada,
+                              on_delay_request=_nada, on_update_high_score=_nada),
+         "_add_step_to_sequence", "check_player_press", lambda i: i),
+        ("simon_dice", juego_sd, "next_round", "check_player_press", simon_dice.COLORES.__getitem__),
+    ]
+
+
+def caso_agregar_paso(fabrica, metodo, rondas):
+    juego = fabrica()
+    juego.reiniciar()
+    agregar = getattr(juego, metodo)
+    inicio = time.perf_counter()
+    for _ in range(rondas):
+        agregar()
+    return rondas, time.perf_counter() - inicio
+
+
+def caso_presionar(fabrica, metodo_paso, metodo, traducir, largo):
+    """Responde bien una secuencia de 'largo' botones (la última presión completa la ronda)."""
+    juego = fabrica()
+    juego.reiniciar()
+    agregar = getattr(juego, metodo_paso)
+    for _ in range(largo):
+        agregar()
+    juego.player_index = 0
+    if hasattr(juego, "set_player_turn"):
+        juego.set_player_turn(True)
+    presionar = getattr(juego, metodo)
+    presiones = [traducir(b) for b in juego.sequence]
+    inicio = time.perf_counter()
+    for boton in presiones:
+        presionar(boton)
+    segundos = time.perf_counter() - inicio
+    assert juego.score == 1, "La ronda debía completarse sin fallos"
+    return largo, segundos
+
+
+def caso_record(simon_dice, veces):
+    """Alterna guardar un récord nuevo y volver a leerlo del disco (en una carpeta temporal)."""
+    juego = simon_dice.SimonGame(_nada, _nada, _nada)
+    juego._high_score = 0
+    inicio = time.perf_counter()
+    for i in range(1, veces + 1):
+        juego.score = i
+        juego.save_high_score()
+        juego.load_high_score()
+    return veces * 2, time.perf_counter() - inicio
+
+
+def caso_generar_sonido(sonidos, duracion):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sonidos.generar_sonido(440, duracion, nombre_archivo="bench.wav")
+    return 1, time.perf_counter() - inicio
+
+
+def caso_generate_all_sounds(sonidos):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sonidos.generate_all_sounds()
+    return len(sonidos.SONIDOS_A_GENERAR), time.perf_counter() - inicio
+
+
+def armar_casos(escalas):
+    """Lista de (nombre, caliente, función sin argumentos que mide una vez)."""
+    casos = []
+    for nombre, fabrica, paso, presion, traducir in crear_juegos():
+        for largo in escalas["presionar"]:
+            casos.append((f"presionar/{nombre}/{largo}", True,
+                          lambda f=fabrica, p=paso, m=presion, t=traducir, n=largo: caso_presionar(f, p, m, t, n)))
+        for rondas in escalas["agregar_paso"]:
+            casos.append((f"agregar_paso/{nombre}/{rondas}", True,
+                          lambda f=fabrica, p=paso, n=rondas: caso_agregar_paso(f, p, n)))
+
+    simon_dice = cargar_modulo("simon_dice", "main.py", "main_simon_dice")
+    for veces in escalas["record"]:
+        casos.append((f"record/simon_dice/{veces}", False, lambda n=veces: caso_record(simon_dice, n)))
+
+    # La síntesis necesita numpy/scipy; sin ellas esos casos se omiten
+    try:
+        sonidos_sd = cargar_modulo("simon_dice", "sonidos.py", "sonidos_simon_dice")
+        sonidos_v2 = cargar_modulo("proyecto_simon_version_2", "sonidos.py", "sonidos_version_2")
+    except ImportError:
+        print("Sin numpy/scipy: se omiten los casos de síntesis de sonido.")
+        return casos
+    for duracion in escalas["sintesis"]:
+        casos.append((f"generar_sonido/simon_dice/{duracion}s", False,
+                      lambda d=duracion: caso_generar_sonido(sonidos_sd, d)))
+        casos.append((f"generar_sonido/version_2/{duracion}s", False,
+                      lambda d=duracion: caso_generar_sonido(sonidos_v2, d)))
+    casos.append(("generate_all_sounds/version_2", False, lambda: caso_generate_all_sounds(sonidos_v2)))
+    return casos
+
+# ============================================================================
+#  EJECUCIÓN Y COMPARACIÓN
+# ============================================================================
+
+def _una_medicion(correr, minimo_segundos):
+    """Repite el caso hasta juntar 'minimo_segundos' medidos (las escalas chicas son muy ruidosas)."""
+    operaciones = segundos = 0
+    while segundos < minimo_segundos:
+        n, t = correr()
+        operaciones += n
+        segundos += t
+    return segundos / operaciones
+
+
+def medir(casos, repeticiones, minimo_segundos=0.02):
+    """Segundos por operación de cada caso: el mejor de las repeticiones (el menos ruidoso)."""
+    resultados = {}
+    # Todo lo que escriben los casos (récord, WAV) va a una carpeta temporal
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as carpeta:
+        os.chdir(carpeta)
+        # Como en timeit: sin recolector de basura durante la medición
+        gc.disable()
+        try:
+            for nombre, caliente, correr in casos:
+                mejor = min(_una_medicion(correr, minimo_segundos) for _ in range(repeticiones))
+                resultados[nombre] = {"s_por_op": mejor, "caliente": caliente}
+        finally:
+            gc.enable()
+            os.chdir(directorio_original)
+    return resultados
+
+
+def cargar_base(ruta):
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta) as f:
+        return json.load(f)
+
+
+def guardar_base(ruta, resultados):
+    datos = {
+        "version": 1,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "casos": resultados,
+    }
+    with open(ruta, "w") as f:
+        json.dump(datos, f, indent=2, sort_keys=True)
+
+
+def _formato_tiempo(segundos):
+    if segundos < 1e-6:
+        return f"{segundos * 1e9:.0f} ns"
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:.1f} us"
+    return f"{segundos * 1e3:.2f} ms"
+
+
+def comparar(resultados, base, umbral):
+    """Líneas del reporte y lista de regresiones en caminos calientes."""
+    casos_base = base["casos"] if base else {}
+    lineas = [f"{'caso':42}{'actual':>12}{'base':>12}{'cambio':>9}"]
+    regresiones = []
+    for nombre, dato in resultados.items():
+        actual = dato["s_por_op"]
+        anterior = casos_base.get(nombre, {}).get("s_por_op")
+        if anterior is None:
+            lineas.append(f"{nombre:42}{_formato_tiempo(actual):>12}{'-':>12}{'nuevo':>9}")
+            continue
+        cambio = actual / anterior - 1
+        marca = ""
+        if cambio > umbral:
+            marca = "  REGRESIÓN" if dato["caliente"] else "  (más lento)"
+            if dato["caliente"]:
+                regresiones.append(nombre)
+        lineas.append(f"{nombre:42}{_formato_tiempo(actual):>12}{_formato_tiempo(anterior):>12}"
+                      f"{cambio:>+9.0%}{marca}")
+    return lineas, regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de Simón Dice")
+    parser.add_argument("--base", default=ARCHIVO_BASE, help="Archivo JSON de la línea base")
+    parser.add_argument("--guardar-base", action="store_true", help="Escribir los resultados como línea base")
+    parser.add_argument("--umbral", type=float, default=UMBRAL,
+                        help="Empeoramiento tolerado en caminos calientes (0.25 = 25 %%)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--rapido", action="store_true", help="Menos escalas (para iterar)")
+    args = parser.parse_args()
+
+    casos = armar_casos(ESCALAS_RAPIDAS if args.rapido else ESCALAS)
+    resultados = medir(casos, args.repeticiones)
+    base = None if args.guardar_base else cargar_base(args.base)
+    lineas, regresiones = comparar(resultados, base, args.umbral)
+
+    reporte = ["Suite de benchmarks de Simón Dice (mejor de "
+               f"{args.repeticiones} repeticiones, tiempo por operación)",
+               "========================================", *lineas,
+               "========================================"]
+    if base is None:
+        guardar_base(args.base, resultados)
+        reporte.append(f"Línea base guardada en {args.base}")
+    elif regresiones:
+        reporte.append(f"{len(regresiones)} regresión(es) por encima del {args.umbral:.0%}: "
+                       + ", ".join(regresiones))
+    else:
+        reporte.append(f"Sin regresiones por encima del {args.umbral:.0%}")
+
+    texto = "\n".join(reporte)
+    print(texto)
+    with open(ARCHIVO_REPORTE, "w") as f:
+        f.write(texto + "\n")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# compartida.py (Secuencia compartida: muchos motores, un solo búfer de pasos)
+#
+# En modo torneo todos los jugadores enfrentan la misma secuencia. En lugar de
+# que cada MotorSimon guarde su propia copia, hay UN búfer de solo agregar,
+# generado a partir de una semilla, y la secuencia de cada motor es una
+# VistaSecuencia: solo el largo de su ronda actual sobre ese búfer. La memoria
+# es O(largo de la secuencia + jugadores), no O(jugadores x largo).
+#
+# Uso: MotorSimon(secuencia_compartida=SecuenciaCompartida(semilla, num_botones))
+
+import random
+import threading
+from array import array
+
+
+class SecuenciaCompartida:
+    """Secuencia de solo agregar, igual para todos; crece a medida que alguien la necesita."""
+
+    __slots__ = ("semilla", "num_botones", "pasos", "_rnd", "_lock")
+
+    def __init__(self, semilla, num_botones=4):
+        self.semilla = semilla
+        self.num_botones = num_botones
+        self._rnd = random.Random(semilla)
+        self._lock = threading.Lock()
+        self.pasos = array('B')
+
+    def __len__(self):
+        return len(self.pasos)
+
+    def paso(self, i):
+        """Botón en la posición i (se generan los pasos que falten)."""
+        pasos = self.pasos
+        if i < len(pasos):
+            return pasos[i]
+        # Varias sesiones en hilos: el orden de los pasos tiene que ser el de la semilla
+        with self._lock:
+            while len(pasos) <= i:
+                pasos.append(self._rnd.randrange(self.num_botones))
+        return pasos[i]
+
+    def ventana(self, inicio, fin):
+        """Generador con los pasos [inicio, fin) para reproducir una ronda, sin copiar."""
+        self.paso(fin - 1)
+        pasos = self.pasos
+        for i in range(inicio, fin):
+            yield pasos[i]
+
+
+class VistaSecuencia:
+    """
+    La secuencia de una partida en modo compartido: los primeros 'largo' pasos del
+    búfer. Se usa como el array('B') de siempre (len, índice, iteración, append).
+    """
+
+    __slots__ = ("fuente", "largo")
+
+    def __init__(self, fuente, largo=0):
+        self.fuente = fuente
+        self.largo = largo
+
+    def __len__(self):
+        return self.largo
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            # Copia: solo para comparar ventanas (mezclador, instantáneas)
+            return self.fuente.pasos[:self.largo][i]
+        if i < 0:
+            i += self.largo
+        if not 0 <= i < self.largo:
+            raise IndexError("paso fuera de la secuencia")
+        return self.fuente.pasos[i]
+
+    def __iter__(self):
+        pasos = self.fuente.pasos
+        for i in range(self.largo):
+            yield pasos[i]
+
+    def append(self, boton):
+        """Avanza un paso; el botón tiene que ser el que sigue en el búfer compartido."""
+        if boton != self.fuente.paso(self.largo):
+            raise ValueError(f"El paso {self.largo} de la secuencia compartida no es {boton}")
+        self.largo += 1
@@ -0,0 +1,221 @@
+# dificultad.py (Dificultad adaptativa con estadísticas de memoria constante)
+#
+# En lugar de bajar el flash a 0.4/0.3 según el largo de la secuencia, el
+# control mira cómo juega cada jugador: tiempos de reacción (Welford para
+# media/varianza, EWMA para lo reciente, P² para el percentil 90) y dónde se
+# equivoca (posición relativa del error, tasa de fallos). Todo ocupa lo mismo
+# con 10 o con 10 000 presiones (menos de 1 KB por jugador) y actualizarlo
+# cuesta del orden de un microsegundo, así que un proceso lleva miles de jugadores.
+#
+# Benchmark:  python -m motor_simon.dificultad --jugadores 10000
+
+# Antes de juntar estas reacciones se usan los valores fijos (rampa del motor)
+MIN_MUESTRAS = 8
+# Una reacción más lenta que esto es una distracción, no el ritmo del jugador
+MAX_REACCION = 5.0
+
+
+class Welford:
+    """Media y varianza en una pasada (algoritmo de Welford)."""
+
+    __slots__ = ("n", "media", "_m2")
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+
+    def agregar(self, x):
+        self.n += 1
+        delta = x - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (x - self.media)
+
+    @property
+    def varianza(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def desviacion(self):
+        return self.varianza ** 0.5
+
+
+class EWMA:
+    """Promedio móvil exponencial: pesa más lo reciente."""
+
+    __slots__ = ("alfa", "valor")
+
+    def __init__(self, alfa, inicial=None):
+        self.alfa = alfa
+        self.valor = inicial
+
+    def agregar(self, x):
+        if self.valor is None:
+            self.valor = x
+        else:
+            self.valor += self.alfa * (x - self.valor)
+
+
+class CuantilP2:
+    """
+    Estimación de un cuantil sin guardar las muestras: algoritmo P² (Jain y
+    Chlamtac), cinco marcadores que se ajustan con interpolación parabólica.
+    """
+
+    __slots__ = ("p", "n", "_q", "_pos", "_deseada", "_incremento")
+
+    def __init__(self, p):
+        self.p = p
+        self.n = 0
+        self._q = [0.0] * 5
+        self._pos = [1, 2, 3, 4, 5]
+        self._deseada = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self._incremento = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def agregar(self, x):
+        q = self._q
+        if self.n < 5:
+            q[self.n] = x
+            self.n += 1
+            if self.n == 5:
+                q.sort()
+            return
+        self.n += 1
+        pos = self._pos
+
+        # Celda donde cae x (y los extremos se corren si hace falta)
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        deseada = self._deseada
+        for i in range(5):
+            deseada[i] += self._incremento[i]
+
+        # Ajustar los tres marcadores interiores
+        for i in (1, 2, 3):
+            d = deseada[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                d = 1 if d > 0 else -1
+                parabolico = q[i] + d / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + d) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - d) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1]))
+                if q[i - 1] < parabolico < q[i + 1]:
+                    q[i] = parabolico
+                else:
+                    q[i] += d * (q[i + d] - q[i]) / (pos[i + d] - pos[i])
+                pos[i] += d
+
+    def valor(self):
+        if self.n >= 5:
+            return self._q[2]
+        if self.n == 0:
+            return 0.0
+        return sorted(self._q[:self.n])[int(self.p * (self.n - 1))]
+
+
+class ControlDificultad:
+    """
+    Estado de dificultad de un jugador. El motor le informa cada reacción y
+    cada ronda; ajustar() devuelve la duración del flash y la pausa entre flashes.
+    """
+
+    __slots__ = ("reaccion", "reaccion_reciente", "reaccion_p90", "tasa_fallo", "posicion_error",
+                 "flash_min", "flash_max", "pausa_min", "pausa_max")
+
+    def __init__(self, flash_min=0.15, flash_max=0.6, pausa_min=0.08, pausa_max=0.4):
+        self.reaccion = Welford()
+        self.reaccion_reciente = EWMA(0.2)
+        self.reaccion_p90 = CuantilP2(0.9)
+        self.tasa_fallo = EWMA(0.3, inicial=0.0)    # Por ronda: 1 si falló, 0 si la completó
+        self.posicion_error = EWMA(0.3, inicial=0.5)  # 0 = al principio de la secuencia, 1 = al final
+        self.flash_min = flash_min
+        self.flash_max = flash_max
+        self.pausa_min = pausa_min
+        self.pausa_max = pausa_max
+
+    def registrar_reaccion(self, segundos):
+        if segundos > MAX_REACCION:
+            return
+        self.reaccion.agregar(segundos)
+        self.reaccion_reciente.agregar(segundos)
+        self.reaccion_p90.agregar(segundos)
+
+    def registrar_ronda(self, completa, largo=0, posicion_error=0):
+        self.tasa_fallo.agregar(0.0 if completa else 1.0)
+        if not completa and largo:
+            self.posicion_error.agregar(posicion_error / largo)
+
+    def ajustar(self, flash_duration, pausa):
+        """(flash_duration, pausa) para la próxima ronda; sin datos suficientes, los recibidos."""
+        if self.reaccion.n < MIN_MUESTRAS:
+            return flash_duration, pausa
+
+        # El ritmo del jugador: sus reacciones recientes, sin ignorar las más lentas (p90)
+        flash = 0.5 * self.reaccion_reciente.valor + 0.25 * self.reaccion_p90.valor()
+        # Jugadores irregulares necesitan más aire entre flashes
+        pausa = 0.1 + self.reaccion.desviacion
+
+        # Con fallos se afloja: si se equivoca temprano falta tiempo entre pasos;
+        # si se equivoca al final, lo que cuesta es retener la secuencia y se alarga el flash
+        tasa = self.tasa_fallo.valor
+        tardio = self.posicion_error.valor
+        flash *= 1 + tasa * tardio
+        pausa *= 1 + tasa * (1 - tardio)
+
+        return (min(self.flash_max, max(self.flash_min, flash)),
+                min(self.pausa_max, max(self.pausa_min, pausa)))
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+    import time
+    import tracemalloc
+
+    parser = argparse.ArgumentParser(description="Costo del control de dificultad adaptativa")
+    parser.add_argument("--jugadores", type=int, default=10_000)
+    parser.add_argument("--presiones", type=int, default=200, help="Presiones por jugador")
+    args = parser.parse_args()
+
+    rnd = random.Random(3)
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    controles = [ControlDificultad() for _ in range(args.jugadores)]
+    memoria = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+
+    # Cada jugador tiene su propio ritmo; se simulan rondas de 10 presiones
+    ritmos = [rnd.uniform(0.25, 0.9) for _ in range(args.jugadores)]
+    muestras = [[rnd.gauss(ritmo, ritmo * 0.25) for _ in range(64)] for ritmo in ritmos[:256]]
+    inicio = time.perf_counter()
+    for i, control in enumerate(controles):
+        propias = muestras[i % len(muestras)]
+        for j in range(args.presiones):
+            control.registrar_reaccion(propias[j % 64])
+            if j % 10 == 9:
+                control.registrar_ronda(j % 70 != 69, 10, 7)
+                control.ajustar(0.35, 0.25)
+    segundos = time.perf_counter() - inicio
+    operaciones = args.jugadores * args.presiones
+
+    # Precisión del P² contra el percentil exacto
+    exacto = sorted([muestras[0][j % 64] for j in range(args.presiones)])
+    p90_exacto = exacto[int(0.9 * (len(exacto) - 1))]
+
+    print("Dificultad adaptativa: costo por jugador")
+    print("========================================")
+    print(f"Jugadores: {args.jugadores:,}  |  presiones c/u: {args.presiones}")
+    print(f"Memoria por jugador: {memoria / args.jugadores:.0f} B (constante)")
+    print(f"Tiempo por presión (incluye ajustes por ronda): {segundos * 1e9 / operaciones:.0f} ns")
+    print(f"Presiones por segundo en un proceso: {operaciones / segundos:,.0f}")
+    print(f"p90 P²: {controles[0].reaccion_p90.valor():.3f} s  vs exacto: {p90_exacto:.3f} s")
+    print(f"Ajuste del jugador 0: flash/pausa = {controles[0].ajustar(0.35, 0.25)}")
@@ -0,0 +1,114 @@
+# eventos.py (Bus de eventos del motor: varios suscriptores, entrega por lotes)
+#
+# Los callbacks de SimonGame admiten una sola función por gancho y reciben
+# texto ya formateado. El bus publica registros tipados (solo datos); cada
+# suscriptor decide si necesita texto. Por defecto los eventos se juntan y se
+# entregan en lote en los límites de ronda (ronda iniciada, ronda completa,
+# fin de partida); un suscriptor 'inmediato' los recibe al publicarse.
+# Si nadie escucha un tipo de evento, el motor ni siquiera crea el registro.
+
+
+class Evento:
+    """Base de los registros de evento: solo datos, sin formato."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        campos = ", ".join(f"{nombre}={getattr(self, nombre)!r}" for nombre in self.__slots__)
+        return f"{type(self).__name__}({campos})"
+
+
+class PartidaIniciada(Evento):
+    __slots__ = ()
+
+
+class RondaIniciada(Evento):
+    __slots__ = ("largo", "paso", "flash_duration")
+
+    def __init__(self, largo, paso, flash_duration):
+        self.largo = largo
+        self.paso = paso
+        self.flash_duration = flash_duration
+
+
+class Presion(Evento):
+    __slots__ = ("boton", "resultado")
+
+    def __init__(self, boton, resultado):
+        self.boton = boton
+        self.resultado = resultado   # FALLO, ACIERTO o RONDA_COMPLETA
+
+
+class RondaCompleta(Evento):
+    __slots__ = ("score",)
+
+    def __init__(self, score):
+        self.score = score
+
+
+class PartidaTerminada(Evento):
+    __slots__ = ("score", "high_score", "nuevo_record")
+
+    def __init__(self, score, high_score, nuevo_record):
+        self.score = score
+        self.high_score = high_score
+        self.nuevo_record = nuevo_record
+
+
+TIPOS_EVENTO = (PartidaIniciada, RondaIniciada, Presion, RondaCompleta, PartidaTerminada)
+
+
+class BusEventos:
+    """Reparte los eventos del motor entre sus suscriptores."""
+
+    __slots__ = ("activos", "_inmediatos", "_por_lotes", "_pendientes")
+
+    def __init__(self):
+        self.activos = frozenset()  # Tipos con al menos un suscriptor (el motor consulta esto)
+        self._inmediatos = []       # (tipos, función)
+        self._por_lotes = []        # (tipos, función)
+        self._pendientes = []
+
+    def suscribir(self, funcion, *tipos, inmediato=False):
+        """
+        Suscribe 'funcion' a los tipos indicados (todos si no se indica ninguno).
+        Por lotes recibe una lista de eventos; inmediata, un evento por llamada.
+        """
+        tipos = frozenset(tipos or TIPOS_EVENTO)
+        (self._inmediatos if inmediato else self._por_lotes).append((tipos, funcion))
+        self._recalcular()
+        return funcion
+
+    def desuscribir(self, funcion):
+        self._inmediatos = [s for s in self._inmediatos if s[1] is not funcion]
+        self._por_lotes = [s for s in self._por_lotes if s[1] is not funcion]
+        self._recalcular()
+
+    def _recalcular(self):
+        activos = set()
+        for tipos, _ in self._inmediatos + self._por_lotes:
+            activos |= tipos
+        self.activos = frozenset(activos)
+        if not self._por_lotes:
+            self._pendientes.clear()
+
+    def publicar(self, evento):
+        tipo = type(evento)
+        for tipos, funcion in self._inmediatos:
+            if tipo in tipos:
+                funcion(evento)
+        if self._por_lotes:
+            self._pendientes.append(evento)
+
+    def vaciar(self):
+        """Límite de ronda: entrega a cada suscriptor por lotes los eventos acumulados de sus tipos."""
+        if not self._pendientes:
+            return
+        lote, self._pendientes = self._pendientes, []
+        for tipos, funcion in self._por_lotes:
+            if len(tipos) == len(TIPOS_EVENTO):
+                funcion(lote)
+            else:
+                propios = [evento for evento in lote if type(evento) in tipos]
+                if propios:
+                    funcion(propios)
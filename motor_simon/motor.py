@@ -0,0 +1,186 @@
+# motor.py (Núcleo del juego Simón Dice, sin interfaz ni callbacks)
+#
+# El estado vive en __slots__ y los botones son enteros (0..num_botones-1);
+# cada interfaz traduce sus nombres de color a índices. presionar() devuelve
+# un código y no llama a nadie: los adaptadores deciden qué callbacks disparar.
+# Para varios oyentes a la vez (interfaz, registro, métricas) está el bus de
+# eventos (eventos.py); sin suscriptores no cuesta más que una comparación.
+
+import random
+import time
+from array import array
+
+from motor_simon.compartida import VistaSecuencia
+from motor_simon.eventos import (BusEventos, PartidaIniciada, PartidaTerminada, Presion,
+                                 RondaCompleta, RondaIniciada)
+
+# Resultados de presionar()
+IGNORADA = -1        # No hay partida activa
+FALLO = 0
+ACIERTO = 1
+RONDA_COMPLETA = 2
+
+
+class MotorSimon:
+    """Secuencia, avance del jugador, puntaje y récord de una partida."""
+
+    __slots__ = (
+        "sequence", "player_index", "score", "high_score", "game_active",
+        "flash_duration", "flash_inicial", "rampa_flash", "pausa_flash", "pausa_inicial",
+        "num_botones", "modo_maraton", "ventana_maraton", "eventos",
+        "dificultad", "_marca_turno", "compartida",
+    )
+
+    def __init__(self, num_botones=4, flash_duration=0.35, rampa_flash=(),
+                 modo_maraton=False, ventana_maraton=8, pausa_flash=0.25, dificultad=None,
+                 secuencia_compartida=None):
+        self.num_botones = num_botones
+        self.flash_inicial = flash_duration
+        self.flash_duration = flash_duration
+        # Pares (largo mínimo, duración): a partir de ese largo el flash dura eso
+        self.rampa_flash = tuple(rampa_flash)
+        # Pausa entre un flash y el siguiente al mostrar la secuencia
+        self.pausa_inicial = pausa_flash
+        self.pausa_flash = pausa_flash
+
+        # Dificultad adaptativa (ControlDificultad): si está, decide flash y pausa
+        # de cada ronda a partir de las reacciones del jugador
+        self.dificultad = dificultad
+        self._marca_turno = None
+
+        # Modo maratón: cada ronda solo se muestran (y se piden) los últimos
+        # 'ventana_maraton' pasos, así el costo por ronda no crece con la secuencia.
+        self.modo_maraton = modo_maraton
+        self.ventana_maraton = ventana_maraton
+
+        # Modo compartido (torneo, ver compartida.py): los pasos salen de un búfer
+        # común a todos los motores y la secuencia propia es solo una vista
+        if secuencia_compartida is not None and secuencia_compartida.num_botones != num_botones:
+            raise ValueError("La secuencia compartida es de otro tamaño de tablero")
+        self.compartida = secuencia_compartida
+
+        self.sequence = self._secuencia_vacia()  # Índices de botón, 1 byte c/u
+        self.player_index = 0
+        self.score = 0
+        self.high_score = 0
+        self.game_active = False
+        self.eventos = None         # BusEventos, se crea con la primera suscripción
+
+    def suscribir(self, funcion, *tipos, inmediato=False):
+        """Suscribe 'funcion' a eventos del motor (ver BusEventos.suscribir)."""
+        if self.eventos is None:
+            self.eventos = BusEventos()
+        return self.eventos.suscribir(funcion, *tipos, inmediato=inmediato)
+
+    def _secuencia_vacia(self):
+        if self.compartida is None:
+            return array('B')
+        return VistaSecuencia(self.compartida)
+
+    def reiniciar(self):
+        """Deja el estado listo para una partida nueva (sin pasos todavía)."""
+        self.sequence = self._secuencia_vacia()
+        self.player_index = 0
+        self.score = 0
+        self.flash_duration = self.flash_inicial
+        self.pausa_flash = self.pausa_inicial
+        self._marca_turno = None
+        self.game_active = True
+        eventos = self.eventos
+        if eventos is not None and PartidaIniciada in eventos.activos:
+            eventos.publicar(PartidaIniciada())
+
+    def agregar_paso(self):
+        """Agrega un botón (al azar o del búfer compartido), vuelve al inicio de la ventana y aplica la rampa de flash."""
+        if self.compartida is None:
+            nuevo = random.randrange(self.num_botones)
+        else:
+            nuevo = self.compartida.paso(len(self.sequence))
+        self.sequence.append(nuevo)
+        self.player_index = self.inicio_ventana()
+        largo = len(self.sequence)
+        for largo_minimo, duracion in self.rampa_flash:
+            if largo >= largo_minimo:
+                self.flash_duration = duracion
+        if self.dificultad is not None:
+            self.flash_duration, self.pausa_flash = self.dificultad.ajustar(self.flash_duration,
+                                                                            self.pausa_flash)
+        eventos = self.eventos
+        if eventos is not None and eventos.activos:
+            if RondaIniciada in eventos.activos:
+                eventos.publicar(RondaIniciada(largo, nuevo, self.flash_duration))
+            eventos.vaciar()
+        return nuevo
+
+    def iniciar_turno(self):
+        """La interfaz terminó de mostrar la secuencia: desde aquí se mide la reacción."""
+        if self.dificultad is not None:
+            self._marca_turno = time.perf_counter()
+
+    def presionar(self, boton):
+        """Compara la presión con el paso esperado. Devuelve IGNORADA, FALLO, ACIERTO o RONDA_COMPLETA."""
+        if not self.game_active:
+            return IGNORADA
+        sequence = self.sequence
+        eventos = self.eventos
+        dificultad = self.dificultad
+        if dificultad is not None and self._marca_turno is not None:
+            # Reacción: desde el inicio del turno o desde la presión anterior
+            ahora = time.perf_counter()
+            dificultad.registrar_reaccion(ahora - self._marca_turno)
+            self._marca_turno = ahora
+        if boton != sequence[self.player_index]:
+            if dificultad is not None:
+                dificultad.registrar_ronda(False, len(sequence), self.player_index)
+                self._marca_turno = None
+            if eventos is not None and Presion in eventos.activos:
+                eventos.publicar(Presion(boton, FALLO))
+            return FALLO
+        self.player_index += 1
+        if self.player_index < len(sequence):
+            if eventos is not None and Presion in eventos.activos:
+                eventos.publicar(Presion(boton, ACIERTO))
+            return ACIERTO
+        # Ronda completa: el jugador empezará desde el inicio de la próxima ventana
+        self.score += 1
+        self.player_index = self.inicio_ventana(len(sequence) + 1)
+        if dificultad is not None:
+            dificultad.registrar_ronda(True)
+            self._marca_turno = None
+        if eventos is not None and eventos.activos:
+            if Presion in eventos.activos:
+                eventos.publicar(Presion(boton, RONDA_COMPLETA))
+            if RondaCompleta in eventos.activos:
+                eventos.publicar(RondaCompleta(self.score))
+            eventos.vaciar()
+        return RONDA_COMPLETA
+
+    def terminar(self):
+        """Termina la partida. Devuelve True si el puntaje es un récord nuevo."""
+        self.game_active = False
+        nuevo_record = self.score > self.high_score
+        if nuevo_record:
+            self.high_score = self.score
+        eventos = self.eventos
+        if eventos is not None and eventos.activos:
+            if PartidaTerminada in eventos.activos:
+                eventos.publicar(PartidaTerminada(self.score, self.high_score, nuevo_record))
+            eventos.vaciar()
+        return nuevo_record
+
+    def inicio_ventana(self, largo=None):
+        """Primer paso que se reproduce (y se pide) en una ronda con 'largo' pasos."""
+        if largo is None:
+            largo = len(self.sequence)
+        if not self.modo_maraton:
+            return 0
+        return max(0, largo - self.ventana_maraton)
+
+    def iterar_reproduccion(self):
+        """
+        Generador con los botones a mostrar en la ronda actual.
+        No copia la secuencia: recorre por índice solo la ventana de la ronda.
+        """
+        secuencia = self.sequence
+        for i in range(self.inicio_ventana(), len(secuencia)):
+            yield secuencia[i]
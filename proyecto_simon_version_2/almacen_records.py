@@ -0,0 +1,121 @@
+# almacen_records.py (Tabla de récords compartida entre procesos, en SQLite)
+#
+# Con varios procesos sirviendo partidas (ver lanzador_web.py) no sirve que
+# cada uno reescriba su propio archivo de récord: el último en escribir pisa a
+# los demás. Aquí todas las partidas terminadas van a una sola base SQLite en
+# modo WAL: los lectores no bloquean al escritor, cada registro es una
+# transacción corta (BEGIN IMMEDIATE) y si dos procesos escriben a la vez el
+# segundo espera (busy_timeout) en lugar de fallar. El récord es MAX(puntaje)
+# sobre un índice, así que leerlo no depende de cuántas partidas haya.
+#
+# Uso: python almacen_records.py [ruta]   -> muestra los 10 mejores
+
+import os
+import sqlite3
+import threading
+import time
+
+ARCHIVO_RECORDS = "storage/simon_records.db"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS partidas (
+    id INTEGER PRIMARY KEY,
+    jugador TEXT NOT NULL,
+    puntaje INTEGER NOT NULL,
+    fecha REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS partidas_puntaje ON partidas (puntaje DESC);
+"""
+
+
+class AlmacenRecords:
+    """Récords compartidos. Cada hilo usa su propia conexión (sqlite3 no las comparte entre hilos)."""
+
+    def __init__(self, ruta=ARCHIVO_RECORDS, espera=10.0):
+        carpeta = os.path.dirname(ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        self.ruta = ruta
+        self.espera = espera        # Segundos que un escritor espera el lock antes de fallar
+        self._local = threading.local()
+        # Una sola conexión para lecturas desde hilos de corta vida (ver resumen)
+        self._compartida = None
+        self._lock_compartida = threading.Lock()
+        conexion = self._conexion()
+        # WAL queda guardado en el archivo: basta con pedirlo una vez
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.executescript(ESQUEMA)
+
+    def _conexion(self):
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            # isolation_level=None: las transacciones se abren a mano (BEGIN IMMEDIATE)
+            conexion = sqlite3.connect(self.ruta, timeout=self.espera, isolation_level=None)
+            # En WAL, NORMAL no hace fsync en cada commit y sigue siendo consistente ante un corte
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = conexion
+        return conexion
+
+    def registrar(self, puntaje, jugador=""):
+        """Guarda una partida terminada y devuelve el récord vigente (incluida esta partida)."""
+        conexion = self._conexion()
+        # IMMEDIATE toma el lock de escritura al empezar: el MAX leído ya incluye esta partida
+        conexion.execute("BEGIN IMMEDIATE")
+        try:
+            conexion.execute("INSERT INTO partidas (jugador, puntaje, fecha) VALUES (?, ?, ?)",
+                             (jugador, puntaje, time.time()))
+            record = conexion.execute("SELECT MAX(puntaje) FROM partidas").fetchone()[0]
+            conexion.execute("COMMIT")
+        except BaseException:
+            conexion.execute("ROLLBACK")
+            raise
+        return record
+
+    def record(self):
+        """El mejor puntaje registrado por cualquier proceso (0 si no hay partidas)."""
+        return self._conexion().execute("SELECT MAX(puntaje) FROM partidas").fetchone()[0] or 0
+
+    def mejores(self, cantidad=10):
+        """Lista de (jugador, puntaje, fecha), de mayor a menor puntaje."""
+        return self._conexion().execute(
+            "SELECT jugador, puntaje, fecha FROM partidas ORDER BY puntaje DESC, fecha LIMIT ?",
+            (cantidad,)).fetchall()
+
+    def total_partidas(self):
+        return self._conexion().execute("SELECT COUNT(*) FROM partidas").fetchone()[0]
+
+    def resumen(self):
+        """
+        (récord, total de partidas) desde una conexión compartida por todos los hilos,
+        detrás de un lock. Es para servidores con un hilo nuevo por pedido (el
+        despachador de lanzador_web.py): con _conexion() cada uno abriría la suya
+        y quedaría abierta hasta que el recolector se acuerde de ella.
+        """
+        with self._lock_compartida:
+            if self._compartida is None:
+                self._compartida = sqlite3.connect(self.ruta, timeout=self.espera, isolation_level=None,
+                                                   check_same_thread=False)
+            record = self._compartida.execute("SELECT MAX(puntaje) FROM partidas").fetchone()[0] or 0
+            total = self._compartida.execute("SELECT COUNT(*) FROM partidas").fetchone()[0]
+        return record, total
+
+    def cerrar(self):
+        """Cierra la conexión del hilo actual y la compartida de resumen()."""
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is not None:
+            conexion.close()
+            self._local.conexion = None
+        with self._lock_compartida:
+            if self._compartida is not None:
+                self._compartida.close()
+                self._compartida = None
+
+
+if __name__ == "__main__":
+    import sys
+
+    almacen = AlmacenRecords(sys.argv[1] if len(sys.argv) > 1 else ARCHIVO_RECORDS)
+    print(f"Récords en {almacen.ruta} ({almacen.total_partidas()} partidas)")
+    print("========================================")
+    for posicion, (jugador, puntaje, fecha) in enumerate(almacen.mejores(), start=1):
+        print(f"{posicion:>3}. {puntaje:>5}  {jugador or '-':<20}{time.strftime('%Y-%m-%d %H:%M', time.localtime(fecha))}")
@@ -0,0 +1,331 @@
+# anfitrion_sesiones.py (Muchas partidas independientes en un solo event loop)
+#
+# En la versión web cada jugador tiene su SimonGame, su SimonFletApp y sus
+# propios hilos. Aquí un AnfitrionSesiones aloja miles de partidas en UN solo
+# loop de asyncio:
+#   - el estado de cada sesión usa __slots__ (sin __dict__ por sesión),
+#   - todos los retardos del juego pasan por el planificador compartido del
+#     loop (call_later), sin hilos ni tareas por sesión,
+#   - los recursos de solo lectura (tablero, sonidos) se comparten,
+#   - cada sesión tiene un presupuesto de memoria que se hace cumplir al
+#     abrirla y en cada ronda (con su tamaño real, medido con tracemalloc),
+#   - con una semilla de torneo todas las sesiones leen la misma secuencia
+#     (ver torneo.py) y el anfitrión lleva la clasificación.
+#
+# Benchmark:
+#   python anfitrion_sesiones.py                       -> 1 000 y 10 000 sesiones
+#   python anfitrion_sesiones.py --sesiones 5000 --segundos 20
+#   python anfitrion_sesiones.py --sesiones 1000 --torneo 2024
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from main import SimonGame, COLORES, SIMON_SOUNDS_MAP
+from torneo import Torneo
+
+
+class RecursosCompartidos:
+    """Datos de solo lectura que comparten todas las sesiones del proceso."""
+
+    __slots__ = ("num_botones", "sonidos")
+
+    def __init__(self, num_botones=len(COLORES)):
+        self.num_botones = num_botones
+        self.sonidos = tuple(SIMON_SOUNDS_MAP[color] for color in COLORES[:num_botones])
+
+
+class Sesion:
+    """Estado de una sesión: el juego, su temporizador pendiente y sus métricas."""
+
+    __slots__ = ("id", "game", "temporizador", "turno", "salida", "presiones", "cerrada")
+
+    def __init__(self, id_sesion, game, salida):
+        self.id = id_sesion
+        self.game = game
+        self.temporizador = None    # asyncio.TimerHandle de la acción diferida actual
+        self.turno = False          # True mientras el jugador puede presionar
+        self.salida = salida        # Función (sesion, evento, dato) hacia el cliente
+        self.presiones = 0
+        self.cerrada = False
+
+    def bytes_secuencia(self):
+        """Lo que crece con la partida: la secuencia (el resto de la sesión tiene tamaño fijo)."""
+        return sys.getsizeof(self.game.sequence)
+
+
+class SesionExcedida(Exception):
+    """La sesión superó su presupuesto de memoria."""
+
+
+class AnfitrionSesiones:
+    """Aloja muchas partidas en el loop actual, con un planificador compartido."""
+
+    def __init__(self, recursos=None, limite_bytes_sesion=16 * 1024, flash_duration=0.35,
+                 escala_tiempo=1.0, semilla_torneo=None):
+        self.loop = asyncio.get_running_loop()
+        self.recursos = recursos or RecursosCompartidos()
+        # Modo torneo: una sola secuencia para todas las sesiones y su clasificación
+        self.torneo = None
+        if semilla_torneo is not None:
+            self.torneo = Torneo(semilla_torneo, self.recursos.num_botones)
+        self.limite_bytes_sesion = limite_bytes_sesion
+        self.flash_duration = flash_duration
+        self.escala_tiempo = escala_tiempo  # < 1 acelera todos los retardos (pruebas de carga)
+        self.sesiones = {}
+        self._siguiente_id = 0
+        # Memoria real de una sesión recién abierta, medida al abrir la primera (ver _medir_sesion)
+        self.bytes_base_sesion = None
+        self._bytes_secuencia_vacia = 0
+
+        # Métricas
+        # Segundos desde la llegada de la presión hasta el veredicto (las últimas, no todas:
+        # el anfitrión vive mucho y la lista no puede crecer con cada presión)
+        self.latencias = deque(maxlen=100_000)
+        self.veredictos = 0
+        self.expulsadas = 0
+
+    # --- Ciclo de vida de las sesiones ---
+
+    def abrir(self, salida=None):
+        """
+        Crea una sesión nueva y arranca su partida. Devuelve la sesión; si ya al abrir
+        no entra en el presupuesto de memoria, la cierra y lanza SesionExcedida.
+        """
+        if self.bytes_base_sesion is None:
+            self.bytes_base_sesion = self._medir_sesion()
+        self._siguiente_id += 1
+        sesion = self._crear(self._siguiente_id, salida)
+        self.sesiones[sesion.id] = sesion
+        sesion.game.start_game()
+        self._verificar_memoria(sesion)
+        return sesion
+
+    def _crear(self, id_sesion, salida):
+        game = SimonGame(flash_duration=self.flash_duration, num_botones=self.recursos.num_botones,
+                         secuencia_compartida=self.torneo.secuencia if self.torneo is not None else None)
+        sesion = Sesion(id_sesion, game, salida)
+        if self.torneo is not None:
+            self.torneo.inscribir(f"sesion{sesion.id}", game)
+
+        # Los callbacks del juego llevan a la sesión; ninguno crea hilos ni tareas
+        game.on_delay_request = lambda action, seconds: self._programar(sesion, action, seconds)
+        game.on_sequence_done = lambda sequence, flash: self._reproducir(sesion, sequence, flash)
+        game.on_game_over = lambda texto: self._notificar(sesion, "game_over", texto)
+        game.on_update_score = None     # Los textos solo se arman si el cliente los pide
+        game.on_update_high_score = None
+        return sesion
+
+    def _medir_sesion(self, muestras=256):
+        """
+        Bytes que reserva de verdad una sesión abierta: el juego, sus callbacks (closures),
+        el temporizador pendiente, su lugar en self.sesiones y, en torneo, su bus de
+        eventos y su clave. getsizeof de los objetos con __slots__ ve menos de un cuarto
+        de eso, así que se mide una vez con tracemalloc sobre unas sesiones de prueba
+        (promediadas: el diccionario crece a saltos) que después se descartan.
+        """
+        midiendo = tracemalloc.is_tracing()
+        if not midiendo:
+            tracemalloc.start()
+        try:
+            # La primera paga cachés de tipos y de código: no entra en la medida
+            for cantidad in (1, muestras):
+                antes = tracemalloc.get_traced_memory()[0]
+                prueba = []
+                for i in range(cantidad):
+                    sesion = self._crear(-1000 - i, None)
+                    self.sesiones[sesion.id] = sesion
+                    sesion.game.start_game()
+                    prueba.append(sesion)
+                bytes_sesion = (tracemalloc.get_traced_memory()[0] - antes) // cantidad
+                self._bytes_secuencia_vacia = prueba[0].bytes_secuencia()
+                for sesion in prueba:
+                    self.cerrar(sesion)
+                    if self.torneo is not None:
+                        self.torneo.retirar(f"sesion{sesion.id}", conservar=False)
+        finally:
+            if not midiendo:
+                tracemalloc.stop()
+        return bytes_sesion
+
+    def bytes_sesion(self, sesion):
+        """Memoria de la sesión: la medida al abrir más lo que creció su secuencia."""
+        return self.bytes_base_sesion + sesion.bytes_secuencia() - self._bytes_secuencia_vacia
+
+    def cerrar(self, sesion):
+        """Cancela lo pendiente y libera la sesión."""
+        if sesion.cerrada:
+            return
+        sesion.cerrada = True
+        if sesion.temporizador is not None:
+            sesion.temporizador.cancel()
+            sesion.temporizador = None
+        sesion.game.game_active = False
+        self.sesiones.pop(sesion.id, None)
+        if self.torneo is not None:
+            self.torneo.retirar(f"sesion{sesion.id}")
+
+    # --- Planificador compartido ---
+
+    def _programar(self, sesion, action, seconds):
+        if sesion.cerrada:
+            return
+        if sesion.temporizador is not None:
+            sesion.temporizador.cancel()
+        sesion.temporizador = self.loop.call_later(seconds * self.escala_tiempo, self._ejecutar, sesion, action)
+
+    def _ejecutar(self, sesion, action):
+        sesion.temporizador = None
+        if not sesion.cerrada:
+            action()
+
+    def _reproducir(self, sesion, sequence, flash_duration):
+        """El cliente anima la ronda; aquí solo se espera lo que dura y se da el turno."""
+        if sesion.game.modo_maraton:
+            pasos = sum(1 for _ in sequence)
+        else:
+            pasos = len(sesion.game.sequence)
+        try:
+            self._verificar_memoria(sesion)
+        except SesionExcedida:
+            return
+        sesion.turno = False
+        self._notificar(sesion, "ronda", pasos)
+        duracion = pasos * (flash_duration + sesion.game.pausa_flash)
+        self._programar(sesion, lambda: self._dar_turno(sesion), duracion)
+
+    def _dar_turno(self, sesion):
+        sesion.turno = True
+        sesion.game.iniciar_turno()
+        self._notificar(sesion, "turno", None)
+
+    def _verificar_memoria(self, sesion):
+        if self.bytes_sesion(sesion) > self.limite_bytes_sesion:
+            self.expulsadas += 1
+            self._notificar(sesion, "expulsada", "memoria")
+            self.cerrar(sesion)
+            raise SesionExcedida(sesion.id)
+
+    def _notificar(self, sesion, evento, dato):
+        if sesion.salida is not None:
+            sesion.salida(sesion, evento, dato)
+
+    # --- Entrada del jugador ---
+
+    def presionar(self, sesion, boton, llegada=None):
+        """
+        Procesa una presión. 'llegada' es el instante (loop.time()) en que llegó;
+        la diferencia con el momento del veredicto es la latencia que se registra.
+        """
+        if sesion.cerrada or not sesion.turno:
+            return None
+        sesion.presiones += 1
+        puntaje_antes = sesion.game.score
+        correcto = sesion.game.check_player_press(boton)
+        if not correcto or sesion.game.score != puntaje_antes:
+            # Fallo o ronda completa: hasta la próxima reproducción no es su turno
+            sesion.turno = False
+        if llegada is not None:
+            self.latencias.append(self.loop.time() - llegada)
+        self.veredictos += 1
+        return correcto
+
+    def bytes_totales(self):
+        return sum(self.bytes_sesion(sesion) for sesion in self.sesiones.values())
+
+# ============================================================================
+#  BENCHMARK DE CARGA
+# ============================================================================
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+async def _carga(num_sesiones, segundos, escala_tiempo, reaccion, prob_error, semilla_torneo=None):
+    """Abre N sesiones con jugadores simulados y mide durante 'segundos'."""
+    tracemalloc.start()
+    memoria_inicial = tracemalloc.get_traced_memory()[0]
+    loop = asyncio.get_running_loop()
+    anfitrion = AnfitrionSesiones(escala_tiempo=escala_tiempo, semilla_torneo=semilla_torneo)
+    rnd = random.Random(1234)
+
+    def jugar(sesion, evento, dato):
+        # Jugador simulado: en su turno contesta la ventana con un tiempo de reacción
+        if evento == "turno":
+            game = sesion.game
+            demora = 0.0
+            for i in range(game.inicio_ventana(), len(game.sequence)):
+                demora += rnd.uniform(*reaccion) * escala_tiempo
+                boton = game.sequence[i]
+                if rnd.random() < prob_error:
+                    boton = (boton + 1) % game.num_botones
+                llegada = loop.time() + demora
+                loop.call_later(demora, anfitrion.presionar, sesion, boton, llegada)
+        elif evento == "game_over":
+            # Se reemplaza por una sesión nueva para mantener la carga constante
+            anfitrion.cerrar(sesion)
+            anfitrion.abrir(jugar)
+
+    inicio_apertura = time.perf_counter()
+    for _ in range(num_sesiones):
+        anfitrion.abrir(jugar)
+    apertura_ms = (time.perf_counter() - inicio_apertura) * 1000
+    memoria_sesiones = tracemalloc.get_traced_memory()[0] - memoria_inicial
+    # tracemalloc se apaga durante la medición de latencia: su costo distorsionaría el p99
+    tracemalloc.stop()
+
+    await asyncio.sleep(segundos)
+
+    bytes_estimados = anfitrion.bytes_totales() / max(1, len(anfitrion.sesiones))
+    for sesion in list(anfitrion.sesiones.values()):
+        anfitrion.cerrar(sesion)
+
+    latencias = anfitrion.latencias
+    return {
+        "sesiones": num_sesiones,
+        "apertura_ms": apertura_ms,
+        "bytes_por_sesion": memoria_sesiones / num_sesiones,
+        "bytes_estimados_sesion": bytes_estimados,
+        "presiones_seg": anfitrion.veredictos / segundos,
+        "p50_ms": _percentil(latencias, 0.50) * 1000,
+        "p99_ms": _percentil(latencias, 0.99) * 1000,
+        "expulsadas": anfitrion.expulsadas,
+        "podio": anfitrion.torneo.clasificacion(3) if anfitrion.torneo is not None else [],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del anfitrión de sesiones de Simon Dice")
+    parser.add_argument("--sesiones", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--segundos", type=float, default=10.0, help="Duración de cada medición")
+    parser.add_argument("--escala", type=float, default=1.0,
+                        help="Factor de tiempo para retardos y reacciones (0.1 = 10x más rápido)")
+    parser.add_argument("--error", type=float, default=0.02, help="Probabilidad de que el bot falle")
+    parser.add_argument("--torneo", type=int, default=None, metavar="SEMILLA",
+                        help="Todas las sesiones juegan la misma secuencia (modo torneo)")
+    args = parser.parse_args()
+
+    print("Anfitrión de sesiones de Simon Dice (un solo event loop)")
+    print("========================================")
+    print(f"{'sesiones':>9}{'apertura ms':>13}{'B/sesión':>10}{'B estimados':>13}"
+          f"{'presiones/s':>13}{'p50 ms':>9}{'p99 ms':>9}{'expulsadas':>12}")
+    for n in args.sesiones:
+        r = asyncio.run(_carga(n, args.segundos, args.escala, (0.2, 0.6), args.error, args.torneo))
+        print(f"{r['sesiones']:>9}{r['apertura_ms']:>13.1f}{r['bytes_por_sesion']:>10.0f}"
+              f"{r['bytes_estimados_sesion']:>13.0f}{r['presiones_seg']:>13.0f}"
+              f"{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['expulsadas']:>12}")
+        for posicion, nombre, score, activo in r["podio"]:
+            print(f"{'':>9}  torneo {posicion}. {nombre}  {score} pts{'' if activo else '  (eliminado)'}")
+    print("========================================")
+    print(f"Capacidad por memoria: ~{1024 ** 3 / r['bytes_por_sesion']:,.0f} sesiones por GB en un proceso")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# arranque.py (Línea de tiempo del arranque en frío)
+#
+# Se importa antes que flet para tomar el instante cero lo más temprano
+# posible. Cada hito se guarda en milisegundos desde ese instante, así una
+# regresión en el tiempo de importación, del primer frame o de la entrada
+# lista se ve directamente en el resumen.
+
+import os
+import time
+
+T_INICIO = time.perf_counter()
+
+# Hitos en el orden en que deberían ocurrir; marcar() no acepta otros
+MODULOS_IMPORTADOS = "modulos_importados"
+APP_CREADA = "app_creada"
+PRIMER_FRAME = "primer_frame"
+AUDIO_LISTO = "audio_listo"
+ENTRADA_LISTA = "entrada_lista"
+HITOS = (MODULOS_IMPORTADOS, APP_CREADA, PRIMER_FRAME, AUDIO_LISTO, ENTRADA_LISTA)
+
+
+class LineaTiempoArranque:
+    """Registra hitos del arranque (ms desde T_INICIO). Cada hito se marca una sola vez."""
+
+    def __init__(self, inicio=T_INICIO):
+        self.inicio = inicio
+        self.hitos = {}
+        self.impreso = False
+
+    def marcar(self, nombre):
+        if nombre not in HITOS:
+            raise ValueError(f"Hito de arranque desconocido: {nombre}")
+        if nombre not in self.hitos:
+            self.hitos[nombre] = (time.perf_counter() - self.inicio) * 1000
+        return self.hitos[nombre]
+
+    def completa(self):
+        return PRIMER_FRAME in self.hitos and ENTRADA_LISTA in self.hitos
+
+    def resumen(self):
+        """
+        Texto con los hitos en el orden de HITOS. Uno que llegó antes que el anterior
+        se marca (en arranque rápido el audio puede terminar después de la entrada).
+        """
+        lineas = ["--- ARRANQUE (ms desde el inicio) ---"]
+        anterior = 0.0
+        for nombre in HITOS:
+            ms = self.hitos.get(nombre)
+            if ms is None:
+                lineas.append(f"{nombre:<20}{'-':>10}")
+                continue
+            nota = "  (fuera de orden)" if ms < anterior else ""
+            lineas.append(f"{nombre:<20}{ms:10.1f}{nota}")
+            anterior = max(anterior, ms)
+        return "\n".join(lineas)
+
+    def imprimir_una_vez(self):
+        """Imprime el resumen la primera vez que se completa (si SIMON_PERFIL_ARRANQUE no es '0')."""
+        if self.impreso or not self.completa():
+            return
+        self.impreso = True
+        if os.environ.get("SIMON_PERFIL_ARRANQUE", "1") != "0":
+            print(self.resumen())
+
+
+# Línea de tiempo compartida por todo el proceso
+linea_tiempo = LineaTiempoArranque()
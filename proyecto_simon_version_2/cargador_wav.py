@@ -0,0 +1,267 @@
+# cargador_wav.py (Cargador de WAV por memoria mapeada, sin copias)
+#
+# Lee la cabecera RIFF a mano y expone el bloque PCM ('data') como una vista
+# np.memmap de solo lectura. No se copia nada: las páginas del archivo las
+# comparte el sistema operativo, y dentro del proceso todas las partes que
+# pidan el mismo archivo (mezclador, validación, vistas previas de temas)
+# reciben exactamente la misma vista gracias a una caché (una entrada por
+# archivo: si el archivo se reescribe, la entrada se reemplaza).
+#
+# Memoria: las páginas de un memmap son del archivo (RssFile), compartidas
+# entre procesos y recuperables por el sistema; las de scipy son memoria
+# privada (RssAnon) y se copian por cada consumidor. El benchmark las reporta
+# por separado, después de un calentamiento (el primer uso de numpy no es
+# memoria del audio) y después de recorrer los datos. Con memmap la memoria
+# privada no crece con el tamaño de los archivos ni con los consumidores.
+#
+# Uso como benchmark:
+#   python cargador_wav.py                      -> compara con scipy.io.wavfile.read
+#   python cargador_wav.py --segundos 120       -> con un WAV grande generado al vuelo
+#   python cargador_wav.py archivo1.wav ...     -> con archivos concretos
+
+import os
+import struct
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+# Códigos de formato de la cabecera 'fmt '
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_MULAW = 7
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+SonidoWav = namedtuple("SonidoWav", ["sample_rate", "canales", "bits", "formato", "datos"])
+
+_cache = {}        # Ruta real -> (mtime_ns, tamaño, SonidoWav)
+_cache_lock = threading.Lock()
+
+
+def _tipo_numpy(formato, bits):
+    """Traduce (formato, bits por muestra) al dtype de numpy que describe el PCM."""
+    if formato == WAVE_FORMAT_PCM:
+        tipos = {8: np.uint8, 16: np.dtype("<i2"), 32: np.dtype("<i4")}
+    elif formato == WAVE_FORMAT_IEEE_FLOAT:
+        tipos = {32: np.dtype("<f4"), 64: np.dtype("<f8")}
+    elif formato == WAVE_FORMAT_MULAW:
+        # Se expone el byte crudo: decodificarlo implicaría una copia
+        tipos = {8: np.uint8}
+    else:
+        tipos = {}
+    if bits not in tipos:
+        raise ValueError(f"Formato WAV no soportado (formato={formato}, bits={bits})")
+    return tipos[bits]
+
+
+def leer_cabecera(ruta):
+    """
+    Recorre los chunks RIFF y devuelve (sample_rate, canales, bits, formato, offset_datos, bytes_datos).
+    Solo se leen las cabeceras, nunca el bloque de audio.
+    """
+    with open(ruta, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"{ruta} no es un archivo WAV (RIFF/WAVE)")
+
+        formato = None
+        while True:
+            cabecera = f.read(8)
+            if len(cabecera) < 8:
+                raise ValueError(f"{ruta} no tiene bloque 'data'")
+            chunk_id, chunk_size = struct.unpack("<4sI", cabecera)
+
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                formato, canales, sample_rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+                if formato == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                    # El formato real son los dos primeros bytes del SubFormat GUID
+                    formato = struct.unpack("<H", fmt[24:26])[0]
+            elif chunk_id == b"data":
+                if formato is None:
+                    raise ValueError(f"{ruta}: el bloque 'data' aparece antes que 'fmt '")
+                offset = f.tell()
+                # Algunos escritores dejan el tamaño en 0/0xFFFFFFFF al hacer streaming
+                disponible = os.path.getsize(ruta) - offset
+                if chunk_size == 0 or chunk_size > disponible:
+                    chunk_size = disponible
+                return sample_rate, canales, bits, formato, offset, chunk_size
+            else:
+                f.seek(chunk_size, os.SEEK_CUR)
+
+            # Los chunks están alineados a 2 bytes
+            if chunk_size % 2:
+                f.seek(1, os.SEEK_CUR)
+
+
+def cargar_wav(ruta):
+    """
+    Devuelve un SonidoWav cuyo campo 'datos' es una vista memmap (solo lectura) del PCM.
+    Forma (muestras,) para mono y (muestras, canales) para multicanal.
+    Llamadas repetidas con el mismo archivo devuelven el mismo objeto; si el archivo
+    cambió (mtime o tamaño), la entrada vieja se reemplaza. Su mapeo no se cierra a la
+    fuerza: se libera cuando ningún consumidor conserve la vista.
+    """
+    ruta = os.path.realpath(ruta)
+    estado = os.stat(ruta)
+    sello = (estado.st_mtime_ns, estado.st_size)
+
+    with _cache_lock:
+        entrada = _cache.get(ruta)
+        if entrada is not None and entrada[:2] == sello:
+            return entrada[2]
+
+        sample_rate, canales, bits, formato, offset, n_bytes = leer_cabecera(ruta)
+        dtype = np.dtype(_tipo_numpy(formato, bits))
+        muestras = n_bytes // (dtype.itemsize * canales)
+        forma = (muestras,) if canales == 1 else (muestras, canales)
+
+        if muestras == 0:
+            datos = np.zeros(forma, dtype=dtype)
+        else:
+            datos = np.memmap(ruta, dtype=dtype, mode="r", offset=offset, shape=forma)
+
+        sonido = SonidoWav(sample_rate, canales, bits, formato, datos)
+        _cache[ruta] = sello + (sonido,)
+        return sonido
+
+
+def _tabla_mulaw():
+    """Tabla de 256 entradas byte µ-law (G.711) -> muestra int16."""
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    signo = u & 0x80
+    exponente = (u >> 4) & 0x07
+    mantisa = u & 0x0F
+    muestra = (((mantisa << 3) + 0x84) << exponente) - 0x84
+    return np.where(signo, -muestra, muestra).astype(np.int16)
+
+TABLA_MULAW = _tabla_mulaw()
+
+
+def a_pcm16(sonido):
+    """
+    Devuelve las muestras como int16. Para PCM de 16 bits es la misma vista (sin copia);
+    los demás formatos se decodifican a un arreglo nuevo.
+    """
+    datos = sonido.datos
+    if sonido.formato == WAVE_FORMAT_PCM and sonido.bits == 16:
+        return datos
+    if sonido.formato == WAVE_FORMAT_MULAW:
+        return TABLA_MULAW[datos]
+    if sonido.formato == WAVE_FORMAT_PCM and sonido.bits == 8:
+        return ((datos.astype(np.int16) - 128) << 8)
+    if sonido.formato == WAVE_FORMAT_PCM and sonido.bits == 32:
+        return (datos >> 16).astype(np.int16)
+    return (np.clip(datos, -1.0, 1.0) * (2**15 - 1)).astype(np.int16)
+
+
+def vaciar_cache():
+    """Suelta las vistas en caché (el mapeo se libera cuando nadie más las use)."""
+    with _cache_lock:
+        _cache.clear()
+
+# ============================================================================
+#  BENCHMARK: memmap vs scipy.io.wavfile.read
+# ============================================================================
+
+def _memoria_kb():
+    """
+    (privada, archivo) del proceso en KB: RssAnon y RssFile de /proc/self/status (Linux).
+    En otros sistemas solo se conoce el RSS total, que se reporta como privado.
+    """
+    try:
+        campos = {}
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith(("RssAnon:", "RssFile:")):
+                    nombre, valor = linea.split(":")
+                    campos[nombre] = int(valor.split()[0])
+        return campos["RssAnon"], campos["RssFile"]
+    except (OSError, KeyError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, 0
+
+
+def _medir(metodo, rutas, consumidores, cola):
+    """Se ejecuta en un proceso limpio: carga los archivos para N consumidores y recorre los datos."""
+    import time
+
+    if metodo == "scipy":
+        from scipy.io.wavfile import read
+        cargar = lambda ruta: read(ruta)[1]
+    else:
+        cargar = lambda ruta: cargar_wav(ruta).datos
+
+    # Calentamiento: el primer uso de cada camino (imports perezosos, ufuncs de numpy)
+    # no es memoria del audio y no debe entrar en la medición
+    int(np.asarray(cargar(rutas[0]))[::64].sum())
+    vaciar_cache()
+
+    anon_inicial, archivo_inicial = _memoria_kb()
+    inicio = time.perf_counter()
+    vivos = [[cargar(ruta) for ruta in rutas] for _ in range(consumidores)]
+    segundos_carga = time.perf_counter() - inicio
+
+    # Cada consumidor lee todo el audio (como lo haría un mezclador o un validador)
+    total = 0
+    for arreglos in vivos:
+        for datos in arreglos:
+            total += int(datos[::64].sum())
+    # Se mide después del primer recorrido: con memmap las páginas entran al tocarlas
+    anon, archivo = _memoria_kb()
+    cola.put((segundos_carga, anon - anon_inicial, archivo - archivo_inicial, total))
+
+
+def benchmark(rutas, consumidores=8):
+    """
+    Compara tiempo de carga y memoria de ambos métodos, cada uno en su propio proceso.
+    'privada' es memoria anónima del proceso; 'archivo' son páginas del WAV mapeadas,
+    compartidas con otros procesos y con la caché de disco.
+    """
+    import multiprocessing
+
+    print(f"Archivos: {len(rutas)}  |  Consumidores por archivo: {consumidores}")
+    print(f"Tamaño total en disco: {sum(os.path.getsize(r) for r in rutas) / 1024:.1f} KB")
+    print("========================================")
+    for metodo in ("scipy", "memmap"):
+        cola = multiprocessing.Queue()
+        proceso = multiprocessing.Process(target=_medir, args=(metodo, rutas, consumidores, cola))
+        proceso.start()
+        segundos, anon_kb, archivo_kb, _ = cola.get()
+        proceso.join()
+        print(f"{metodo:>7}: carga {segundos * 1000:9.3f} ms  |  privada +{anon_kb:,} KB"
+              f"  |  archivo (compartida) +{archivo_kb:,} KB")
+
+
+def main():
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Benchmark del cargador WAV por memoria mapeada")
+    parser.add_argument("archivos", nargs="*", help="WAV a cargar (por defecto sound1.wav - sound4.wav)")
+    parser.add_argument("--consumidores", type=int, default=8, help="Partes del programa que piden cada archivo")
+    parser.add_argument("--segundos", type=float, default=0,
+                        help="Genera además un WAV de esta duración para medir con archivos grandes")
+    args = parser.parse_args()
+
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    rutas = args.archivos or [os.path.join(carpeta, f"sound{i}.wav") for i in range(1, 5)]
+
+    temporal = None
+    if args.segundos:
+        from scipy.io.wavfile import write
+        from sonidos import sintetizar_nota
+        temporal = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+        temporal.close()
+        write(temporal.name, 44100, sintetizar_nota(440, args.segundos))
+        rutas = rutas + [temporal.name]
+
+    try:
+        benchmark(rutas, args.consumidores)
+    finally:
+        if temporal:
+            os.remove(temporal.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# entrada.py (Cola de presiones con marca de tiempo y contrapresión)
+#
+# Antes, cada clic llamaba a check_player_press dentro del manejador de Flet y
+# lanzaba un hilo de retroalimentación, aunque la partida ya hubiera terminado.
+# Aquí cada presión se marca con la hora de llegada y pasa por una cola acotada:
+#   - mientras no es el turno del jugador, las presiones se descartan,
+#   - un rebote (mismo botón dos veces en pocos ms) se fusiona en una presión
+#     (encolar devuelve FUSIONADA: la luz y el sonido ya se dieron con la primera),
+#   - si la cola está llena, la presión nueva se rechaza (contrapresión),
+#   - un único hilo consumidor las procesa en orden; cuando una presión termina
+#     el turno (fallo o ronda completa) lo que quedaba en la cola se descarta,
+#   - si procesar() lanza una excepción se registra y el consumidor sigue vivo
+#     (si muriera, las presiones siguientes quedarían en cola para siempre),
+#   - al cerrar la sesión, cerrar() termina el hilo consumidor.
+
+import threading
+import time
+import traceback
+from collections import deque
+
+# Resultado de ColaEntrada.encolar
+ENCOLADA = "encolada"       # Quedó en cola: se valida y hay que mostrarla
+FUSIONADA = "fusionada"     # Rebote de la anterior: ni se valida ni se vuelve a mostrar
+DESCARTADA = None           # Fuera de turno o cola llena
+
+
+def percentiles_ms(latencias):
+    """(p50, p99) en milisegundos de una colección de latencias en segundos."""
+    ordenadas = sorted(latencias)
+    if not ordenadas:
+        return 0.0, 0.0
+    def percentil(p):
+        return round(ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))] * 1000, 2)
+    return percentil(0.50), percentil(0.99)
+
+
+class PresionEntrada:
+    """Una presión pendiente: el botón y cuándo llegó (time.perf_counter)."""
+
+    __slots__ = ("boton", "llegada")
+
+    def __init__(self, boton, llegada):
+        self.boton = boton
+        self.llegada = llegada
+
+
+class ColaEntrada:
+    """
+    Cola acotada con un consumidor. 'procesar(boton)' da el veredicto y devuelve
+    True si el jugador puede seguir presionando en este turno.
+    """
+
+    def __init__(self, procesar, capacidad=8, ventana_rebote=0.03):
+        self.procesar = procesar
+        self.capacidad = capacidad
+        self.ventana_rebote = ventana_rebote
+        self.aceptando = False
+        self._cola = deque()
+        self._cond = threading.Condition()
+        self._ultima = None     # Última presión aceptada (para detectar rebotes)
+        self._cerrada = False
+
+        # Métricas
+        self.procesadas = 0
+        self.descartadas = 0    # Llegaron fuera de turno o quedaron en cola al terminar el turno
+        self.fusionadas = 0
+        self.rechazadas = 0     # Cola llena
+        self.errores = 0        # procesar() lanzó una excepción
+        self.profundidad_max = 0
+        self.latencias = deque(maxlen=1000)   # Segundos desde la llegada hasta el veredicto
+
+        self._hilo = threading.Thread(target=self._consumir, daemon=True)
+        self._hilo.start()
+
+    def habilitar(self, aceptar):
+        """Abre o cierra el turno del jugador. Al cerrarlo se descarta lo pendiente."""
+        with self._cond:
+            self.aceptando = aceptar and not self._cerrada
+            if not aceptar:
+                self.descartadas += len(self._cola)
+                self._cola.clear()
+                self._ultima = None
+
+    def encolar(self, boton, llegada=None):
+        """Registra una presión. Devuelve ENCOLADA, FUSIONADA (rebote) o DESCARTADA."""
+        llegada = time.perf_counter() if llegada is None else llegada
+        with self._cond:
+            if not self.aceptando:
+                self.descartadas += 1
+                return DESCARTADA
+            ultima = self._ultima
+            if ultima is not None and ultima.boton == boton and llegada - ultima.llegada < self.ventana_rebote:
+                self.fusionadas += 1
+                return FUSIONADA
+            if len(self._cola) >= self.capacidad:
+                self.rechazadas += 1
+                return DESCARTADA
+            presion = PresionEntrada(boton, llegada)
+            self._cola.append(presion)
+            self._ultima = presion
+            self.profundidad_max = max(self.profundidad_max, len(self._cola))
+            self._cond.notify()
+            return ENCOLADA
+
+    def _consumir(self):
+        while True:
+            with self._cond:
+                while not self._cola and not self._cerrada:
+                    self._cond.wait()
+                if self._cerrada:
+                    return
+                presion = self._cola.popleft()
+
+            try:
+                sigue = self.procesar(presion.boton)
+            except Exception:
+                # Se registra y se sigue: el turno queda como estaba
+                self.errores += 1
+                print(f"Error al procesar la presión del botón {presion.boton}:")
+                traceback.print_exc()
+                sigue = True
+            self.latencias.append(time.perf_counter() - presion.llegada)
+            self.procesadas += 1
+            if not sigue:
+                self.habilitar(False)
+
+    def cerrar(self):
+        """Termina el hilo consumidor (la sesión se cerró). Lo pendiente se descarta."""
+        with self._cond:
+            self._cerrada = True
+            self.aceptando = False
+            self.descartadas += len(self._cola)
+            self._cola.clear()
+            self._cond.notify()
+
+    @property
+    def profundidad(self):
+        return len(self._cola)
+
+    def metricas(self):
+        """Resumen para imprimir: profundidad y latencia entrada→veredicto."""
+        p50, p99 = percentiles_ms(self.latencias)
+        return {
+            "profundidad": self.profundidad,
+            "profundidad_max": self.profundidad_max,
+            "procesadas": self.procesadas,
+            "descartadas": self.descartadas,
+            "fusionadas": self.fusionadas,
+            "rechazadas": self.rechazadas,
+            "errores": self.errores,
+            "latencia_p50_ms": p50,
+            "latencia_p99_ms": p99,
+        }
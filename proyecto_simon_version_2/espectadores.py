@@ -0,0 +1,411 @@
+# espectadores.py (Transmisión en vivo de una partida a muchos espectadores)
+#
+# Servidor TCP local, solo con la biblioteca estándar (asyncio), que se cuelga
+# de los callbacks de SimonGame y transmite cada evento como una línea JSON:
+#   - cada evento se codifica UNA vez y los mismos bytes se escriben a todos;
+#     los eventos de una misma vuelta del loop se juntan en una sola escritura,
+#   - cada cliente tiene un búfer de salida acotado (control de flujo del
+#     transporte); si un espectador lento lo llena, sus eventos se descartan
+#     y, cuando vuelve a vaciarse, recibe una foto completa del estado
+#     ("estado") para resincronizarse.
+#
+# Eventos (todos llevan "n", número creciente; son idempotentes, así que un
+# espectador puede aplicar sin problema un evento ya incluido en una foto):
+#   {"t":"estado","n":..,"secuencia":[..],"score":..,"activo":..}
+#   {"t":"ronda","n":..,"largo":..,"paso":..,"flash":..}
+#   {"t":"presion","n":..,"boton":..,"ok":..}
+#   {"t":"puntaje","n":..,"score":..}
+#   {"t":"game_over","n":..,"score":..}
+#
+# Con la interfaz: SIMON_ESPECTADORES=8765 python interfaz.py
+# Benchmark:       python espectadores.py --clientes 1000 5000
+
+import asyncio
+import itertools
+import json
+import socket
+import threading
+
+PUERTO_POR_DEFECTO = 8765
+LIMITE_BYTES_CLIENTE = 64 * 1024
+
+
+def codificar(evento):
+    """Una línea JSON compacta, lista para escribir en el socket."""
+    return json.dumps(evento, separators=(",", ":")).encode() + b"\n"
+
+
+class _ProtocoloEspectador(asyncio.Protocol):
+    """Una conexión de espectador. Solo escribe; lo que mande el cliente se ignora."""
+
+    __slots__ = ("servidor", "transporte", "lleno", "descartados")
+
+    def __init__(self, servidor):
+        self.servidor = servidor
+        self.transporte = None
+        self.lleno = False      # El búfer de salida superó el límite: se descartan eventos
+        self.descartados = 0
+
+    def connection_made(self, transporte):
+        self.transporte = transporte
+        limite = self.servidor.limite_bytes_cliente
+        transporte.set_write_buffer_limits(high=limite)
+        # El búfer del kernel también se acota; si no, absorbería megabytes antes de saturar
+        sock = transporte.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, limite)
+        self.servidor._agregar(self)
+
+    def connection_lost(self, exc):
+        self.servidor._quitar(self)
+
+    def data_received(self, datos):
+        pass
+
+    def pause_writing(self):
+        self.lleno = True
+        self.servidor.saturaciones += 1
+
+    def resume_writing(self):
+        # Se perdieron eventos mientras estaba lleno: se manda el estado completo
+        self.lleno = False
+        self.transporte.write(self.servidor.foto_estado())
+        self.servidor.resincronizaciones += 1
+
+
+class ServidorEspectadores:
+    """Difunde los eventos de una partida a todos los espectadores conectados."""
+
+    def __init__(self, limite_bytes_cliente=LIMITE_BYTES_CLIENTE):
+        self.limite_bytes_cliente = limite_bytes_cliente
+        self.loop = None
+        self.servidor = None
+        self._hilo = None          # Hilo del loop cuando se arrancó con iniciar_en_hilo
+        self.clientes = set()
+        self.game = None
+        self._numeros = itertools.count(1)
+        self.ultimo_numero = 0
+        self._foto = (None, b"")   # (número, bytes) de la última foto de estado construida
+        self._pendientes = []      # Eventos codificados que aún no se escribieron
+
+        # Métricas
+        self.eventos = 0
+        self.bytes_escritos = 0
+        self.saturaciones = 0
+        self.resincronizaciones = 0
+
+    # --- Arranque ---
+
+    async def iniciar(self, host="127.0.0.1", puerto=PUERTO_POR_DEFECTO):
+        """Abre el servidor en el loop actual. Devuelve el puerto (útil con puerto=0)."""
+        self.loop = asyncio.get_running_loop()
+        self.servidor = await self.loop.create_server(lambda: _ProtocoloEspectador(self), host, puerto)
+        return self.servidor.sockets[0].getsockname()[1]
+
+    def iniciar_en_hilo(self, host="127.0.0.1", puerto=PUERTO_POR_DEFECTO):
+        """Corre el servidor en un hilo propio con su loop (para la interfaz Flet)."""
+        listo = threading.Event()
+        resultado = {}
+
+        def correr():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                resultado["puerto"] = loop.run_until_complete(self.iniciar(host, puerto))
+            except OSError as error:
+                resultado["error"] = error
+                listo.set()
+                loop.close()
+                return
+            listo.set()
+            try:
+                loop.run_forever()
+            finally:
+                loop.close()
+
+        self._hilo = threading.Thread(target=correr, daemon=True)
+        self._hilo.start()
+        listo.wait()
+        if "error" in resultado:
+            self._hilo = None
+            raise resultado["error"]
+        return resultado["puerto"]
+
+    def cerrar(self, espera=2.0):
+        """
+        Cierra el socket de escucha y las conexiones de los espectadores. Todo se hace
+        en el hilo del loop (asyncio no es seguro entre hilos); si el loop es el de
+        iniciar_en_hilo, además se detiene y se espera a que su hilo termine.
+        """
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        hilo, self._hilo = self._hilo, None
+        try:
+            en_el_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            en_el_loop = False
+        if en_el_loop:
+            self._cerrar_en_loop(detener=hilo is not None)
+            return
+        try:
+            loop.call_soon_threadsafe(self._cerrar_en_loop, hilo is not None)
+        except RuntimeError:
+            return  # El loop ya se cerró
+        if hilo is not None and hilo is not threading.current_thread():
+            hilo.join(espera)
+
+    def _cerrar_en_loop(self, detener):
+        if self.servidor is not None:
+            self.servidor.close()
+            self.servidor = None
+        for cliente in list(self.clientes):
+            cliente.transporte.abort()
+        loop, self.loop = self.loop, None
+        if detener:
+            # Después de los connection_lost que abort() acaba de programar
+            loop.call_soon(loop.stop)
+
+    # --- Conexión con SimonGame ---
+
+    def conectar(self, game):
+        """
+        Envuelve los callbacks de 'game' (sin quitar los que ya tiene la interfaz),
+        incluido on_press, para publicar cada evento de la partida.
+        """
+        self.game = game
+        on_sequence_done = game.on_sequence_done
+        on_update_score = game.on_update_score
+        on_game_over = game.on_game_over
+        on_press = game.on_press
+
+        def sequence_done(sequence, flash_duration):
+            if self.clientes and game.sequence:
+                self.publicar({"t": "ronda", "largo": len(game.sequence),
+                               "paso": game.sequence[-1], "flash": flash_duration})
+            if on_sequence_done:
+                on_sequence_done(sequence, flash_duration)
+
+        def update_score(texto):
+            if self.clientes:
+                self.publicar({"t": "puntaje", "score": game.score})
+            if on_update_score:
+                on_update_score(texto)
+
+        def game_over(texto):
+            if self.clientes:
+                self.publicar({"t": "game_over", "score": game.score})
+            if on_game_over:
+                on_game_over(texto)
+
+        def press(boton):
+            # La presión se publica antes que sus consecuencias (puntaje, ronda, game over)
+            if self.clientes and game.game_active and game.player_index < len(game.sequence):
+                self.publicar({"t": "presion", "boton": boton,
+                               "ok": boton == game.sequence[game.player_index]})
+            if on_press:
+                on_press(boton)
+
+        game.on_sequence_done = sequence_done
+        game.on_update_score = update_score
+        game.on_game_over = game_over
+        game.on_press = press
+
+    def foto_estado(self):
+        """Estado completo de la partida, codificado una vez por número de evento."""
+        numero, datos = self._foto
+        if numero != self.ultimo_numero or not datos:
+            game = self.game
+            evento = {"t": "estado", "n": self.ultimo_numero,
+                      "secuencia": list(game.sequence) if game else [],
+                      "score": game.score if game else 0,
+                      "activo": game.game_active if game else False}
+            datos = codificar(evento)
+            self._foto = (self.ultimo_numero, datos)
+        return datos
+
+    # --- Difusión ---
+
+    def publicar(self, evento):
+        """Numera y codifica el evento (una sola vez) y lo difunde. Se puede llamar desde cualquier hilo."""
+        evento["n"] = next(self._numeros)
+        datos = codificar(evento)
+        if self.loop is None:
+            return
+        try:
+            en_el_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            en_el_loop = False
+        if en_el_loop:
+            self._difundir(evento["n"], datos)
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._difundir, evento["n"], datos)
+        except (AttributeError, RuntimeError):
+            pass    # El servidor se cerró mientras tanto
+
+    def _difundir(self, numero, datos):
+        if self.loop is None:
+            return
+        self.ultimo_numero = max(self.ultimo_numero, numero)
+        self.eventos += 1
+        if not self._pendientes:
+            self.loop.call_soon(self._vaciar)
+        self._pendientes.append(datos)
+
+    def _vaciar(self):
+        """Escribe los eventos acumulados: se unen una vez y se escribe lo mismo a cada cliente."""
+        datos = b"".join(self._pendientes)
+        cantidad = len(self._pendientes)
+        self._pendientes.clear()
+        escritos = 0
+        for cliente in self.clientes:
+            if cliente.lleno:
+                cliente.descartados += cantidad
+            else:
+                cliente.transporte.write(datos)
+                escritos += 1
+        self.bytes_escritos += escritos * len(datos)
+
+    def _agregar(self, cliente):
+        self.clientes.add(cliente)
+        cliente.transporte.write(self.foto_estado())
+
+    def _quitar(self, cliente):
+        self.clientes.discard(cliente)
+
+# ============================================================================
+#  BENCHMARK
+# ============================================================================
+
+class _ProtocoloVisor(asyncio.Protocol):
+    """Espectador de prueba: reconstruye la secuencia y el puntaje a partir de los eventos."""
+
+    def __init__(self, lento=False):
+        self.lento = lento
+        self.transporte = None
+        self.resto = b""
+        self.lineas = 0
+        self.secuencia = []
+        self.score = 0
+        self.fotos = 0
+
+    def connection_made(self, transporte):
+        self.transporte = transporte
+        if self.lento:
+            transporte.pause_reading()
+
+    def data_received(self, datos):
+        datos = self.resto + datos
+        *lineas, self.resto = datos.split(b"\n")
+        self.lineas += len(lineas)
+        for linea in lineas:
+            if linea.startswith(b'{"t":"presion"'):
+                continue
+            evento = json.loads(linea)
+            tipo = evento["t"]
+            if tipo == "estado":
+                self.fotos += 1
+                self.secuencia = evento["secuencia"]
+                self.score = evento["score"]
+            elif tipo == "ronda":
+                largo = evento["largo"]
+                del self.secuencia[largo - 1:]
+                self.secuencia.extend([0] * (largo - 1 - len(self.secuencia)))
+                self.secuencia.append(evento["paso"])
+            elif tipo in ("puntaje", "game_over"):
+                self.score = evento["score"]
+
+
+async def _medir(num_clientes, rondas, fraccion_lentos, limite):
+    from main import SimonGame
+
+    loop = asyncio.get_running_loop()
+    servidor = ServidorEspectadores(limite_bytes_cliente=limite)
+    puerto = await servidor.iniciar(puerto=0)
+
+    visores = []
+    for i in range(num_clientes):
+        lento = i < num_clientes * fraccion_lentos
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if lento:
+            # Ventana de recepción chica: el servidor tiene que notar enseguida que no lee
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.setblocking(False)
+        await loop.sock_connect(sock, ("127.0.0.1", puerto))
+        _, visor = await loop.create_connection(lambda: _ProtocoloVisor(lento), sock=sock)
+        visores.append(visor)
+    while len(servidor.clientes) < num_clientes:
+        await asyncio.sleep(0.01)
+
+    # Una partida perfecta (modo maratón) sin esperas: los retardos se ejecutan al instante
+    pendiente = []
+    game = SimonGame(on_delay_request=lambda action, seconds: pendiente.append(action),
+                     on_sequence_done=lambda sequence, flash: None,
+                     modo_maraton=True)
+    servidor.conectar(game)
+    game.start_game()
+
+    inicio = loop.time()
+    for _ in range(rondas):
+        pendiente.pop()()
+        for i in range(game.inicio_ventana(), len(game.sequence)):
+            game.check_player_press(game.sequence[i])
+        await asyncio.sleep(0)   # Deja que el loop vacíe los sockets entre rondas
+    publicacion = loop.time() - inicio
+
+    # Los lentos vuelven a leer: deben resincronizarse con una foto del estado
+    for visor in visores:
+        if visor.lento:
+            visor.transporte.resume_reading()
+    while True:
+        await asyncio.sleep(0.05)
+        if all(v.secuencia == list(game.sequence) and v.score == game.score for v in visores):
+            break
+        if loop.time() - inicio > 120:
+            break
+    total = loop.time() - inicio
+
+    sincronizados = sum(v.secuencia == list(game.sequence) and v.score == game.score for v in visores)
+    descartados = sum(c.descartados for c in servidor.clientes)
+    for visor in visores:
+        visor.transporte.close()
+    servidor.cerrar()
+    await asyncio.sleep(0.05)
+    return {
+        "clientes": num_clientes,
+        "eventos": servidor.eventos,
+        "publicacion_s": publicacion,
+        "total_s": total,
+        "entregas_seg": sum(v.lineas for v in visores) / total,
+        "mb_seg": servidor.bytes_escritos / total / 1e6,
+        "saturaciones": servidor.saturaciones,
+        "descartados": descartados,
+        "resync": servidor.resincronizaciones,
+        "sincronizados": sincronizados,
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark del servidor de espectadores de Simon Dice")
+    parser.add_argument("--clientes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--rondas", type=int, default=500)
+    parser.add_argument("--lentos", type=float, default=0.05, help="Fracción de clientes que no leen")
+    parser.add_argument("--limite", type=int, default=LIMITE_BYTES_CLIENTE, help="Bytes por cliente")
+    args = parser.parse_args()
+
+    print("Servidor de espectadores de Simon Dice (TCP local, JSON por línea)")
+    print("========================================")
+    print(f"{'clientes':>9}{'eventos':>9}{'publicar s':>12}{'total s':>9}{'entregas/s':>13}"
+          f"{'MB/s':>8}{'saturados':>11}{'descartes':>11}{'resync':>8}{'al día':>8}")
+    for n in args.clientes:
+        r = asyncio.run(_medir(n, args.rondas, args.lentos, args.limite))
+        print(f"{r['clientes']:>9}{r['eventos']:>9}{r['publicacion_s']:>12.2f}{r['total_s']:>9.2f}"
+              f"{r['entregas_seg']:>13,.0f}{r['mb_seg']:>8.1f}{r['saturaciones']:>11}"
+              f"{r['descartados']:>11}{r['resync']:>8}{r['sincronizados']:>8}")
+
+
+if __name__ == "__main__":
+    main()
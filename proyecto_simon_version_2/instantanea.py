@@ -0,0 +1,232 @@
+# instantanea.py (Guardar y restaurar una partida en curso, en binario compacto)
+#
+# Si el sistema pasa la app a segundo plano o la cierra, la partida se pierde.
+# Una instantánea guarda todo el estado de SimonGame en pocos bytes: una
+# cabecera fija y la secuencia empaquetada a 1, 2, 4 u 8 bits por paso según
+# el tamaño del tablero. Guardar y restaurar tardan microsegundos, así que se
+# puede guardar en cada cambio de ronda.
+#
+# Formato (versión 2, little-endian):
+#   "SIMN" | versión u8 | flags u8 | num_botones u8 | bits_por_paso u8
+#   score u32 | high_score u32 | player_index u32 | flash_ms u16 | ventana u16 | largo u32
+#   pausa_ms u16
+#   secuencia empaquetada (ceil(largo * bits / 8) bytes, primer paso en los bits bajos)
+# La versión 1 (sin pausa_ms) se sigue leyendo: la pausa queda en la inicial del juego.
+#
+# En escritorio hay una sola partida y va a ARCHIVO_PARTIDA. Con varias sesiones
+# en el mismo proceso (modo web) cada una usa su propio archivo (ruta_sesion);
+# ruta=None desactiva las instantáneas.
+
+import os
+import struct
+from array import array
+
+MAGIA = b"SIMN"
+VERSION = 2
+CABECERA_V1 = struct.Struct("<4sBBBBIIIHHI")
+CABECERA = struct.Struct("<4sBBBBIIIHHIH")
+
+FLAG_ACTIVO = 0x01
+FLAG_MARATON = 0x02
+
+ARCHIVO_PARTIDA = "storage/simon_partida.bin"
+CARPETA_SESIONES = "storage/partidas"
+
+# Máximo de cada campo numérico de la cabecera (u32 / u16)
+_MAX_U32 = 0xFFFFFFFF
+_MAX_U16 = 0xFFFF
+
+
+def ruta_sesion(clave):
+    """Archivo de instantánea de una sesión (p. ej. page.session_id); solo letras, dígitos, '-' y '_'."""
+    limpia = "".join(c for c in str(clave) if c.isalnum() or c in "-_")
+    if not limpia:
+        raise ValueError("Clave de sesión vacía")
+    return os.path.join(CARPETA_SESIONES, f"simon_partida_{limpia}.bin")
+
+
+def bits_por_paso(num_botones):
+    """Bits necesarios por paso, redondeados a 1/2/4/8 para que un byte tenga pasos enteros."""
+    bits = max(1, (num_botones - 1).bit_length())
+    for opcion in (1, 2, 4, 8):
+        if bits <= opcion:
+            return opcion
+    raise ValueError("Un tablero no puede tener más de 256 botones")
+
+
+def _tabla_desempaquetado(bits):
+    """Para cada valor de byte, los pasos que contiene (como bytes)."""
+    por_byte = 8 // bits
+    mascara = (1 << bits) - 1
+    return [bytes((valor >> (bits * i)) & mascara for i in range(por_byte)) for valor in range(256)]
+
+_TABLAS = {bits: _tabla_desempaquetado(bits) for bits in (1, 2, 4)}
+
+
+def empaquetar(secuencia, bits):
+    """Empaqueta la secuencia (valores < 2**bits) en bytes."""
+    datos = bytes(secuencia)
+    if bits == 8:
+        return datos
+    por_byte = 8 // bits
+    resto = len(datos) % por_byte
+    if resto:
+        datos += bytes(por_byte - resto)
+    # Cada grupo de 'por_byte' pasos consecutivos forma un byte
+    columnas = [datos[i::por_byte] for i in range(por_byte)]
+    if bits == 4:
+        return bytes(a | b << 4 for a, b in zip(*columnas))
+    if bits == 2:
+        return bytes(a | b << 2 | c << 4 | d << 6 for a, b, c, d in zip(*columnas))
+    return bytes(sum(v << i for i, v in enumerate(grupo)) for grupo in zip(*columnas))
+
+
+def desempaquetar(datos, bits, largo):
+    if bits == 8:
+        return array('B', datos[:largo])
+    tabla = _TABLAS[bits]
+    return array('B', b"".join([tabla[b] for b in datos]))[:largo]
+
+
+def crear_instantanea(game):
+    """Devuelve los bytes de la instantánea del estado actual del juego."""
+    bits = bits_por_paso(game.num_botones)
+    flash_ms = int(round(game.flash_duration * 1000))
+    pausa_ms = int(round(game.pausa_flash * 1000))
+    # Se valida antes de empaquetar: un valor fuera de rango daría struct.error
+    for nombre, valor, maximo in (("score", game.score, _MAX_U32), ("high_score", game.high_score, _MAX_U32),
+                                  ("player_index", game.player_index, _MAX_U32),
+                                  ("largo", len(game.sequence), _MAX_U32),
+                                  ("flash_ms", flash_ms, _MAX_U16), ("ventana", game.ventana_maraton, _MAX_U16),
+                                  ("pausa_ms", pausa_ms, _MAX_U16)):
+        if not 0 <= valor <= maximo:
+            raise ValueError(f"{nombre}={valor} no entra en la instantánea (0..{maximo})")
+    flags = (FLAG_ACTIVO if game.game_active else 0) | (FLAG_MARATON if game.modo_maraton else 0)
+    cabecera = CABECERA.pack(
+        MAGIA, VERSION, flags, game.num_botones, bits,
+        game.score, game.high_score, game.player_index,
+        flash_ms, game.ventana_maraton, len(game.sequence), pausa_ms,
+    )
+    return cabecera + empaquetar(game.sequence, bits)
+
+
+def restaurar_instantanea(game, datos, reanudar=True):
+    """
+    Carga el estado guardado en 'game'. Si la partida estaba activa y 'reanudar' es True,
+    vuelve a mostrar la ronda en curso (on_sequence_done) y el jugador la repite desde el principio.
+    Lanza ValueError si los datos no son válidos o son de otro tablero.
+    """
+    if len(datos) < CABECERA_V1.size:
+        raise ValueError("Instantánea incompleta")
+    (magia, version, flags, num_botones, bits, score, high_score,
+     player_index, flash_ms, ventana, largo) = CABECERA_V1.unpack_from(datos)
+    if magia != MAGIA:
+        raise ValueError("No es una instantánea de Simon Dice")
+    if version == 1:
+        cabecera, pausa_ms = CABECERA_V1, None
+    elif version == VERSION:
+        if len(datos) < CABECERA.size:
+            raise ValueError("Instantánea incompleta")
+        cabecera, pausa_ms = CABECERA, CABECERA.unpack_from(datos)[-1]
+    else:
+        raise ValueError(f"Versión de instantánea no soportada: {version}")
+    if num_botones != game.num_botones:
+        raise ValueError(f"La instantánea es de un tablero de {num_botones} botones")
+    if bits != bits_por_paso(num_botones):
+        raise ValueError("Instantánea corrupta (bits por paso)")
+    cuerpo = datos[cabecera.size:]
+    if len(cuerpo) * 8 < largo * bits:
+        raise ValueError("Instantánea corrupta (secuencia truncada)")
+    secuencia = desempaquetar(cuerpo, bits, largo)
+    # Con un tablero que no llena sus bits (p. ej. 6 botones en 4 bits) un paso puede no existir
+    if num_botones != 1 << bits and largo and max(secuencia) >= num_botones:
+        raise ValueError(f"Instantánea corrupta (paso fuera del tablero de {num_botones} botones)")
+
+    game.sequence = secuencia
+    game.score = score
+    game.high_score = max(game.high_score, high_score)
+    game.flash_duration = flash_ms / 1000
+    game.pausa_flash = game.pausa_inicial if pausa_ms is None else pausa_ms / 1000
+    game.modo_maraton = bool(flags & FLAG_MARATON)
+    game.ventana_maraton = ventana
+    game.game_active = bool(flags & FLAG_ACTIVO) and largo > 0
+    game.player_index = min(player_index, largo)
+
+    game._update_score_text()
+    game._update_high_score_text()
+
+    if game.game_active and reanudar:
+        # La ronda se vuelve a mostrar completa, así que el jugador empieza la ventana de nuevo
+        game.player_index = game.inicio_ventana()
+        if game.on_sequence_done:
+            game.on_sequence_done(game.iterar_reproduccion(), game.flash_duration)
+    return game
+
+
+def guardar_partida(game, ruta=ARCHIVO_PARTIDA):
+    """Escribe la instantánea de forma atómica (archivo temporal + reemplazo). Con ruta=None no hace nada."""
+    if ruta is None:
+        return
+    temporal = ruta + ".tmp"
+    try:
+        datos = crear_instantanea(game)
+        os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+        with open(temporal, 'wb') as f:
+            f.write(datos)
+        os.replace(temporal, ruta)
+    except (IOError, ValueError) as error:
+        print(f"Error al guardar la partida en {ruta}: {error}")
+
+
+def cargar_partida(game, ruta=ARCHIVO_PARTIDA, reanudar=True):
+    """Restaura la partida guardada. Devuelve True si había una partida activa que reanudar."""
+    if ruta is None or not os.path.exists(ruta):
+        return False
+    try:
+        with open(ruta, 'rb') as f:
+            restaurar_instantanea(game, f.read(), reanudar)
+    except (IOError, ValueError) as error:
+        print(f"No se pudo restaurar la partida guardada: {error}")
+        return False
+    return game.game_active
+
+
+def borrar_partida(ruta=ARCHIVO_PARTIDA):
+    """Elimina la partida guardada (por ejemplo, después de un Game Over)."""
+    if ruta is None:
+        return
+    try:
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from main import SimonGame
+
+    print("Instantáneas de Simon Dice: tamaño y tiempos")
+    print("========================================")
+    print(f"{'botones':>8}{'pasos':>8}{'bytes':>8}{'guardar us':>12}{'restaurar us':>14}")
+    for num_botones in (4, 16):
+        for largo in (10, 100, 1000, 10000):
+            game = SimonGame(num_botones=num_botones)
+            game.sequence = array('B', (random.randrange(num_botones) for _ in range(largo)))
+            game.game_active = True
+            repeticiones = max(10, 100000 // largo)
+
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                datos = crear_instantanea(game)
+            guardar_us = (time.perf_counter() - inicio) * 1e6 / repeticiones
+
+            copia = SimonGame(num_botones=num_botones)
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                restaurar_instantanea(copia, datos, reanudar=False)
+            restaurar_us = (time.perf_counter() - inicio) * 1e6 / repeticiones
+
+            assert copia.sequence == game.sequence
+            print(f"{num_botones:>8}{largo:>8}{len(datos):>8}{guardar_us:>12.1f}{restaurar_us:>14.1f}")
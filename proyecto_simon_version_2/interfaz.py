@@ -1,411 +1,942 @@
-
-# interfaz.py (Con Overlay Manual para Game Over y ft.Colors con C mayúscula)
-
-import flet as ft
-from flet import ControlState
-import threading
-import time
-# Importamos la lógica y las constantes (asumimos que simon_main.py usa COLORES en mayúscula)
-from main import SimonGame, SIMON_SOUNDS_MAP, COLORES 
-
-# Constantes de Flet para el diseño visual
-FLET_COLORS = {
-    'blue': ft.Colors.BLUE_700,
-    'red': ft.Colors.RED_700,
-    'yellow': ft.Colors.YELLOW_ACCENT_700,
-    'green': ft.Colors.GREEN_700,
-}
-FLASH_COLOR = ft.Colors.WHITE
-
-class SimonFletApp:
-    def __init__(self, page: ft.Page):
-        self.page = page
-        self.page.title = "Simón Dice con Flet"
-        # Ajustamos la alineación de la página para centrar todo
-        self.page.vertical_alignment = ft.MainAxisAlignment.SPACE_AROUND # Distribuye el espacio
-
-        # Color de fondo de la página, cerca del azul/violeta oscuro del boceto
-        self.page.bgcolor = ft.Colors.BLUE_GREY_900 # <-- CORREGIDO
-
-        # Diccionarios de elementos UI y Audio
-        self.buttons = {}
-        self.audio_players = {}
-        
-        # 1. Inicializar la lógica del juego con los callbacks de la UI
-        self.game = SimonGame(
-            on_update_score=self.update_score_ui,
-            on_game_over=self.handle_game_over_ui,
-            on_sequence_done=self.run_flash_sequence,
-            on_delay_request=self.execute_delayed_action,
-            on_update_high_score=self.update_high_score_ui,
-        )
-        
-        # 2. Configurar la UI
-        # Esta llamada crea self.master_container
-        self._setup_ui()
-        
-        # 3. Cargar audios
-        self._load_audio()
-        
-        # ----------------------------------------------------
-        #  REVERTIMOS CAMBIOS DE LA PRUEBA DE AISLAMIENTO
-        # ----------------------------------------------------
-        
-        # Añadimos la UI completa a la página (self.master_container se define en _setup_ui)
-        self.page.add(self.master_container) 
-        self.page.update()
-        
-        # Iniciar el juego automáticamente
-        self.game.start_game() 
-
-
-    def _load_audio(self):
-        """Carga los archivos WAV usando AudioPlayer."""
-        for color, file_name in SIMON_SOUNDS_MAP.items():
-            self.audio_players[color] = ft.Audio(src=file_name)
-            self.page.overlay.append(self.audio_players[color])
-        self.page.update()
-
-    def _setup_ui(self):
-        """Construye todos los elementos de la interfaz."""
-        
-        # Marcador de puntaje
-        self.score_label = ft.Text("Puntaje: 0", size=30, color=ft.Colors.WHITE, weight=ft.FontWeight.BOLD)
-        self.high_score_label = ft.Text("Récord: 0", size=20, color=ft.Colors.WHITE, weight=ft.FontWeight.BOLD)
-        
-        # ETIQUETA NUEVA: Para mostrar la puntuación dentro del Overlay de Game Over
-        self.game_over_label_dialog = ft.Text(
-            "Puntuación: 0", 
-            size=18, 
-            color=ft.Colors.WHITE70, # <-- CORREGIDO
-            text_align=ft.TextAlign.CENTER
-        )
-        
-        # 🛑 ELIMINAMOS self.game_over_dialog (el antiguo ft.AlertDialog)
-
-        
-        # --- Creación de Botones y Cuadrícula Dinámica ---
-        
-        # 1. Crear todos los botones en el diccionario self.buttons
-        for color_name in COLORES:
-            btn = ft.Container(
-                width=150, height=150,
-                # CAMBIO: Agregamos una sombra interna para el efecto de brillo apagado
-                bgcolor=FLET_COLORS[color_name],
-                border_radius=ft.border_radius.all(75), # Hacerlo circular
-                data=color_name,
-                on_click=self.handle_button_click, 
-                alignment=ft.alignment.center,
-                # Ajustamos la sombra para un efecto de luz apagada (similar al boceto)
-                shadow=ft.BoxShadow(
-                    spread_radius=-10, 
-                    blur_radius=25, 
-                    color=FLET_COLORS[color_name], 
-                    offset=ft.Offset(0, 0), 
-                    blur_style=ft.ShadowBlurStyle.OUTER
-                )
-            )
-            self.buttons[color_name] = btn
-        
-        # 2. Obtener la lista de los objetos de los botones
-        button_list = list(self.buttons.values())
-        
-        # 3. Construir el Grid 2x2 de forma más concisa
-        game_grid = ft.Column(
-            controls=[
-                ft.Row(
-                    controls=button_list[0:2],
-                    alignment=ft.MainAxisAlignment.CENTER,
-                    spacing=20
-                ),
-                ft.Row(
-                    controls=button_list[2:4],
-                    alignment=ft.MainAxisAlignment.CENTER,
-                    spacing=20
-                )
-            ],
-            alignment=ft.MainAxisAlignment.CENTER
-        )
-
-        # --- Elemento central del diseño ---
-        self.center_circle = ft.Container(
-            width=100,
-            height=100,
-            border_radius=ft.border_radius.all(50), # Círculo perfecto
-            bgcolor=ft.Colors.BLUE_GREY_800, # <-- CORREGIDO
-            alignment=ft.alignment.center,
-            content=ft.Text("Simon", size=16, color=ft.Colors.WHITE54, weight=ft.FontWeight.BOLD) # <-- CORREGIDO
-        )
-
-        # La pila que superpone la cuadrícula de botones y el círculo central
-        game_area_stack = ft.Stack(
-            controls=[
-                game_grid,
-                self.center_circle # El círculo central se superpone
-            ],
-            # Eliminamos los tamaños fijos (width/height)
-            alignment=ft.alignment.center # Centra el contenido de la pila
-        )
-        
-        
-        # Contenido principal de la aplicación (Récord, Área de Juego, Puntaje)
-        # 1. Creamos la columna de controles
-        app_content_column = ft.Column(
-            controls=[
-                ft.Container(
-                    content=ft.Row(
-                        controls=[
-                            ft.Icon(ft.Icons.STAR, color=ft.Colors.AMBER_400), # <-- CORREGIDO
-                            self.high_score_label,# Texto de récord
-                        ],
-                        alignment=ft.MainAxisAlignment.CENTER,
-                        spacing=5
-                    ),
-                    padding=ft.padding.only(top=30, bottom=30)
-                ),
-                game_area_stack, # Nuestra área de juego con botones y centro
-                self.score_label, # Marcador de puntaje actual
-            ],
-            alignment=ft.MainAxisAlignment.CENTER,
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            expand=True
-        )
-
-        # 2. Envolvemos la columna en un Container para aplicar el bgcolor
-        app_content = ft.Container(
-            content=app_content_column,
-            bgcolor=ft.Colors.BLUE_GREY_900, # <-- CORREGIDO
-            expand=True # Aseguramos que el contenedor ocupe todo el espacio
-        )
-        
-        # ----------------------------------------------------------------------------------
-        # 🌟 OVERLAY MANUAL DE GAME OVER (Reemplazo de ft.AlertDialog)
-        # ----------------------------------------------------------------------------------
-
-        # 1. Definición del CONTENIDO del diálogo (lo que antes iba dentro del AlertDialog)
-        dialog_content = ft.Column(
-            [
-                ft.Text("GAME OVER", size=30, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE, text_align=ft.TextAlign.CENTER),
-                # Etiqueta que actualiza la puntuación final
-                self.game_over_label_dialog, 
-                ft.Container(
-                    content=ft.ElevatedButton(
-                        text="Volver a jugar",
-                        on_click=self.restart_game_click,
-                        style=ft.ButtonStyle(
-                            bgcolor={ControlState.DEFAULT: ft.Colors.BLUE_ACCENT_700}, # <-- CORREGIDO
-                            shape=ft.RoundedRectangleBorder(radius=10),
-                            padding=ft.padding.symmetric(vertical=15, horizontal=20)
-                        ),
-                    ),
-                    width=250, padding=ft.padding.only(bottom=10)
-                ),
-                ft.Container(
-                    content=ft.ElevatedButton(
-                        text="Menú Principal",
-                        on_click=self.close_game_over_overlay, # Nuevo handler para cerrar el overlay
-                        style=ft.ButtonStyle(
-                            bgcolor={ControlState.DEFAULT: ft.Colors.BLUE_ACCENT_700}, # <-- CORREGIDO
-                            shape=ft.RoundedRectangleBorder(radius=10),
-                            padding=ft.padding.symmetric(vertical=15, horizontal=20)
-                        ),
-                    ),
-                    width=250
-                )
-            ],
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=25,
-        )
-
-        # 2. Crea el OVERLAY principal
-        self.game_over_overlay = ft.Container(
-            content=ft.Container( # Un contenedor secundario para centrar la caja del diálogo
-                content=dialog_content,
-                width=300, # Ancho de la caja del diálogo
-                height=350, # Altura de la caja del diálogo
-                bgcolor=ft.Colors.BLUE_GREY_800, # <-- CORREGIDO
-                border_radius=20,
-                padding=25,
-                alignment=ft.alignment.center
-            ),
-            # Configuraciones CRÍTICAS del Overlay
-            alignment=ft.alignment.center, # Centrar la caja del diálogo en la pantalla
-            expand=True, 
-            visible=False, # **INICIALMENTE INVISIBLE**
-            bgcolor=ft.Colors.with_opacity(0.8, ft.Colors.BLACK), # <-- CORREGIDO (ft.Colors.)
-        )
-
-        # ----------------------------------------------------------------------------------
-
-        # La pila principal que superpone el contenido de la aplicación y el overlay
-        main_stack = ft.Stack(
-            controls=[
-                app_content, # 1. Nuestro contenido de juego
-                self.game_over_overlay, # 2. Nuestro nuevo diálogo manual (Overlay)
-            ],
-            expand=True
-        )
-        
-        # El master_container envuelve la pila para expandirla
-        self.master_container = ft.Container(
-            content=main_stack,
-            expand=True
-        )
-
-        # 🛑 NOTA: self.page.add(self.master_container) se llama en __init__
-
-
-    # --- Callbacks de la Lógica del Juego ---
-
-    def execute_delayed_action(self, action, delay_seconds):
-        """Ejecuta una función (action) después de un retardo (delay_seconds)."""
-        def delayed_function():
-            time.sleep(delay_seconds)
-            # Asegura que la acción se ejecute en el hilo principal de Flet
-            self.page.run_thread(action) 
-
-        threading.Thread(target=delayed_function, daemon=True).start()
-
-    def run_flash_sequence(self, sequence, flash_duration):
-        """Lanza un hilo para mostrar la secuencia de flashes del juego."""
-        def sequence_thread():
-            delay_sequence = 0.25 
-            
-            # Deshabilitar botones mientras la secuencia se muestra
-            self.set_buttons_active(False) 
-            
-            for color in sequence:
-                self.flash_button_ui(color, flash_duration)
-                # Pausa entre un flash y el siguiente
-                time.sleep(flash_duration + delay_sequence) 
-            
-            # Habilitar botones al finalizar la secuencia (turno del jugador)
-            self.set_buttons_active(True)
-
-        threading.Thread(target=sequence_thread, daemon=True).start()
-
-    def flash_button_ui(self, color_name, duration):
-        """Realiza el efecto visual y reproduce el sonido para un solo botón."""
-        button = self.buttons[color_name]
-        original_color = FLET_COLORS[color_name]
-        
-        # 1. Reproducir Sonido
-        self.play_sound(color_name)
-        
-        # 2. Animación de Color
-        def flash_animation():
-            # Estado A: Brillante
-            button.bgcolor = FLASH_COLOR 
-            button.shadow = ft.BoxShadow(
-                spread_radius=1, 
-                blur_radius=20, 
-                color=original_color, 
-                offset=ft.Offset(0, 0), 
-                blur_style=ft.ShadowBlurStyle.OUTER
-            )
-            self.page.update()
-            
-            time.sleep(duration) 
-            
-            # Estado B: Original
-            button.bgcolor = original_color
-            # Volvemos a la sombra original de luz apagada
-            button.shadow = ft.BoxShadow(
-                spread_radius=-10, 
-                blur_radius=25, 
-                color=original_color, 
-                offset=ft.Offset(0, 0), 
-                blur_style=ft.ShadowBlurStyle.OUTER
-            )
-            self.page.update()
-        
-        # Ejecutar la animación en el hilo de UI
-        self.page.run_thread(flash_animation)
-
-    def play_sound(self, color_name):
-        """Reproduce el sonido asociado al color."""
-        audio = self.audio_players.get(color_name)
-        if audio:
-            audio.seek(0)
-            audio.play()
-
-    def set_buttons_active(self, active):
-        """Activa o desactiva la capacidad de hacer clic en los botones."""
-        for btn in self.buttons.values():
-            btn.disabled = not active
-        self.page.update()
-
-    def update_score_ui(self, score_text):
-        """Callback: Actualiza el marcador de puntaje."""
-        self.score_label.value = score_text
-        self.page.update()
-
-    def update_high_score_ui(self, high_score_text):
-        """Callback: Actualiza el marcador de Récord."""
-        self.high_score_label.value = high_score_text
-        self.page.update()
-    
-    def _show_game_over_dialog(self, final_score_text):
-        """Muestra el diálogo de Game Over, ahora es un overlay manual."""
-        try:
-            # El texto que llega es "Game Over — Puntaje final: X"
-            score_value = final_score_text.split(': ')[-1]
-        except:
-            score_value = "???"
-            
-        # 1. Actualiza el contenido del overlay
-        self.game_over_label_dialog.value = f"Tu puntuación es {score_value}"
-        
-        # 2. Hace el overlay visible
-        self.game_over_overlay.visible = True
-        
-        # 3. Actualiza la página
-        self.page.update()
-
-
-    def handle_game_over_ui(self, final_score_text):
-        """Callback: Muestra el Game Over."""
-        print(f"--- GAME OVER: LLAMADA RECIBIDA --- {final_score_text}")
-        # Actualizamos el puntaje principal
-        self.score_label.value = final_score_text 
-        self.set_buttons_active(False)
-        # Llamamos al hilo principal de Flet para mostrar el overlay
-        self.page.run_thread(lambda: self._show_game_over_dialog(final_score_text))
-
-
-    # --- Handlers de Eventos de Flet ---
-
-    def handle_button_click(self, e: ft.ControlEvent):
-        """Manejador de clic de Flet, llama a la lógica del juego."""
-        if e.control.disabled:
-            return
-            
-        color_name = e.control.data 
-        
-        # La lógica verifica si el movimiento es correcto.
-        self.game.check_player_press(color_name)
-        
-        # Retroalimentación inmediata: Flash y sonido para la pulsación del jugador
-        threading.Thread(target=lambda: self.flash_button_ui(color_name, self.game.flash_duration), daemon=True).start()
-
-
-    def close_game_over_overlay(self, e=None):
-        """Oculta el overlay de Game Over, llamado por 'Menú Principal' o 'Volver a Jugar'."""
-        self.game_over_overlay.visible = False
-        self.page.update()
-
-    def restart_game_click(self, e):
-        """Manejador de clic del botón de Reinicio."""
-        # Ocultar el overlay
-        self.close_game_over_overlay() 
-        # Iniciar el juego
-        self.game.start_game()
-        
-
-def main(page: ft.Page):
-    """Función principal que inicia la aplicación Flet."""
-    SimonFletApp(page)
-
-if __name__ == "__main__":
-    # Inicia la aplicación en modo de escritorio (Desktop)
-    ft.app(target=main)
+
+# interfaz.py (Con Overlay Manual para Game Over y ft.Colors con C mayúscula)
+
+# Primero la línea de tiempo de arranque: así el instante cero es anterior a importar flet
+from arranque import (APP_CREADA, AUDIO_LISTO, ENTRADA_LISTA, MODULOS_IMPORTADOS, PRIMER_FRAME,
+                      linea_tiempo)
+import flet as ft
+from flet import ControlState
+import itertools
+import os
+import sqlite3
+import threading
+import time
+import weakref
+# Importamos la lógica y las constantes (asumimos que simon_main.py usa COLORES en mayúscula)
+from main import SimonGame, SIMON_SOUNDS_MAP, COLORES 
+from tablero import crear_tablero
+from instantanea import ARCHIVO_PARTIDA, borrar_partida, cargar_partida, guardar_partida, ruta_sesion
+from collections import deque
+from entrada import ENCOLADA, ColaEntrada, percentiles_ms
+from temas import GestorTemas, TEMAS
+from perfilador import perfilador
+from reposo import ContadorDespertares, planificador
+
+# La pista pre-mezclada necesita numpy/scipy; si faltan, se usa un ft.Audio por paso.
+try:
+    from mezclador import MezcladorSecuencia
+except ImportError:
+    MezcladorSecuencia = None
+FABRICA_MEZCLADOR = MezcladorSecuencia.desde_archivos if MezcladorSecuencia else None
+
+# Perfil de assets de audio (ver perfiles_audio.py), p. ej. SIMON_PERFIL_AUDIO=movil
+# Sin perfil (o si el perfil no se generó) Flet sirve los WAV originales de la carpeta de la app
+PERFIL_AUDIO = os.environ.get("SIMON_PERFIL_AUDIO")
+RAIZ_ASSETS = None
+if PERFIL_AUDIO:
+    try:
+        from perfiles_audio import mapa_sonidos, RAIZ_ASSETS as _RAIZ_PERFIL
+    except ImportError:
+        print(f"No se pudo cargar el perfil de audio '{PERFIL_AUDIO}', se usan los WAV originales.")
+    else:
+        _mapa_perfil = mapa_sonidos(SIMON_SOUNDS_MAP, PERFIL_AUDIO)
+        if _mapa_perfil is None:
+            print(f"El perfil de audio '{PERFIL_AUDIO}' no está generado, se usan los WAV originales "
+                  f"(python perfiles_audio.py --perfil {PERFIL_AUDIO}).")
+        else:
+            SIMON_SOUNDS_MAP = _mapa_perfil
+            RAIZ_ASSETS = _RAIZ_PERFIL
+
+# Tamaño del tablero (2 a 16 botones), p. ej. SIMON_BOTONES=9
+NUM_BOTONES = int(os.environ.get("SIMON_BOTONES", len(COLORES)))
+
+# Modo maratón: SIMON_MARATON=8 muestra solo los últimos 8 pasos de cada ronda
+VENTANA_MARATON = int(os.environ.get("SIMON_MARATON", "0"))
+
+# Arranque rápido: se pinta primero la cuadrícula y se difiere el overlay de
+# Game Over y la creación de los reproductores de audio (SIMON_ARRANQUE_RAPIDO=0 lo desactiva)
+ARRANQUE_RAPIDO = os.environ.get("SIMON_ARRANQUE_RAPIDO", "1") != "0"
+
+# Registro de eventos del motor en consola (SIMON_REGISTRO_EVENTOS=1)
+REGISTRO_EVENTOS = os.environ.get("SIMON_REGISTRO_EVENTOS", "0") != "0"
+
+# Dificultad adaptativa: flash y pausa según las reacciones del jugador (SIMON_DIFICULTAD=adaptativa)
+DIFICULTAD_ADAPTATIVA = os.environ.get("SIMON_DIFICULTAD", "fija") == "adaptativa"
+
+# Transmisión a espectadores (ver espectadores.py), p. ej. SIMON_ESPECTADORES=8765
+PUERTO_ESPECTADORES = int(os.environ.get("SIMON_ESPECTADORES", "0"))
+
+# Perfilador por muestreo prendido desde el arranque (SIMON_PERFILADOR=1); también se
+# prende/apaga con una pulsación larga en el círculo central (ver perfilador.py). El gesto
+# es solo de escritorio: en modo web el perfilador es del proceso, compartido por todas
+# las sesiones, y un jugador no puede prenderlo ni apagarlo para los demás. Sin el gesto,
+# las pilas se vuelcan al cerrar cada sesión y al terminar el proceso
+PERFILADOR = os.environ.get("SIMON_PERFILADOR", "0") != "0"
+
+# Récords compartidos entre procesos (ver almacen_records.py y lanzador_web.py),
+# p. ej. SIMON_RECORDS=storage/simon_records.db; sin la variable el récord vive en la partida
+RUTA_RECORDS = os.environ.get("SIMON_RECORDS")
+_almacen_records = None
+
+# Instantáneas de la partida en curso (ver instantanea.py). SIMON_INSTANTANEAS=0 las
+# desactiva; lanzador_web.py lo hace porque cada sesión nueva es de otro jugador
+INSTANTANEAS = os.environ.get("SIMON_INSTANTANEAS", "1") != "0"
+
+# Modo torneo (ver torneo.py): todas las sesiones del proceso juegan la misma
+# secuencia, p. ej. SIMON_TORNEO=2024; el Game Over muestra el puesto de cada una
+SEMILLA_TORNEO = os.environ.get("SIMON_TORNEO")
+_torneos = {}                   # num_botones -> Torneo
+_lock_torneos = threading.Lock()
+_numeros_torneo = itertools.count(1)
+
+linea_tiempo.marcar(MODULOS_IMPORTADOS)
+
+# Constantes de Flet para el diseño visual (tema por defecto, ver temas.py)
+FLET_COLORS = TEMAS["clasico"]["colores"]
+FLASH_COLOR = TEMAS["clasico"]["flash"]
+
+# La app viva de cada página: si la página se reconstruye, la anterior se cierra
+_apps_por_pagina = weakref.WeakKeyDictionary()
+
+def almacen_records():
+    """El almacén de récords del proceso: uno solo para todas las sesiones (None si no se configuró)."""
+    global _almacen_records
+    if _almacen_records is None and RUTA_RECORDS:
+        from almacen_records import AlmacenRecords
+        _almacen_records = AlmacenRecords(RUTA_RECORDS)
+    return _almacen_records
+
+def torneo_del_proceso(num_botones):
+    """El torneo del proceso para ese tablero: uno para todas las sesiones (None si no se configuró)."""
+    if not SEMILLA_TORNEO:
+        return None
+    with _lock_torneos:
+        if num_botones not in _torneos:
+            from torneo import Torneo
+            _torneos[num_botones] = Torneo(int(SEMILLA_TORNEO), num_botones)
+        return _torneos[num_botones]
+
+class SimonFletApp:
+    def __init__(self, page: ft.Page, arranque_rapido=ARRANQUE_RAPIDO, num_botones=NUM_BOTONES):
+        linea_tiempo.marcar(APP_CREADA)
+        if PERFILADOR:
+            perfilador.iniciar()
+        self.page = page
+        self.cerrada = False
+        # Una sola app por página: la anterior suelta sus controles, reproductores e hilos
+        anterior = _apps_por_pagina.get(page)
+        if anterior is not None:
+            anterior.cerrar()
+        _apps_por_pagina[page] = self
+        self.arranque_rapido = arranque_rapido
+
+        # En escritorio hay una sola partida; cada sesión web guarda la suya en su propio archivo
+        if not INSTANTANEAS:
+            self.ruta_partida = None
+        elif getattr(page, "web", False):
+            self.ruta_partida = ruta_sesion(page.session_id)
+        else:
+            self.ruta_partida = ARCHIVO_PARTIDA
+
+        # El tablero define cuántos botones hay, su distribución y sus sonidos
+        self.tablero = crear_tablero(num_botones)
+        if self.tablero.es_clasico:
+            # Con el tablero clásico se respeta el perfil de audio elegido
+            sonidos = [SIMON_SOUNDS_MAP[color] for color in COLORES]
+        else:
+            self.tablero.asegurar_sonidos(RAIZ_ASSETS)
+            sonidos = self.tablero.sonidos
+        self.page.title = "Simón Dice con Flet"
+        # Ajustamos la alineación de la página para centrar todo
+        self.page.vertical_alignment = ft.MainAxisAlignment.SPACE_AROUND # Distribuye el espacio
+
+        # Color de fondo de la página, cerca del azul/violeta oscuro del boceto
+        self.page.bgcolor = ft.Colors.BLUE_GREY_900 # <-- CORREGIDO
+
+        # Elementos UI y Audio (listas indexadas por número de botón)
+        self.buttons = []
+        self.audio_secuencia = None  # Clip único con la secuencia completa de la ronda
+        self._audio_cargado = False
+        self._audio_lock = threading.Lock()
+        self.game_over_overlay = None  # Se construye en _setup_ui o en el primer Game Over
+
+        # Temas: colores, estilos y audio se leen siempre del tema activo
+        self.temas = GestorTemas(self.page, sonidos, FABRICA_MEZCLADOR, RAIZ_ASSETS)
+        self.temas.cargar_inicial("clasico", con_audio=False)
+        
+        # Las presiones pasan por una cola con un solo consumidor (ver entrada.py)
+        self.entrada = ColaEntrada(self._procesar_presion)
+        self.latencias_toque = deque(maxlen=1000)  # Segundos desde el clic hasta el botón encendido
+
+        # Reposo de bajo consumo (ver reposo.py): temporizadores cancelables y updates agrupados
+        self.reposo = None              # None, "turno", "game_over" o "segundo_plano"
+        self._reposo_previo = None      # Motivo a retomar al volver de segundo plano
+        self._lock_reposo = threading.Lock()
+        self._temporizadores = {}       # Temporizador del planificador -> (función, args, segundos)
+        self._secuencia_cancelada = None    # Event de la secuencia en curso
+        self._ronda_interrumpida = False
+        self.despertares = ContadorDespertares()
+        self._lock_update = threading.Lock()
+        self._actualizando = False
+        self._update_pendiente = False
+        self.updates_pedidos = 0
+        self.updates_enviados = 0
+
+        # En modo torneo la secuencia sale del búfer compartido por todas las sesiones
+        self.torneo = torneo_del_proceso(self.tablero.num_botones)
+
+        # 1. Inicializar la lógica del juego con los callbacks de la UI
+        self.game = SimonGame(
+            on_update_score=self.update_score_ui,
+            on_game_over=self.handle_game_over_ui,
+            on_sequence_done=self.run_flash_sequence,
+            on_delay_request=self.execute_delayed_action,
+            on_update_high_score=self.update_high_score_ui,
+            num_botones=self.tablero.num_botones,
+            modo_maraton=VENTANA_MARATON > 0,
+            ventana_maraton=VENTANA_MARATON or 8,
+            dificultad_adaptativa=DIFICULTAD_ADAPTATIVA,
+            secuencia_compartida=self.torneo.secuencia if self.torneo is not None else None,
+        )
+        if self.torneo is not None:
+            self.nombre_torneo = f"jugador{next(_numeros_torneo)}"
+            self.torneo.inscribir(self.nombre_torneo, self.game)
+
+        if REGISTRO_EVENTOS:
+            self.game.suscribir(self._registrar_eventos)
+
+        # Espectadores: se envuelven los callbacks recién conectados, sin reemplazarlos
+        self.espectadores = None
+        if PUERTO_ESPECTADORES:
+            from espectadores import ServidorEspectadores
+            self.espectadores = ServidorEspectadores()
+            try:
+                puerto = self.espectadores.iniciar_en_hilo(puerto=PUERTO_ESPECTADORES)
+                self.espectadores.conectar(self.game)
+                print(f"Transmitiendo la partida a espectadores en el puerto {puerto}")
+            except OSError as error:
+                print(f"No se pudo abrir el servidor de espectadores: {error}")
+                self.espectadores = None
+        
+        # 2. Configurar la UI
+        # Esta llamada crea self.master_container
+        self._setup_ui()
+        
+        # 3. Cargar audios (en arranque rápido, después del primer frame)
+        if not self.arranque_rapido:
+            self._asegurar_audio()
+        
+        # ----------------------------------------------------
+        #  REVERTIMOS CAMBIOS DE LA PRUEBA DE AISLAMIENTO
+        # ----------------------------------------------------
+        
+        # Añadimos la UI completa a la página (self.master_container se define en _setup_ui)
+        self.page.add(self.master_container) 
+        self.page.update()
+        linea_tiempo.marcar(PRIMER_FRAME)
+
+        if self.arranque_rapido:
+            self.page.run_thread(self._asegurar_audio)
+        
+        # Guardar la partida si el sistema pasa la app a segundo plano
+        self.page.on_app_lifecycle_state_change = self.handle_lifecycle_change
+
+        # Con récords compartidos se parte del mejor puntaje de todos los procesos
+        self.records = almacen_records()
+        if self.records is not None:
+            self.game.high_score = self.records.record()
+
+        # Reanudar la partida guardada (si la hay) o iniciar el juego automáticamente
+        if not cargar_partida(self.game, self.ruta_partida):
+            self.game.start_game() 
+
+
+    @property
+    def tema(self):
+        """Tema activo (colores, estilos y audio)."""
+        return self.temas.activo
+
+    @property
+    def audio_players(self):
+        return self.tema.audio_players
+
+    @property
+    def mezclador(self):
+        return self.tema.mezclador
+
+    def _load_audio(self, tema):
+        """Carga los archivos WAV del tema usando AudioPlayer (uno precargado ya trae los suyos)."""
+        if not tema.audio_players:
+            tema.cargar_audio(self.page, FABRICA_MEZCLADOR, RAIZ_ASSETS)
+
+        # Pista pre-mezclada: la ronda completa suena como un solo clip
+        if tema.mezclador and self.audio_secuencia is None:
+            self.audio_secuencia = ft.Audio(src_base64=tema.mezclador.wav_base64())
+            self.page.overlay.append(self.audio_secuencia)
+        self.page.update()
+
+    def _asegurar_audio(self):
+        """Carga el audio una sola vez (desde el hilo de fondo o en el primer uso, lo que ocurra antes)."""
+        if self._audio_cargado or self.cerrada:
+            return
+        with self._audio_lock:
+            if self._audio_cargado or self.cerrada:
+                return
+            # El tema se fija antes de construir nada: si entre tanto se aplica otro,
+            # esta carga quedó vieja y sus reproductores se quitan del overlay
+            tema = self.tema
+            self._load_audio(tema)
+            if self.temas.descartar(tema):
+                print(f"Tema '{tema.nombre}' reemplazado durante la carga del audio: se descarta")
+            self._audio_cargado = True
+            linea_tiempo.marcar(AUDIO_LISTO)
+
+    def _setup_ui(self):
+        """Construye todos los elementos de la interfaz."""
+        
+        # Marcador de puntaje
+        self.score_label = ft.Text("Puntaje: 0", size=30, color=ft.Colors.WHITE, weight=ft.FontWeight.BOLD)
+        self.high_score_label = ft.Text("Récord: 0", size=20, color=ft.Colors.WHITE, weight=ft.FontWeight.BOLD)
+        
+        # ETIQUETA NUEVA: Para mostrar la puntuación dentro del Overlay de Game Over
+        self.game_over_label_dialog = ft.Text(
+            "Puntuación: 0", 
+            size=18, 
+            color=ft.Colors.WHITE70, # <-- CORREGIDO
+            text_align=ft.TextAlign.CENTER
+        )
+        
+        # 🛑 ELIMINAMOS self.game_over_dialog (el antiguo ft.AlertDialog)
+
+        
+        # --- Creación de Botones y Cuadrícula Dinámica ---
+        
+        # 1. Crear todos los botones en la lista self.buttons (el índice es el botón)
+        # Los botones se achican para que la cuadrícula quepa en el mismo espacio que el 2x2
+        tamano = min(150, (320 - 20 * (self.tablero.columnas - 1)) // self.tablero.columnas)
+        for indice in range(self.tablero.num_botones):
+            btn = ft.Container(
+                width=tamano, height=tamano,
+                # CAMBIO: Agregamos una sombra interna para el efecto de brillo apagado
+                bgcolor=self.tema.colores[indice],
+                border_radius=ft.border_radius.all(tamano / 2), # Hacerlo circular
+                data=indice,
+                on_click=self.handle_button_click, 
+                alignment=ft.alignment.center,
+                # Ajustamos la sombra para un efecto de luz apagada (similar al boceto)
+                shadow=self.tema.sombra_apagada[indice]
+            )
+            self.buttons.append(btn)
+        
+        # 2. Construir la cuadrícula según la distribución del tablero (2x2, 3x3, ...)
+        game_grid = ft.Column(
+            controls=[
+                ft.Row(
+                    controls=[self.buttons[indice] for indice in fila],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                    spacing=20
+                )
+                for fila in self.tablero.filas
+            ],
+            alignment=ft.MainAxisAlignment.CENTER
+        )
+
+        # --- Elemento central del diseño ---
+        self.center_circle = ft.Container(
+            width=100,
+            height=100,
+            border_radius=ft.border_radius.all(50), # Círculo perfecto
+            bgcolor=ft.Colors.BLUE_GREY_800, # <-- CORREGIDO
+            alignment=ft.alignment.center,
+            on_click=self.cambiar_tema_click, # Tocar el centro prepara el siguiente tema
+            # Gesto oculto: prende/apaga el perfilador (solo en escritorio, ver PERFILADOR)
+            on_long_press=None if getattr(self.page, "web", False) else self.alternar_perfilador,
+            content=ft.Text("Simon", size=16, color=ft.Colors.WHITE54, weight=ft.FontWeight.BOLD) # <-- CORREGIDO
+        )
+
+        # La pila que superpone la cuadrícula de botones y el círculo central
+        game_area_stack = ft.Stack(
+            controls=[
+                game_grid,
+                self.center_circle # El círculo central se superpone
+            ],
+            # Eliminamos los tamaños fijos (width/height)
+            alignment=ft.alignment.center # Centra el contenido de la pila
+        )
+        
+        
+        # Contenido principal de la aplicación (Récord, Área de Juego, Puntaje)
+        # 1. Creamos la columna de controles
+        app_content_column = ft.Column(
+            controls=[
+                ft.Container(
+                    content=ft.Row(
+                        controls=[
+                            ft.Icon(ft.Icons.STAR, color=ft.Colors.AMBER_400), # <-- CORREGIDO
+                            self.high_score_label,# Texto de récord
+                        ],
+                        alignment=ft.MainAxisAlignment.CENTER,
+                        spacing=5
+                    ),
+                    padding=ft.padding.only(top=30, bottom=30)
+                ),
+                game_area_stack, # Nuestra área de juego con botones y centro
+                self.score_label, # Marcador de puntaje actual
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            expand=True
+        )
+
+        # 2. Envolvemos la columna en un Container para aplicar el bgcolor
+        app_content = ft.Container(
+            content=app_content_column,
+            bgcolor=ft.Colors.BLUE_GREY_900, # <-- CORREGIDO
+            expand=True # Aseguramos que el contenedor ocupe todo el espacio
+        )
+        
+        # La pila principal que superpone el contenido de la aplicación y el overlay
+        self.main_stack = ft.Stack(
+            controls=[
+                app_content, # 1. Nuestro contenido de juego
+                # 2. Nuestro nuevo diálogo manual (Overlay), ver _asegurar_game_over_overlay
+            ],
+            expand=True
+        )
+        if not self.arranque_rapido:
+            self._asegurar_game_over_overlay()
+        
+        # El master_container envuelve la pila para expandirla
+        self.master_container = ft.Container(
+            content=self.main_stack,
+            expand=True
+        )
+
+        # 🛑 NOTA: self.page.add(self.master_container) se llama en __init__
+
+
+    def _asegurar_game_over_overlay(self):
+        """Construye el overlay de Game Over la primera vez que hace falta y lo agrega a la pila."""
+        if self.game_over_overlay is not None:
+            return self.game_over_overlay
+
+        # 🌟 OVERLAY MANUAL DE GAME OVER (Reemplazo de ft.AlertDialog)
+
+        # 1. Definición del CONTENIDO del diálogo (lo que antes iba dentro del AlertDialog)
+        dialog_content = ft.Column(
+            [
+                ft.Text("GAME OVER", size=30, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE, text_align=ft.TextAlign.CENTER),
+                # Etiqueta que actualiza la puntuación final
+                self.game_over_label_dialog, 
+                ft.Container(
+                    content=ft.ElevatedButton(
+                        text="Volver a jugar",
+                        on_click=self.restart_game_click,
+                        style=ft.ButtonStyle(
+                            bgcolor={ControlState.DEFAULT: ft.Colors.BLUE_ACCENT_700}, # <-- CORREGIDO
+                            shape=ft.RoundedRectangleBorder(radius=10),
+                            padding=ft.padding.symmetric(vertical=15, horizontal=20)
+                        ),
+                    ),
+                    width=250, padding=ft.padding.only(bottom=10)
+                ),
+                ft.Container(
+                    content=ft.ElevatedButton(
+                        text="Menú Principal",
+                        on_click=self.close_game_over_overlay, # Nuevo handler para cerrar el overlay
+                        style=ft.ButtonStyle(
+                            bgcolor={ControlState.DEFAULT: ft.Colors.BLUE_ACCENT_700}, # <-- CORREGIDO
+                            shape=ft.RoundedRectangleBorder(radius=10),
+                            padding=ft.padding.symmetric(vertical=15, horizontal=20)
+                        ),
+                    ),
+                    width=250
+                )
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=25,
+        )
+
+        # 2. Crea el OVERLAY principal
+        self.game_over_overlay = ft.Container(
+            content=ft.Container( # Un contenedor secundario para centrar la caja del diálogo
+                content=dialog_content,
+                width=300, # Ancho de la caja del diálogo
+                height=350, # Altura de la caja del diálogo
+                bgcolor=ft.Colors.BLUE_GREY_800, # <-- CORREGIDO
+                border_radius=20,
+                padding=25,
+                alignment=ft.alignment.center
+            ),
+            # Configuraciones CRÍTICAS del Overlay
+            alignment=ft.alignment.center, # Centrar la caja del diálogo en la pantalla
+            expand=True, 
+            visible=False, # **INICIALMENTE INVISIBLE**
+            bgcolor=ft.Colors.with_opacity(0.8, ft.Colors.BLACK), # <-- CORREGIDO (ft.Colors.)
+        )
+        self.main_stack.controls.append(self.game_over_overlay)
+        return self.game_over_overlay
+
+
+    # --- Callbacks de la Lógica del Juego ---
+
+    def execute_delayed_action(self, action, delay_seconds):
+        """Ejecuta una función (action) después de un retardo (delay_seconds)."""
+        self._programar(delay_seconds, self._ejecutar_diferida, action)
+
+    def _ejecutar_diferida(self, action):
+        # Si la sesión se cerró mientras tanto, la página ya no acepta trabajo
+        if self.cerrada:
+            return
+        action()
+
+    def _programar(self, segundos, funcion, *args):
+        """
+        Temporizador cancelable en el planificador del proceso (reposo.py): queda
+        registrado hasta que se dispara o el reposo lo cancela. Al dispararse la
+        función va a page.run_thread, así un update lento no atrasa a las demás sesiones.
+        """
+        def disparar():
+            with self._lock_reposo:
+                if self._temporizadores.pop(temporizador, None) is None:
+                    return  # Cancelado
+            self.despertares.despertar("temporizador")
+            self.page.run_thread(funcion, *args)
+
+        # Con el lock tomado: disparar no puede buscarlo antes de que quede registrado
+        with self._lock_reposo:
+            temporizador = planificador.programar(segundos, disparar)
+            self._temporizadores[temporizador] = (funcion, args, segundos)
+
+    def _cancelar_temporizadores(self):
+        """Cancela todo lo programado: las acciones del juego vuelven a él, las luces se apagan ya."""
+        with self._lock_reposo:
+            pendientes, self._temporizadores = self._temporizadores, {}
+        for temporizador, (funcion, args, segundos) in pendientes.items():
+            temporizador.cancelar()
+            if funcion == self._ejecutar_diferida:
+                self.game.aplazar(args[0], segundos)
+            else:
+                funcion(*args)
+        return len(pendientes)
+
+    def actualizar(self):
+        """
+        page.update() agrupado: si otro hilo ya está enviando, este solo lo marca y
+        aquel repite una vez al terminar. En segundo plano se envía uno solo al volver.
+        """
+        with self._lock_update:
+            self.updates_pedidos += 1
+            if self._actualizando or self.reposo == "segundo_plano":
+                self._update_pendiente = True
+                return
+            self._actualizando = True
+        self.despertares.despertar("update")
+        while True:
+            self.page.update()
+            with self._lock_update:
+                self.updates_enviados += 1
+                if not self._update_pendiente or self.reposo == "segundo_plano":
+                    self._actualizando = False
+                    return
+                self._update_pendiente = False
+
+    def _suspender_audio(self):
+        """Pausa los reproductores del tema y la pista de la ronda (nada suena en reposo)."""
+        if not self._audio_cargado:
+            return
+        reproductores = list(self.tema.audio_players)
+        if self.audio_secuencia is not None:
+            reproductores.append(self.audio_secuencia)
+        for audio in reproductores:
+            if audio.page is not None:
+                audio.pause()
+
+    def entrar_reposo(self, motivo):
+        """Deja la app sin trabajo pendiente hasta la próxima presión o hasta volver a primer plano."""
+        with self._lock_reposo:
+            if self.cerrada or self.reposo == motivo:
+                return
+            if self.reposo == "segundo_plano":
+                # Oculta sigue en reposo; este motivo se retoma al volver
+                self._reposo_previo = motivo
+                return
+            if motivo == "segundo_plano":
+                self._reposo_previo = self.reposo
+                # La secuencia a medio mostrar se corta y se repite entera al volver
+                if self._secuencia_cancelada is not None:
+                    self._secuencia_cancelada.set()
+                    self._secuencia_cancelada = None
+                    self._ronda_interrumpida = True
+            self.reposo = motivo
+        # En el turno no hay nada programado (la última nota de la secuencia todavía
+        # puede estar sonando): el reposo solo se mide y se sale con la próxima presión
+        if motivo != "turno":
+            self.game.suspender()
+            self._cancelar_temporizadores()
+            self._suspender_audio()
+        self.despertares.entrar(motivo)
+
+    def salir_reposo(self):
+        """Despierta por una presión o al volver a primer plano."""
+        with self._lock_reposo:
+            motivo = self.reposo
+            if motivo is None:
+                return
+            self.reposo = self._reposo_previo if motivo == "segundo_plano" else None
+            self._reposo_previo = None
+            interrumpida, self._ronda_interrumpida = self._ronda_interrumpida, False
+        if self.reposo is not None:
+            self.despertares.entrar(self.reposo)
+        else:
+            self.despertares.salir()
+        if self.game.en_reposo and self.reposo != "game_over":
+            self.game.reanudar()
+        if motivo != "segundo_plano":
+            return
+        # De vuelta en primer plano: un solo update con todo lo que se acumuló
+        with self._lock_update:
+            pendiente, self._update_pendiente = self._update_pendiente, False
+        if pendiente:
+            self.actualizar()
+        if self.reposo == "turno":
+            # El tiempo oculto no cuenta como reacción del jugador
+            self.game.iniciar_turno()
+        if interrumpida and self.game.game_active:
+            self.run_flash_sequence(self.game.iterar_reproduccion(), self.game.flash_duration)
+        elif self.reposo is None and self.entrada.aceptando:
+            # Oculta a mitad del turno: se vuelve a esperar la presión en reposo
+            self.entrar_reposo("turno")
+
+    def run_flash_sequence(self, sequence, flash_duration):
+        """
+        Lanza un hilo para mostrar la secuencia de flashes del juego.
+        'sequence' es un iterable (el juego entrega un generador con la ventana de la ronda).
+        """
+        perfilador.etiquetar(len(self.game.sequence), "secuencia")
+        # Frontera entre rondas: se guarda la partida y es un momento seguro para cambiar de tema
+        guardar_partida(self.game, self.ruta_partida)
+        self.aplicar_tema_pendiente()
+        self._asegurar_audio()
+        tema = self.tema
+
+        # Con pista pre-mezclada solo se agrega el paso nuevo (O(1) por ronda)
+        usar_pista = tema.mezclador is not None and self.audio_secuencia is not None
+        if usar_pista:
+            tema.mezclador.sincronizar(self.game.sequence, flash_duration, self.game.inicio_ventana(),
+                                       pausa=self.game.pausa_flash)
+
+        # Entrar en segundo plano la corta (ver entrar_reposo)
+        cancelada = threading.Event()
+        with self._lock_reposo:
+            self._secuencia_cancelada = cancelada
+
+        def sequence_thread():
+            delay_sequence = self.game.pausa_flash
+            
+            # Deshabilitar botones mientras la secuencia se muestra
+            self.set_buttons_active(False) 
+
+            # Un solo disparo de audio para toda la ronda
+            if usar_pista:
+                self.play_sequence_track(tema)
+            
+            for boton in sequence:
+                if cancelada.is_set():
+                    return
+                self.despertares.despertar("secuencia")
+                self.flash_button_ui(boton, flash_duration, con_sonido=not usar_pista, tema=tema)
+                # Pausa entre un flash y el siguiente (se interrumpe si la app pasa a segundo plano)
+                if cancelada.wait(flash_duration + delay_sequence):
+                    return
+
+            with self._lock_reposo:
+                if cancelada.is_set():
+                    return
+                self._secuencia_cancelada = None
+            # Habilitar botones al finalizar la secuencia (turno del jugador)
+            self.set_buttons_active(True)
+
+        threading.Thread(target=sequence_thread, daemon=True).start()
+
+    def flash_button_ui(self, boton, duration, con_sonido=True, tema=None):
+        """Realiza el efecto visual y reproduce el sonido para un solo botón."""
+        # Se fija el tema al empezar, así un cambio de tema no mezcla estilos a medio flash
+        tema = tema or self.tema
+        button = self.buttons[boton]
+        
+        # 1. Reproducir Sonido (se omite si la ronda suena desde la pista pre-mezclada)
+        if con_sonido:
+            self.play_sound(boton, tema)
+        
+        # 2. Animación de Color
+        def flash_animation():
+            # Estado A: Brillante
+            button.bgcolor = tema.flash
+            button.shadow = tema.sombra_encendida[boton]
+            self.actualizar()
+            
+            # Estado B: Original (un temporizador cancelable, no un hilo del pool dormido)
+            self._programar(duration, self._apagar_boton, boton, tema)
+        
+        # Ejecutar la animación en el hilo de UI
+        self.page.run_thread(flash_animation)
+
+    def play_sound(self, boton, tema=None):
+        """Reproduce el sonido asociado al botón."""
+        self._asegurar_audio()
+        audio_players = (tema or self.tema).audio_players
+        if boton < len(audio_players):
+            audio = audio_players[boton]
+            audio.seek(0)
+            audio.play()
+
+    def play_sequence_track(self, tema=None):
+        """Reproduce la ronda completa desde la pista pre-mezclada."""
+        self.audio_secuencia.src_base64 = (tema or self.tema).mezclador.wav_base64()
+        # Directo, sin agrupar: el cliente necesita el clip nuevo antes del play()
+        self.page.update()
+        self.audio_secuencia.seek(0)
+        self.audio_secuencia.play()
+
+    def aplicar_tema_pendiente(self):
+        """Si hay un tema precargado, lo activa y repinta los botones (sin page.update)."""
+        if self.temas.aplicar_pendiente() is None:
+            return False
+        for boton, btn in enumerate(self.buttons):
+            btn.bgcolor = self.tema.colores[boton]
+            btn.shadow = self.tema.sombra_apagada[boton]
+        print(f"Tema '{self.tema.nombre}' aplicado: {self.temas.metricas()}")
+        return True
+
+    def set_buttons_active(self, active):
+        """Activa o desactiva la capacidad de hacer clic en los botones."""
+        self.entrada.habilitar(active)
+        for btn in self.buttons:
+            btn.disabled = not active
+        self.actualizar()
+        if active:
+            # Desde aquí se mide la reacción del jugador (dificultad adaptativa)
+            self.game.iniciar_turno()
+            perfilador.etiquetar(len(self.game.sequence), "turno")
+            linea_tiempo.marcar(ENTRADA_LISTA)
+            linea_tiempo.imprimir_una_vez()
+            # Sin nada que mostrar hasta que el jugador presione
+            self.entrar_reposo("turno")
+
+    def update_score_ui(self, score_text):
+        """Callback: Actualiza el marcador de puntaje."""
+        self.score_label.value = score_text
+        self.actualizar()
+
+    def update_high_score_ui(self, high_score_text):
+        """Callback: Actualiza el marcador de Récord."""
+        self.high_score_label.value = high_score_text
+        self.actualizar()
+    
+    def _show_game_over_dialog(self, final_score_text):
+        """Muestra el diálogo de Game Over, ahora es un overlay manual."""
+        try:
+            # El texto que llega es "Game Over — Puntaje final: X"
+            score_value = final_score_text.split(': ')[-1]
+        except:
+            score_value = "???"
+            
+        # 1. Actualiza el contenido del overlay (se construye aquí si aún no existe)
+        self._asegurar_game_over_overlay()
+        self.game_over_label_dialog.value = f"Tu puntuación es {score_value}"
+        if self.torneo is not None:
+            puesto = self.torneo.posicion(self.nombre_torneo)
+            self.game_over_label_dialog.value += f"\nPuesto {puesto} de {len(self.torneo)} en el torneo"
+        
+        # 2. Hace el overlay visible
+        self.game_over_overlay.visible = True
+        
+        # 3. Actualiza la página
+        self.actualizar()
+        # El overlay queda quieto hasta "Volver a Jugar": sin temporizadores ni audio
+        self.entrar_reposo("game_over")
+
+
+    def handle_game_over_ui(self, final_score_text):
+        """Callback: Muestra el Game Over."""
+        print(f"--- GAME OVER: LLAMADA RECIBIDA --- {final_score_text}")
+        perfilador.etiquetar(len(self.game.sequence), "game_over")
+        print(f"Entrada: {self.entrada.metricas()}")
+        p50, p99 = percentiles_ms(self.latencias_toque)
+        print(f"Latencia toque→luz: p50 {p50} ms, p99 {p99} ms")
+        print(f"Reposo: {self.despertares.resumen()} | page.update pedidos {self.updates_pedidos}, "
+              f"enviados {self.updates_enviados}")
+        # Ya no hay partida que reanudar
+        borrar_partida(self.ruta_partida)
+        if self.records is not None:
+            # SQLite puede esperar el lock (busy_timeout): fuera del consumidor de entrada
+            self.page.run_thread(self._registrar_record, self.game.score)
+        # Actualizamos el puntaje principal
+        self.score_label.value = final_score_text 
+        self.set_buttons_active(False)
+        # Llamamos al hilo principal de Flet para mostrar el overlay
+        self.page.run_thread(lambda: self._show_game_over_dialog(final_score_text))
+
+
+    def _registrar_record(self, puntaje):
+        """Guarda la partida en los récords compartidos y muestra el récord vigente."""
+        try:
+            # El récord vigente puede venir de otra sesión u otro proceso
+            record = self.records.registrar(puntaje)
+        except sqlite3.Error as error:
+            print(f"No se pudo registrar el puntaje en {RUTA_RECORDS}: {error}")
+            return
+        if self.cerrada:
+            return
+        self.game.high_score = max(self.game.high_score, record)
+        self.high_score_label.value = f"Récord: {self.game.high_score}"
+        self.actualizar()
+
+    def _registrar_eventos(self, lote):
+        """Suscriptor por lotes del bus del motor: el texto se arma solo aquí."""
+        for evento in lote:
+            print(f"[evento] {evento!r}")
+
+    # --- Handlers de Eventos de Flet ---
+
+    def handle_button_click(self, e: ft.ControlEvent):
+        """Manejador de clic de Flet, llama a la lógica del juego."""
+        if e.control.disabled:
+            return
+            
+        # Se marca la llegada y se encola; el veredicto lo da el consumidor
+        llegada = time.perf_counter()
+        boton = e.control.data
+        self.despertares.despertar("entrada")
+        if self.reposo == "turno":
+            self.salir_reposo()
+        # Un rebote fusionado (FUSIONADA) ya se mostró con la presión original
+        if self.entrada.encolar(boton, llegada) == ENCOLADA:
+            # Camino rápido: luz y sonido antes de validar (un fallo lo muestra el Game Over)
+            self.encender_presion(boton, llegada)
+
+    def encender_presion(self, boton, llegada):
+        """Enciende el botón con el estilo ya armado del tema y suena, sin esperar a la lógica."""
+        tema = self.tema
+        button = self.buttons[boton]
+        button.bgcolor = tema.flash
+        button.shadow = tema.sombra_encendida[boton]
+        self.actualizar()
+        self.latencias_toque.append(time.perf_counter() - llegada)
+        self.play_sound(boton, tema)
+        self._programar(self.game.flash_duration, self._apagar_boton, boton, tema)
+
+    def _apagar_boton(self, boton, tema):
+        button = self.buttons[boton]
+        button.bgcolor = tema.colores[boton]
+        button.shadow = tema.sombra_apagada[boton]
+        self.actualizar()
+        # Última luz apagada y el turno sigue: la app vuelve al reposo hasta la próxima presión
+        if (self.reposo is None and self.entrada.aceptando and self.entrada.profundidad == 0
+                and not self._temporizadores and self.game.game_active):
+            self.entrar_reposo("turno")
+
+    def _procesar_presion(self, boton):
+        """Consumidor de la cola de entrada. Devuelve False cuando la presión termina el turno."""
+        if not self.game.game_active:
+            return False
+        score_antes = self.game.score
+
+        # La lógica verifica si el movimiento es correcto (la luz ya se encendió al llegar)
+        correcto = self.game.check_player_press(boton)
+
+        # Con un fallo o con la ronda completa se termina el turno
+        return correcto and self.game.score == score_antes
+
+
+    def handle_lifecycle_change(self, e):
+        """Guarda la partida y entra en reposo cuando la app deja de estar en primer plano."""
+        if e.state in (ft.AppLifecycleState.HIDE, ft.AppLifecycleState.INACTIVE,
+                       ft.AppLifecycleState.PAUSE, ft.AppLifecycleState.DETACH):
+            if self.game.game_active:
+                guardar_partida(self.game, self.ruta_partida)
+            self.entrar_reposo("segundo_plano")
+        elif e.state in (ft.AppLifecycleState.SHOW, ft.AppLifecycleState.RESUME):
+            if self.reposo == "segundo_plano":
+                self.salir_reposo()
+
+    def close_game_over_overlay(self, e=None):
+        """Oculta el overlay de Game Over, llamado por 'Menú Principal' o 'Volver a Jugar'."""
+        if self.game_over_overlay is None:
+            return
+        self.game_over_overlay.visible = False
+        self.actualizar()
+
+    def cerrar(self):
+        """Libera la sesión: detiene la partida, el consumidor de entrada y los espectadores, y quita sus controles de la página."""
+        with self._audio_lock:
+            self.cerrada = True
+        self.game.game_active = False
+        self.entrada.cerrar()
+        with self._lock_reposo:
+            pendientes, self._temporizadores = self._temporizadores, {}
+            if self._secuencia_cancelada is not None:
+                self._secuencia_cancelada.set()
+        for temporizador in pendientes:
+            temporizador.cancelar()
+        if perfilador.activo:
+            # Lo acumulado hasta aquí queda en disco aunque el proceso no termine limpio
+            perfilador.volcar()
+        if self.torneo is not None:
+            # Su resultado queda en la clasificación; el juego ya no
+            self.torneo.retirar(self.nombre_torneo)
+        if self.espectadores is not None:
+            # Suelta el puerto: una app reconstruida en la misma página vuelve a abrirlo
+            self.espectadores.cerrar()
+            self.espectadores = None
+        self.temas.liberar()
+        if self.audio_secuencia is not None and self.audio_secuencia in self.page.overlay:
+            self.page.overlay.remove(self.audio_secuencia)
+        if self.master_container in self.page.controls:
+            self.page.controls.remove(self.master_container)
+        if _apps_por_pagina.get(self.page) is self:
+            del _apps_por_pagina[self.page]
+
+    def cambiar_tema_click(self, e):
+        """Prepara el siguiente tema en segundo plano; se aplicará al empezar la próxima ronda."""
+        self.temas.precargar(self.temas.siguiente())
+
+    def alternar_perfilador(self, e=None):
+        """Gesto oculto: prende el perfilador o, si ya estaba prendido, lo apaga y vuelca las pilas."""
+        if getattr(self.page, "web", False):
+            return
+        ruta = perfilador.alternar()
+        if perfilador.activo:
+            print("Perfilador prendido")
+        else:
+            print(f"Perfilador apagado: {perfilador.muestras} muestras en {ruta}")
+
+    def restart_game_click(self, e):
+        """Manejador de clic del botón de Reinicio."""
+        # La partida nueva despierta a la app del reposo del Game Over
+        self.salir_reposo()
+        # Entre partidas también es un buen momento para cambiar de tema
+        self.aplicar_tema_pendiente()
+        # Ocultar el overlay
+        self.close_game_over_overlay() 
+        # Iniciar el juego
+        self.game.start_game()
+        
+
+def main(page: ft.Page):
+    """Función principal que inicia la aplicación Flet."""
+    app = SimonFletApp(page)
+    if page.web:
+        # Una sesión web que termina no vuelve: se liberan sus hilos y su instantánea
+        def sesion_cerrada(e):
+            app.cerrar()
+            borrar_partida(app.ruta_partida)
+        page.on_close = sesion_cerrada
+
+if __name__ == "__main__":
+    # Inicia la aplicación en modo de escritorio (Desktop)
+    if RAIZ_ASSETS:
+        ft.app(target=main, assets_dir=RAIZ_ASSETS)
+    else:
+        ft.app(target=main)
@@ -0,0 +1,268 @@
+# lanzador_web.py (Versión web en varios procesos, con reparto de sesiones y récords compartidos)
+#
+# Con ft.app(target=main) todas las sesiones web viven en un proceso y se
+# turnan el GIL. Este lanzador arranca N procesos trabajadores, cada uno con su
+# propio servidor Flet que aloja muchas sesiones de SimonFletApp, y delante un
+# despachador HTTP local: cada navegador que entra recibe una redirección al
+# trabajador con menos sesiones, y una cookie lo mantiene en el mismo
+# trabajador mientras vuelva. Los récords de todos los procesos van a una sola
+# base SQLite (almacen_records.py), que admite escritores concurrentes.
+#
+# Uso:
+#   python lanzador_web.py                          -> despachador en :8550, trabajadores en :8551...
+#   python lanzador_web.py --trabajadores 4 --puerto 9000
+#   python lanzador_web.py --benchmark              -> rendimiento del motor con 1..N procesos
+#
+# El benchmark mide solo el motor (bots de anfitrion_sesiones.py sin demoras) y
+# la base de récords compartida: cuánto escala el trabajo de CPU con los
+# procesos. No incluye SimonFletApp ni el servidor Flet de los trabajadores.
+#
+# GET /estado en el despachador devuelve las sesiones por trabajador y el récord (JSON).
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from almacen_records import ARCHIVO_RECORDS, AlmacenRecords
+
+COOKIE_TRABAJADOR = "simon_trabajador"
+
+# ============================================================================
+#  TRABAJADORES
+# ============================================================================
+
+def _trabajador(indice, puerto, host, sesiones_activas, ruta_records):
+    """Proceso trabajador: un servidor Flet (sin abrir navegador) con muchas sesiones."""
+    os.environ["SIMON_RECORDS"] = ruta_records
+    # Cada sesión nueva es de otro jugador: no hay partida propia que reanudar
+    os.environ["SIMON_INSTANTANEAS"] = "0"
+    # El resumen de arranque en frío no tiene sentido con muchas sesiones por proceso
+    os.environ.setdefault("SIMON_PERFIL_ARRANQUE", "0")
+    import flet as ft
+    import interfaz
+
+    def main(page: ft.Page):
+        # Primero la app: si su construcción falla, la sesión no cuenta como carga
+        app = interfaz.SimonFletApp(page)
+
+        def sesion_cerrada(e):
+            with sesiones_activas.get_lock():
+                sesiones_activas[indice] -= 1
+            # Sin esto cada sesión terminada dejaría su hilo de entrada y sus controles vivos
+            app.cerrar()
+
+        with sesiones_activas.get_lock():
+            sesiones_activas[indice] += 1
+        page.on_close = sesion_cerrada
+
+    opciones = {"assets_dir": interfaz.RAIZ_ASSETS} if interfaz.RAIZ_ASSETS else {}
+    ft.app(target=main, host=host, port=puerto, view=None, **opciones)
+
+# ============================================================================
+#  DESPACHADOR
+# ============================================================================
+
+class Despachador:
+    """Elige el trabajador de cada sesión nueva: el de menos sesiones, rotando los empates."""
+
+    def __init__(self, puertos, sesiones_activas, almacen):
+        self.puertos = puertos
+        self.sesiones_activas = sesiones_activas
+        self.almacen = almacen
+        self._turno = 0
+        # ThreadingHTTPServer atiende cada pedido en su hilo: el turno se lee y avanza junto
+        self._lock = threading.Lock()
+
+    def elegir(self, preferido=None):
+        if preferido is not None and 0 <= preferido < len(self.puertos):
+            return preferido
+        cargas = self.sesiones_activas[:]
+        n = len(self.puertos)
+        # Varias redirecciones pueden llegar antes de que la sesión se conecte: la rotación las reparte
+        with self._lock:
+            elegido = min(range(n), key=lambda i: (cargas[i], (i - self._turno) % n))
+            self._turno = (elegido + 1) % n
+        return elegido
+
+    def estado(self):
+        # Una conexión para todos los pedidos (no una por hilo que nunca se cierra)
+        record, partidas = self.almacen.resumen()
+        return {
+            "trabajadores": [{"puerto": puerto, "sesiones": sesiones}
+                             for puerto, sesiones in zip(self.puertos, self.sesiones_activas[:])],
+            "record": record,
+            "partidas": partidas,
+        }
+
+
+class _ManejadorDespacho(BaseHTTPRequestHandler):
+    def do_GET(self):
+        despachador = self.server.despachador
+        if self.path == "/estado":
+            cuerpo = json.dumps(despachador.estado()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+            return
+
+        preferido = None
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        if COOKIE_TRABAJADOR in cookie and cookie[COOKIE_TRABAJADOR].value.isdigit():
+            preferido = int(cookie[COOKIE_TRABAJADOR].value)
+        indice = despachador.elegir(preferido)
+
+        # El cliente Flet abre su websocket contra el mismo origen, así que basta con redirigir
+        host = self.headers.get("Host", "127.0.0.1").rsplit(":", 1)[0]
+        self.send_response(307)
+        self.send_header("Location", f"http://{host}:{despachador.puertos[indice]}{self.path}")
+        self.send_header("Set-Cookie", f"{COOKIE_TRABAJADOR}={indice}; Path=/")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def lanzar(trabajadores, puerto, host="127.0.0.1", ruta_records=ARCHIVO_RECORDS):
+    """Arranca los trabajadores y atiende el despachador hasta Ctrl+C."""
+    # La base (y su modo WAL) se crea antes de que arranquen los trabajadores
+    almacen = AlmacenRecords(ruta_records)
+    sesiones_activas = multiprocessing.Array("i", trabajadores)
+    puertos = [puerto + 1 + i for i in range(trabajadores)]
+    procesos = [multiprocessing.Process(target=_trabajador, name=f"trabajador-{i}", daemon=True,
+                                        args=(i, puertos[i], host, sesiones_activas, ruta_records))
+                for i in range(trabajadores)]
+    for proceso in procesos:
+        proceso.start()
+
+    servidor = ThreadingHTTPServer((host, puerto), _ManejadorDespacho)
+    servidor.despachador = Despachador(puertos, sesiones_activas, almacen)
+    print(f"Despachador en http://{host}:{puerto}  |  trabajadores en los puertos {puertos}")
+    print(f"Récords compartidos en {ruta_records} (récord actual: {almacen.record()})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        almacen.cerrar()
+        for proceso in procesos:
+            proceso.terminate()
+        for proceso in procesos:
+            proceso.join()
+
+# ============================================================================
+#  BENCHMARK: rendimiento según la cantidad de procesos
+# ============================================================================
+
+def _carga_trabajador(indice, segundos, sesiones, prob_error, ruta_records, barrera, resultados):
+    """
+    Un trabajador del benchmark: 'sesiones' partidas del motor (AnfitrionSesiones, sin
+    SimonFletApp ni Flet) con bots sin demoras (todo CPU); cada partida terminada se
+    registra en el almacén compartido.
+    """
+    from anfitrion_sesiones import AnfitrionSesiones
+
+    almacen = AlmacenRecords(ruta_records)
+    rnd = random.Random(indice)
+
+    async def correr():
+        anfitrion = AnfitrionSesiones(escala_tiempo=0.0)
+        partidas = 0
+
+        def jugar(sesion, evento, dato):
+            nonlocal partidas
+            if evento == "turno":
+                game = sesion.game
+                for i in range(game.inicio_ventana(), len(game.sequence)):
+                    boton = game.sequence[i]
+                    if rnd.random() < prob_error:
+                        boton = (boton + 1) % game.num_botones
+                    if not anfitrion.presionar(sesion, boton):
+                        break
+            elif evento == "game_over":
+                almacen.registrar(sesion.game.score, f"trabajador-{indice}")
+                partidas += 1
+                anfitrion.cerrar(sesion)
+                anfitrion.abrir(jugar)
+
+        for _ in range(sesiones):
+            anfitrion.abrir(jugar)
+        inicio = time.perf_counter()
+        await asyncio.sleep(segundos)
+        transcurrido = time.perf_counter() - inicio
+        for sesion in list(anfitrion.sesiones.values()):
+            anfitrion.cerrar(sesion)
+        return anfitrion.veredictos, partidas, transcurrido
+
+    # Todos los trabajadores empiezan a medir juntos (la importación no cuenta)
+    barrera.wait()
+    resultados.put(asyncio.run(correr()))
+
+
+def benchmark(max_trabajadores, segundos, sesiones, prob_error):
+    """Escalado del motor con 1..N procesos: partidas de bots y récords en SQLite, sin Flet."""
+    print("Lanzador web multiproceso: rendimiento del motor según la cantidad de procesos")
+    print("(solo motor y récords compartidos; no mide SimonFletApp ni el servidor Flet)")
+    print("========================================")
+    print(f"Núcleos disponibles: {os.cpu_count()}  |  sesiones por proceso: {sesiones}  |  {segundos} s por medición")
+    print(f"{'procesos':>9}{'presiones/s':>14}{'partidas/s':>12}{'escalado':>10}{'récords ok':>12}")
+    base = None
+    with tempfile.TemporaryDirectory() as carpeta:
+        for trabajadores in range(1, max_trabajadores + 1):
+            ruta = os.path.join(carpeta, f"records_{trabajadores}.db")
+            AlmacenRecords(ruta)
+            barrera = multiprocessing.Barrier(trabajadores)
+            resultados = multiprocessing.Queue()
+            procesos = [multiprocessing.Process(target=_carga_trabajador,
+                                                args=(i, segundos, sesiones, prob_error, ruta, barrera, resultados))
+                        for i in range(trabajadores)]
+            for proceso in procesos:
+                proceso.start()
+            datos = [resultados.get() for _ in procesos]
+            for proceso in procesos:
+                proceso.join()
+
+            presiones = sum(d[0] / d[2] for d in datos)
+            partidas = sum(d[1] for d in datos)
+            # Ninguna partida se pierde aunque varios procesos escriban a la vez
+            registradas = AlmacenRecords(ruta).total_partidas()
+            base = base or presiones
+            print(f"{trabajadores:>9}{presiones:>14,.0f}{sum(d[1] / d[2] for d in datos):>12,.0f}"
+                  f"{presiones / base:>9.2f}x{'sí' if registradas == partidas else 'NO':>12}")
+    print("========================================")
+    if os.cpu_count() and os.cpu_count() < max_trabajadores:
+        print("Aviso: hay menos núcleos que procesos; por encima de los núcleos no se espera escalado.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lanzador web multiproceso de Simon Dice")
+    parser.add_argument("--trabajadores", type=int, default=os.cpu_count() or 1,
+                        help="Procesos trabajadores (en el benchmark, el máximo a medir)")
+    parser.add_argument("--puerto", type=int, default=8550, help="Puerto del despachador")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--records", default=ARCHIVO_RECORDS, help="Base SQLite de récords compartidos")
+    parser.add_argument("--benchmark", action="store_true", help="Medir el rendimiento del motor (sin Flet) con 1..N procesos")
+    parser.add_argument("--segundos", type=float, default=5.0, help="Duración de cada medición del benchmark")
+    parser.add_argument("--sesiones", type=int, default=200, help="Sesiones por proceso en el benchmark")
+    parser.add_argument("--error", type=float, default=0.01, help="Probabilidad de fallo de los bots")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(max(2, args.trabajadores), args.segundos, args.sesiones, args.error)
+    else:
+        lanzar(args.trabajadores, args.puerto, args.host, args.records)
+
+
+if __name__ == "__main__":
+    main()
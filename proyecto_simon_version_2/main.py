@@ -1,135 +1,160 @@
-# simon_main.py (versión para interfaz antigua sin barra inferior)
-
-import random
-
-# ============================================================================
-#  CONFIGURACIÓN DE COLORES Y SONIDOS
-# ============================================================================
-
-COLORES = ["green", "red", "yellow", "blue"]
-
-# Mapeo recomendado según tu sonidos.py (sound1.wav – sound4.wav)
-SIMON_SOUNDS_MAP = {
-    "green": "sound1.wav",
-    "red": "sound2.wav",
-    "yellow": "sound3.wav",
-    "blue": "sound4.wav",
-}
-
-# ============================================================================
-#  CLASE PRINCIPAL DEL JUEGO
-# ============================================================================
-
-class SimonGame:
-    def __init__(
-        self,
-        on_update_score=None,
-        on_game_over=None,
-        on_sequence_done=None,
-        on_delay_request=None,
-        on_update_high_score=None,
-        flash_duration=0.35
-    ):
-        # Callbacks conectados desde la interfaz Flet
-        self.on_update_score = on_update_score
-        self.on_game_over = on_game_over
-        self.on_sequence_done = on_sequence_done
-        self.on_delay_request = on_delay_request
-        self.on_update_high_score = on_update_high_score
-
-        # Configuración interna
-        self.flash_duration = flash_duration
-
-        # Estado del juego
-        self.sequence = []          # Secuencia generada por el juego
-        self.player_index = 0       # Índice de avance del jugador
-        self.score = 0              # Puntuación
-        self.high_score = 0         # Record Puntuación
-        self.game_active = False    # Estado del juego
-
-    # ============================================================================
-    #  MÉTODOS PÚBLICOS
-    # ============================================================================
-
-    def start_game(self):
-        """Inicia un nuevo juego desde cero."""
-        self.sequence = []
-        self.player_index = 0
-        self.score = 0
-        self.game_active = True
-        
-        self._update_score_text()
-        self._update_high_score_text()
-        
-        # Empezar con la primera ronda
-        self._delay(lambda: self._add_step_to_sequence(), 0.6)
-
-    def check_player_press(self, color_pressed):
-        """
-        Verifica si el jugador presionó el color correcto.
-        Devuelve True si es correcto.
-        """
-        if not self.game_active:
-            return False
-
-        correcto = (color_pressed == self.sequence[self.player_index])
-
-        if correcto:
-            # Avanzamos
-            self.player_index += 1
-
-            # ¿Completó la secuencia?
-            if self.player_index >= len(self.sequence):
-                # Aumentar puntaje
-                self.score += 1
-                self._update_score_text()
-
-                # Avanzar de ronda
-                self.player_index = 0
-                self._delay(self._add_step_to_sequence, 0.8)
-
-            return True
-
-        # INCORRECTO → GAME OVER
-        self._game_over()
-        return False
-
-    # ============================================================================
-    #  MÉTODOS INTERNOS
-    # ============================================================================
-
-    def _update_score_text(self):
-        if self.on_update_score:
-            self.on_update_score(f"Puntaje: {self.score}")
-    
-    def _update_high_score_text(self):
-        if self.on_update_high_score:
-            self.on_update_high_score(f"Récord: {self.high_score}")
-
-    def _game_over(self):
-        self.game_active = False
-        if self.score > self.high_score:
-            self.high_score = self.score
-            self._update_high_score_text() # Notificar a la UI que el récord ha cambiado
-        if self.on_game_over:
-            self.on_game_over(f"Game Over — Puntaje final: {self.score}")
-
-    
-
-    def _add_step_to_sequence(self):
-        """Agrega un nuevo color a la secuencia y pasa su reproducción a la interfaz."""
-        if not self.game_active:
-            return
-        
-        nuevo_color = random.choice(COLORES)
-        self.sequence.append(nuevo_color)
-
-        # Reproducir la secuencia en la interfaz
-        if self.on_sequence_done:
-            self.on_sequence_done(self.sequence, self.flash_duration)
-
-    def _delay(self, action, seconds):
-        """Solicita a la UI que ejecute algo después del retraso."""
-        if self.on_delay_request:
-            self.on_delay_request(action, seconds)
-
+# simon_main.py (versión para interfaz antigua sin barra inferior)
+
+import os
+import sys
+
+# El motor compartido (motor_simon/) está en la raíz del repositorio
+_RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Delante de los paquetes instalados (un 'motor_simon' instalado no lo tapa) pero detrás
+# de la carpeta de la app (sys.path[0]): la raíz tiene su propio interfaz.py
+if _RAIZ_REPO not in sys.path:
+    sys.path.insert(1, _RAIZ_REPO)
+
+from motor_simon import FALLO, RONDA_COMPLETA, ControlDificultad, MotorSimon
+
+# ============================================================================
+#  CONFIGURACIÓN DE COLORES Y SONIDOS
+# ============================================================================
+
+COLORES = ["green", "red", "yellow", "blue"]
+
+# Mapeo recomendado según tu sonidos.py (sound1.wav – sound4.wav)
+SIMON_SOUNDS_MAP = {
+    "green": "sound1.wav",
+    "red": "sound2.wav",
+    "yellow": "sound3.wav",
+    "blue": "sound4.wav",
+}
+
+# ============================================================================
+#  CLASE PRINCIPAL DEL JUEGO
+# ============================================================================
+
+class SimonGame(MotorSimon):
+    """Adaptador del motor para la interfaz Flet: mismos callbacks y atributos de siempre."""
+
+    # Como el motor, sin __dict__ por instancia (importa con miles de sesiones por proceso)
+    __slots__ = (
+        "on_update_score", "on_game_over", "on_sequence_done", "on_delay_request",
+        "on_update_high_score", "on_press", "en_reposo", "_aplazadas",
+    )
+
+    def __init__(
+        self,
+        on_update_score=None,
+        on_game_over=None,
+        on_sequence_done=None,
+        on_delay_request=None,
+        on_update_high_score=None,
+        flash_duration=0.35,
+        num_botones=len(COLORES),
+        modo_maraton=False,
+        ventana_maraton=8,
+        dificultad_adaptativa=False,
+        secuencia_compartida=None
+    ):
+        # Estado del juego (sequence, player_index, score, high_score, game_active,
+        # tamaño del tablero, modo maratón y secuencia de torneo) en los __slots__ del motor
+        super().__init__(num_botones=num_botones, flash_duration=flash_duration,
+                         modo_maraton=modo_maraton, ventana_maraton=ventana_maraton,
+                         dificultad=ControlDificultad() if dificultad_adaptativa else None,
+                         secuencia_compartida=secuencia_compartida)
+
+        # Callbacks conectados desde la interfaz Flet
+        self.on_update_score = on_update_score
+        self.on_game_over = on_game_over
+        self.on_sequence_done = on_sequence_done
+        self.on_delay_request = on_delay_request
+        self.on_update_high_score = on_update_high_score
+        self.on_press = None        # Se llama con cada presión antes de validarla (espectadores)
+
+        # Reposo (ver reposo.py): las acciones diferidas se guardan en vez de pedirse a la UI
+        self.en_reposo = False
+        self._aplazadas = []
+
+    # ============================================================================
+    #  MÉTODOS PÚBLICOS
+    # ============================================================================
+
+    def start_game(self):
+        """Inicia un nuevo juego desde cero."""
+        self.reiniciar()
+        
+        self._update_score_text()
+        self._update_high_score_text()
+        
+        # Empezar con la primera ronda
+        self._delay(lambda: self._add_step_to_sequence(), 0.6)
+
+    def check_player_press(self, boton_presionado):
+        """
+        Verifica si el jugador presionó el botón correcto (índice 0..num_botones-1).
+        Devuelve True si es correcto.
+        """
+        if self.on_press:
+            self.on_press(boton_presionado)
+        resultado = self.presionar(boton_presionado)
+
+        if resultado == RONDA_COMPLETA:
+            # Aumentó el puntaje: avisar y pedir la próxima ronda
+            self._update_score_text()
+            self._delay(self._add_step_to_sequence, 0.8)
+            return True
+
+        if resultado == FALLO:
+            # INCORRECTO → GAME OVER
+            self._game_over()
+            return False
+
+        return resultado > 0
+
+    def suspender(self):
+        """Entra en reposo: desde aquí los retardos quedan aplazados hasta reanudar()."""
+        self.en_reposo = True
+
+    def aplazar(self, action, seconds):
+        """Devuelve al juego una acción diferida que la UI canceló al entrar en reposo."""
+        self._aplazadas.append((action, seconds))
+
+    def reanudar(self):
+        """Sale del reposo y vuelve a pedir, con su retardo completo, las acciones aplazadas."""
+        self.en_reposo = False
+        aplazadas, self._aplazadas = self._aplazadas, []
+        for action, seconds in aplazadas:
+            self._delay(action, seconds)
+
+    # ============================================================================
+    #  MÉTODOS INTERNOS
+    # ============================================================================
+
+    def _update_score_text(self):
+        if self.on_update_score:
+            self.on_update_score(f"Puntaje: {self.score}")
+    
+    def _update_high_score_text(self):
+        if self.on_update_high_score:
+            self.on_update_high_score(f"Récord: {self.high_score}")
+
+    def _game_over(self):
+        if self.terminar():
+            self._update_high_score_text() # Notificar a la UI que el récord ha cambiado
+        if self.on_game_over:
+            self.on_game_over(f"Game Over — Puntaje final: {self.score}")
+
+    def _add_step_to_sequence(self):
+        """Agrega un nuevo botón a la secuencia y pasa su reproducción a la interfaz."""
+        if not self.game_active:
+            return
+        
+        self.agregar_paso()
+
+        # Reproducir la secuencia en la interfaz (un generador, no una lista)
+        if self.on_sequence_done:
+            self.on_sequence_done(self.iterar_reproduccion(), self.flash_duration)
+
+    def _delay(self, action, seconds):
+        """Solicita a la UI que ejecute algo después del retraso."""
+        if self.en_reposo:
+            self.aplazar(action, seconds)
+        elif self.on_delay_request:
+            self.on_delay_request(action, seconds)
@@ -0,0 +1,90 @@
+# maraton.py (Prueba de carga del modo maratón, sin interfaz)
+#
+# Juega una partida perfecta de miles de rondas contra SimonGame y mide, por
+# tramos, el tiempo por ronda, los flashes emitidos y la memoria. En modo
+# maratón todo eso debe mantenerse plano aunque la secuencia siga creciendo;
+# con --completo se compara con la reproducción de la secuencia entera (O(n²)).
+#
+# Uso:
+#   python maraton.py                    -> 10 000 pasos, ventana de 8
+#   python maraton.py --pasos 50000 --ventana 16
+#   python maraton.py --pasos 2000 --completo
+
+import argparse
+import time
+import tracemalloc
+
+from main import SimonGame
+
+
+class JugadorPerfecto:
+    """Conecta los callbacks del juego y responde siempre bien, sin hilos ni esperas."""
+
+    def __init__(self, game):
+        self.game = game
+        self.pendiente = None
+        self.flashes = 0
+        self.ultima_ventana = []
+        game.on_delay_request = self._guardar_accion
+        game.on_sequence_done = self._reproducir
+
+    def _guardar_accion(self, action, seconds):
+        self.pendiente = action
+
+    def _reproducir(self, sequence, flash_duration):
+        # Se consume el generador como lo haría la UI, pero sin dormir
+        inicio = self.game.inicio_ventana()
+        self.flashes_ronda = 0
+        for _ in sequence:
+            self.flashes_ronda += 1
+        self.flashes += self.flashes_ronda
+        self.ultima_ventana = range(inicio, len(self.game.sequence))
+
+    def jugar_ronda(self):
+        """Ejecuta la acción diferida (nuevo paso) y contesta la ventana de la ronda."""
+        accion, self.pendiente = self.pendiente, None
+        accion()
+        secuencia = self.game.sequence
+        for i in self.ultima_ventana:
+            self.game.check_player_press(secuencia[i])
+
+
+def correr(pasos, modo_maraton, ventana, tramos=10):
+    game = SimonGame(modo_maraton=modo_maraton, ventana_maraton=ventana)
+    jugador = JugadorPerfecto(game)
+    game.start_game()
+
+    tracemalloc.start()
+    tamano_tramo = max(1, pasos // tramos)
+    inicio_tramo = time.perf_counter()
+    flashes_tramo = 0
+    print(f"{'rondas':>8}{'us/ronda':>12}{'flashes/ronda':>15}{'memoria KB':>12}")
+    for ronda in range(1, pasos + 1):
+        antes = jugador.flashes
+        jugador.jugar_ronda()
+        flashes_tramo += jugador.flashes - antes
+        if ronda % tamano_tramo == 0:
+            segundos = time.perf_counter() - inicio_tramo
+            memoria, _ = tracemalloc.get_traced_memory()
+            print(f"{ronda:>8}{segundos * 1e6 / tamano_tramo:>12.1f}"
+                  f"{flashes_tramo / tamano_tramo:>15.1f}{memoria / 1024:>12.1f}")
+            inicio_tramo = time.perf_counter()
+            flashes_tramo = 0
+    tracemalloc.stop()
+
+    assert game.game_active and game.score == pasos
+    print(f"Puntaje final: {game.score}  |  Largo de la secuencia: {len(game.sequence)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del modo maratón de Simon Dice")
+    parser.add_argument("--pasos", type=int, default=10_000)
+    parser.add_argument("--ventana", type=int, default=8)
+    parser.add_argument("--completo", action="store_true",
+                        help="Reproducir la secuencia entera cada ronda (comportamiento clásico)")
+    args = parser.parse_args()
+    correr(args.pasos, not args.completo, args.ventana)
+
+
+if __name__ == "__main__":
+    main()
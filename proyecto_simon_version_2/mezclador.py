@@ -0,0 +1,187 @@
+# mezclador.py (Pista de audio pre-mezclada e incremental para la secuencia de Simon)
+#
+# En lugar de lanzar un ft.Audio por cada paso de la secuencia, se mantiene una
+# única pista PCM con la secuencia ya mezclada. Cada ronda solo se agrega la nota
+# nueva (y su pausa) al final de la pista: el costo de mezcla por ronda es O(1)
+# respecto al largo de la secuencia, y la UI reproduce la ronda como un solo clip.
+#
+# Lo que sigue siendo O(n) por ronda: comparar la secuencia con los pasos ya
+# mezclados (una comparación de bytes en C, para detectar una partida nueva) y
+# armar el string base64 final, porque ft.Audio recibe el clip entero. La
+# codificación base64 de la parte de la pista que ya no cambia se guarda y solo
+# se codifica lo nuevo.
+
+import base64
+import os
+import struct
+from array import array
+
+import numpy as np
+
+# Pausa entre un flash y el siguiente (la misma que usa run_flash_sequence)
+DELAY_SEQUENCE = 0.25
+
+
+def _leer_notas(rutas):
+    """Abre el WAV de cada botón (vistas memmap compartidas). Si falta uno de los clásicos, lo sintetiza."""
+    from cargador_wav import a_pcm16, cargar_wav
+
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    notas = []
+    sample_rate = None
+    for file_name in rutas:
+        ruta = os.path.join(carpeta, file_name)
+        if os.path.exists(ruta):
+            sonido = cargar_wav(ruta)
+            # PCM de 16 bits se usa tal cual (vista memmap); µ-law se decodifica
+            sr, datos = sonido.sample_rate, a_pcm16(sonido)
+        else:
+            from sonidos import sintetizar_nota, SONIDOS_A_GENERAR
+            frecuencias = {nombre: freq for freq, nombre in SONIDOS_A_GENERAR}
+            if os.path.basename(file_name) not in frecuencias:
+                raise FileNotFoundError(ruta)
+            sr, datos = 44100, sintetizar_nota(frecuencias[os.path.basename(file_name)])
+        if sample_rate is not None and sr != sample_rate:
+            raise ValueError(f"{file_name} tiene {sr} Hz, se esperaban {sample_rate} Hz")
+        sample_rate = sr
+        if datos.dtype != np.int16 or datos.ndim != 1:
+            raise ValueError(f"{file_name} debe ser PCM mono de 16 bits")
+        notas.append(datos)
+    return notas, sample_rate
+
+
+class MezcladorSecuencia:
+    """
+    Mantiene la pista PCM (mono, 16 bits) de la secuencia actual.
+    La pista crece duplicando su capacidad, así que agregar un paso es O(1) amortizado.
+    """
+
+    def __init__(self, notas, sample_rate, delay_sequence=DELAY_SEQUENCE):
+        self.notas = notas                  # Índice de botón -> arreglo int16
+        self.sample_rate = sample_rate
+        self.delay_sequence = delay_sequence
+
+        self._pista = np.zeros(sample_rate * 4, dtype=np.int16)
+        self._largo = 0                     # Muestras válidas de la pista
+        self._cursor = 0                    # Donde empieza el próximo paso
+        self._flash_duration = None
+        self._inicio = 0                    # Primer paso de la secuencia que contiene la pista
+        self._wav_cache = None              # Último clip exportado (base64)
+        self._botones = array('B')          # Botones ya mezclados, en orden
+        self._b64_cuerpo = ""               # base64 de los bytes PCM [1, _b64_fin), que ya no cambian
+        self._b64_fin = 1
+        self.pasos = 0
+
+    @classmethod
+    def desde_archivos(cls, rutas):
+        """Crea el mezclador a partir de la lista de archivos WAV (uno por botón)."""
+        notas, sample_rate = _leer_notas(rutas)
+        return cls(notas, sample_rate)
+
+    def reiniciar(self):
+        """Vacía la pista (nuevo juego)."""
+        self._pista[:self._largo] = 0
+        self._largo = 0
+        self._cursor = 0
+        self._wav_cache = None
+        del self._botones[:]
+        self._b64_cuerpo = ""
+        self._b64_fin = 1
+        self.pasos = 0
+
+    def _asegurar_capacidad(self, muestras):
+        if muestras <= len(self._pista):
+            return
+        capacidad = len(self._pista)
+        while capacidad < muestras:
+            capacidad *= 2
+        nueva = np.zeros(capacidad, dtype=np.int16)
+        nueva[:self._largo] = self._pista[:self._largo]
+        self._pista = nueva
+
+    def agregar_paso(self, boton, flash_duration):
+        """Mezcla la nota de un botón al final de la pista, seguida de su pausa."""
+        nota = self.notas[boton]
+        inicio = self._cursor
+        fin_nota = inicio + len(nota)
+        paso = int((flash_duration + self.delay_sequence) * self.sample_rate)
+
+        self._asegurar_capacidad(max(fin_nota, inicio + paso))
+
+        # Solo se toca la ventana de la nota nueva: si la cola de la nota anterior
+        # se solapa, se suma con saturación para no desbordar los 16 bits.
+        ventana = self._pista[inicio:fin_nota]
+        mezcla = ventana.astype(np.int32) + nota
+        np.clip(mezcla, -32768, 32767, out=mezcla)
+        ventana[:] = mezcla
+
+        self._cursor = inicio + paso
+        self._largo = max(self._largo, fin_nota, self._cursor)
+        self._wav_cache = None
+        self._botones.append(boton)
+        self.pasos += 1
+
+    def sincronizar(self, sequence, flash_duration, inicio=0, pausa=None):
+        """
+        Deja la pista igual a sequence[inicio:].
+        En el caso normal (un paso más que la ronda anterior) solo se mezcla ese paso;
+        si los pasos ya mezclados no son el comienzo de la secuencia (nuevo juego,
+        aunque tenga el mismo largo), cambió la duración o la pausa (dificultad
+        adaptativa) o se movió la ventana (modo maratón), se reconstruye:
+        O(tamaño de la ventana).
+        """
+        if pausa is None:
+            pausa = self.delay_sequence
+        mezclados = sequence[inicio:inicio + self.pasos]
+        if not isinstance(mezclados, array):
+            mezclados = array('B', mezclados)
+        if (mezclados != self._botones or flash_duration != self._flash_duration
+                or inicio != self._inicio or pausa != self.delay_sequence):
+            self.reiniciar()
+            self.delay_sequence = pausa
+            self._flash_duration = flash_duration
+            self._inicio = inicio
+        for i in range(inicio + self.pasos, len(sequence)):
+            self.agregar_paso(sequence[i], flash_duration)
+
+    def pcm(self):
+        """Vista (sin copia) de las muestras válidas de la pista."""
+        return self._pista[:self._largo]
+
+    def _cabecera(self, largo_datos):
+        return struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + largo_datos, b"WAVE",
+            b"fmt ", 16, 1, 1, self.sample_rate, self.sample_rate * 2, 2, 16,
+            b"data", largo_datos,
+        )
+
+    def wav_bytes(self):
+        """Devuelve la pista como archivo WAV completo (cabecera RIFF + PCM)."""
+        datos = self.pcm().tobytes()
+        return self._cabecera(len(datos)) + datos
+
+    def wav_base64(self):
+        """
+        Clip de la ronda listo para ft.Audio(src_base64=...). Se cachea hasta el siguiente paso.
+        La cabecera (44 bytes) y el primer byte PCM forman 45 bytes, múltiplo de 3, así que el
+        base64 del resto se puede armar por partes: lo anterior al cursor ya no cambia y se
+        codificó en rondas anteriores; solo se codifica lo nuevo y la cola de la última nota.
+        Unir el string final sigue copiando O(n) bytes.
+        """
+        if self._wav_cache is None:
+            datos = memoryview(self.pcm()).cast('B')
+            if len(datos) == 0:
+                self._wav_cache = base64.b64encode(self._cabecera(0)).decode("ascii")
+                return self._wav_cache
+            # Bytes PCM que ningún paso futuro va a tocar, en bloques de 3
+            estable = 1 + (2 * self._cursor - 1) // 3 * 3 if self._cursor else 1
+            if estable > self._b64_fin:
+                self._b64_cuerpo += base64.b64encode(datos[self._b64_fin:estable]).decode("ascii")
+                self._b64_fin = estable
+            self._wav_cache = "".join((
+                base64.b64encode(self._cabecera(len(datos)) + datos[:1]).decode("ascii"),
+                self._b64_cuerpo,
+                base64.b64encode(datos[self._b64_fin:]).decode("ascii"),
+            ))
+        return self._wav_cache
@@ -0,0 +1,204 @@
+# perfilador.py (Perfilador por muestreo que se prende y apaga con la app corriendo)
+#
+# Cuando alguien reporta tirones durante run_flash_sequence no hay forma de ver
+# qué hacía el proceso. Este perfilador no usa sys.setprofile: un hilo aparte
+# toma cada tanto la pila de todos los hilos (sys._current_frames) y cuenta las
+# pilas repetidas. Apagado no hay hilo ni ganchos; lo único que queda en el
+# camino del juego es etiquetar(), que asigna dos atributos.
+#
+# Cada muestra lleva la ronda y la fase (secuencia = la app muestra la ronda,
+# turno = juega el jugador) como primeros marcos de la pila, así en el flame
+# graph se separan solas. La salida es el formato "collapsed stacks"
+# (una pila por línea, marcos separados por ';', y la cuenta al final), el que
+# leen flamegraph.pl, speedscope o inferno.
+#
+# En la app: SIMON_PERFILADOR=1 lo prende al arrancar; una pulsación larga en el
+# círculo central (solo escritorio) lo prende/apaga y al apagarlo escribe
+# perfiles/perfil_<fecha>.folded. Sin el gesto (modo web, lanzador_web.py) el
+# archivo se reescribe con todo lo acumulado cada vez que se cierra una sesión
+# (volcar), y al terminar el proceso se escribe una última vez (atexit).
+#
+# Benchmark del costo:  python perfilador.py --segundos 3
+
+import atexit
+import os
+import sys
+import threading
+import time
+
+# 100 muestras por segundo: suficiente para ver un tirón de 50 ms sin cargar el GIL
+INTERVALO = 0.01
+# Las pilas más profundas se cortan por la raíz (lo de arriba es lo que interesa)
+PROFUNDIDAD_MAXIMA = 64
+CARPETA_PERFILES = "perfiles"
+
+
+def _nombre_marco(codigo):
+    return f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})"
+
+
+class PerfiladorMuestreo:
+    """Muestrea las pilas de todos los hilos y las acumula por ronda y fase."""
+
+    def __init__(self, intervalo=INTERVALO, carpeta=CARPETA_PERFILES):
+        self.intervalo = intervalo
+        self.carpeta = carpeta
+        self.ronda = 0
+        self.fase = "inicio"
+        self.muestras = 0
+        self._pilas = {}            # (ronda, fase, hilo, códigos) -> cuenta
+        self._nombres_hilos = {}
+        self._hilo = None
+        self._detener = threading.Event()
+        self._inicio = None
+        self._ruta = None           # Archivo de este encendido (volcar lo reescribe)
+        self._con_atexit = False
+
+    @property
+    def activo(self):
+        return self._hilo is not None
+
+    def etiquetar(self, ronda, fase):
+        """Ronda y fase actuales; se llama siempre, esté prendido o no (cuesta dos asignaciones)."""
+        self.ronda = ronda
+        self.fase = fase
+
+    def iniciar(self):
+        if self._hilo is not None:
+            return
+        self._pilas = {}
+        self.muestras = 0
+        self._detener.clear()
+        self._inicio = time.perf_counter()
+        self._ruta = os.path.join(self.carpeta, time.strftime("perfil_%Y%m%d_%H%M%S.folded"))
+        if not self._con_atexit:
+            # Cerrar la ventana o terminar el proceso no tira las muestras
+            atexit.register(self._al_salir)
+            self._con_atexit = True
+        self._hilo = threading.Thread(target=self._muestrear, name="perfilador", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Apaga el muestreo y escribe el archivo .folded. Devuelve su ruta (None si no hubo muestras)."""
+        if self._hilo is None:
+            return None
+        self._detener.set()
+        self._hilo.join()
+        self._hilo = None
+        return self.volcar()
+
+    def volcar(self):
+        """Escribe lo acumulado hasta ahora sin apagar el muestreo. Devuelve la ruta (None si no hubo muestras)."""
+        if not self._pilas or self._ruta is None:
+            return None
+        os.makedirs(self.carpeta, exist_ok=True)
+        self.escribir(self._ruta)
+        return self._ruta
+
+    def _al_salir(self):
+        ruta = self.detener()
+        if ruta:
+            print(f"Perfilador: {self.muestras} muestras en {ruta}")
+
+    def alternar(self):
+        """Prende el perfilador si está apagado; si está prendido, lo apaga y devuelve la ruta del volcado."""
+        if self.activo:
+            return self.detener()
+        self.iniciar()
+        return None
+
+    def _nombre_hilo(self, ident):
+        nombre = self._nombres_hilos.get(ident)
+        if nombre is None:
+            # Solo se recorre la lista de hilos cuando aparece uno nuevo
+            self._nombres_hilos = {hilo.ident: hilo.name for hilo in threading.enumerate()}
+            nombre = self._nombres_hilos.get(ident, f"hilo-{ident}")
+        return nombre
+
+    def _muestrear(self):
+        propio = threading.get_ident()
+        pilas = self._pilas
+        while not self._detener.wait(self.intervalo):
+            ronda, fase = self.ronda, self.fase
+            for ident, marco in sys._current_frames().items():
+                if ident == propio:
+                    continue
+                codigos = []
+                while marco is not None and len(codigos) < PROFUNDIDAD_MAXIMA:
+                    codigos.append(marco.f_code)
+                    marco = marco.f_back
+                codigos.reverse()
+                clave = (ronda, fase, self._nombre_hilo(ident), tuple(codigos))
+                pilas[clave] = pilas.get(clave, 0) + 1
+            self.muestras += 1
+
+    def lineas_colapsadas(self):
+        """Las pilas en formato collapsed: 'ronda_N;fase;hilo;marco;...;marco cuenta'."""
+        nombres = {}
+        lineas = []
+        # Copia: el hilo de muestreo puede seguir agregando pilas mientras se vuelca
+        for (ronda, fase, hilo, codigos), cuenta in dict(self._pilas).items():
+            marcos = []
+            for codigo in codigos:
+                nombre = nombres.get(codigo)
+                if nombre is None:
+                    nombre = nombres[codigo] = _nombre_marco(codigo)
+                marcos.append(nombre)
+            lineas.append(";".join([f"ronda_{ronda}", fase, hilo, *marcos]) + f" {cuenta}")
+        lineas.sort()
+        return lineas
+
+    def escribir(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.lineas_colapsadas()) + "\n")
+
+
+# Perfilador compartido por todo el proceso (como la línea de tiempo de arranque)
+perfilador = PerfiladorMuestreo()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Costo del perfilador por muestreo")
+    parser.add_argument("--segundos", type=float, default=3.0, help="Duración de cada medición")
+    parser.add_argument("--hilos", type=int, default=4, help="Hilos de trabajo simulados")
+    args = parser.parse_args()
+
+    def trabajo(hasta, contador, indice):
+        # Carga parecida a la del juego: cuentas cortas de Python en varios hilos
+        n = 0
+        while time.perf_counter() < hasta:
+            sum(i * i for i in range(200))
+            n += 1
+        contador[indice] = n
+
+    def medir(con_perfilador):
+        contador = [0] * args.hilos
+        hasta = time.perf_counter() + args.segundos
+        if con_perfilador:
+            perfilador.iniciar()
+        hilos = [threading.Thread(target=trabajo, args=(hasta, contador, i), name=f"trabajo-{i}")
+                 for i in range(args.hilos)]
+        for i, hilo in enumerate(hilos):
+            perfilador.etiquetar(i + 1, "secuencia" if i % 2 == 0 else "turno")
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        return sum(contador)
+
+    apagado = medir(False)
+    prendido = medir(True)
+    inicio = time.perf_counter()
+    ruta = perfilador.detener()
+    volcado = time.perf_counter() - inicio
+
+    print("Perfilador por muestreo")
+    print("========================================")
+    print(f"Trabajo con el perfilador apagado:  {apagado / args.segundos:,.0f} iteraciones/s")
+    print(f"Trabajo con el perfilador prendido: {prendido / args.segundos:,.0f} iteraciones/s "
+          f"({prendido / apagado - 1:+.1%})")
+    print(f"Muestras: {perfilador.muestras} ({perfilador.muestras / args.segundos:.0f}/s, "
+          f"objetivo {1 / perfilador.intervalo:.0f}/s)")
+    print(f"Pilas distintas: {len(perfilador._pilas)}  |  volcado en {volcado * 1000:.1f} ms")
+    print(f"Archivo: {ruta}")
@@ -0,0 +1,215 @@
+# perfiles_audio.py (Perfiles de salida para los sonidos del juego)
+#
+# Hasta ahora cada tono se escribe como PCM mono de 16 bits a 44.1 kHz, y los
+# cuatro WAV están copiados en dos carpetas. Aquí cada perfil define cómo se
+# generan los assets (frecuencia de muestreo, códec, recorte de silencio) y
+# todos, los tonos de las dos versiones (proyecto_simon_version_2/ y
+# simon_dice/), se escriben en UNA sola carpeta de assets, direccionada por contenido:
+# un mismo archivo nunca se guarda dos veces. El manifiesto indica qué archivo
+# corresponde a cada sonido de cada perfil.
+#
+# Uso:
+#   python perfiles_audio.py                      -> genera todos los perfiles y muestra el reporte
+#   python perfiles_audio.py --perfil movil       -> solo un perfil
+#   python perfiles_audio.py --destino otra/ruta  -> cambia la carpeta de assets
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+from cargador_wav import a_pcm16, cargar_wav, vaciar_cache, WAVE_FORMAT_MULAW, WAVE_FORMAT_PCM
+from sonidos import sintetizar_nota, SONIDOS_A_GENERAR
+
+# Los tonos de simon_dice/ son otros (440-784 Hz) pero van a la misma carpeta; en el
+# manifiesto se nombran con su carpeta ("simon_dice/sound1.wav")
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PREFIJO_SIMON_DICE = "simon_dice/"
+
+# Carpeta única de assets, compartida por ambas versiones del juego. Con un perfil
+# activo, Flet busca aquí todos los sonidos: los generados (tableros/, temas/) también
+# se escriben y se leen bajo esta raíz (tablero.ruta_sonido)
+RAIZ_ASSETS = os.path.join(RAIZ_REPO, "assets")
+CARPETA_ASSETS = os.path.join(RAIZ_ASSETS, "sonidos")
+
+PERFILES = {
+    # Igual a los WAV actuales: máxima fidelidad
+    "alta": {"sample_rate": 44100, "codec": "pcm16", "recortar": False},
+    # Mitad de muestras; los tonos (< 1 kHz) no pierden nada audible
+    "estandar": {"sample_rate": 22050, "codec": "pcm16", "recortar": True},
+    # Pensado para móviles: 8 bits µ-law, cuarta parte del tamaño de 'estandar'
+    "movil": {"sample_rate": 16000, "codec": "mulaw", "recortar": True},
+    # Calidad telefónica para equipos de gama baja
+    "minima": {"sample_rate": 8000, "codec": "mulaw", "recortar": True},
+}
+
+# Umbral de silencio para el recorte (-50 dBFS) y margen que se conserva
+UMBRAL_SILENCIO = int(32767 * 10 ** (-50 / 20))
+MARGEN_RECORTE = 0.002  # segundos
+
+
+def recortar_silencio(audio, sample_rate):
+    """Quita el silencio inicial y final, dejando un pequeño margen para no cortar la envolvente."""
+    sonoras = np.flatnonzero(np.abs(audio.astype(np.int32)) > UMBRAL_SILENCIO)
+    if len(sonoras) == 0:
+        return audio[:0]
+    margen = int(MARGEN_RECORTE * sample_rate)
+    inicio = max(0, sonoras[0] - margen)
+    fin = min(len(audio), sonoras[-1] + 1 + margen)
+    return audio[inicio:fin]
+
+
+def codificar_mulaw(audio):
+    """Codifica PCM int16 a bytes µ-law G.711 (vectorizado)."""
+    muestras = audio.astype(np.int32)
+    signo = (muestras < 0).astype(np.int32) << 7
+    magnitud = np.minimum(np.abs(muestras), 32635) + 0x84
+    # Exponente = posición del bit más alto por encima del bit 7
+    exponente = np.floor(np.log2(magnitud)).astype(np.int32) - 7
+    mantisa = (magnitud >> (exponente + 3)) & 0x0F
+    return (~(signo | (exponente << 4) | mantisa) & 0xFF).astype(np.uint8)
+
+
+def wav_bytes(datos, sample_rate, codec):
+    """Arma el archivo WAV completo en memoria para el códec del perfil."""
+    if codec == "pcm16":
+        pcm = datos.astype("<i2").tobytes()
+        fmt = struct.pack("<HHIIHH", WAVE_FORMAT_PCM, 1, sample_rate, sample_rate * 2, 2, 16)
+        extra = b""
+    elif codec == "mulaw":
+        pcm = codificar_mulaw(datos).tobytes()
+        # Los formatos no-PCM llevan cbSize en 'fmt ' y un bloque 'fact' con el número de muestras
+        fmt = struct.pack("<HHIIHHH", WAVE_FORMAT_MULAW, 1, sample_rate, sample_rate, 1, 8, 0)
+        extra = struct.pack("<4sII", b"fact", 4, len(pcm))
+    else:
+        raise ValueError(f"Códec desconocido: {codec}")
+
+    cuerpo = struct.pack("<4sI", b"fmt ", len(fmt)) + fmt + extra + struct.pack("<4sI", b"data", len(pcm)) + pcm
+    if len(pcm) % 2:
+        cuerpo += b"\x00"
+    return struct.pack("<4sI4s", b"RIFF", 4 + len(cuerpo), b"WAVE") + cuerpo
+
+
+def tonos_a_generar():
+    """Los tonos de las dos versiones: (frecuencia, nombre en el manifiesto)."""
+    tonos = list(SONIDOS_A_GENERAR)
+    ruta = os.path.join(RAIZ_REPO, "simon_dice", "sonidos.py")
+    if os.path.exists(ruta):
+        spec = importlib.util.spec_from_file_location("sonidos_simon_dice", ruta)
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        tonos += [(frecuencia, PREFIJO_SIMON_DICE + nombre) for frecuencia, nombre in modulo.SONIDOS_A_GENERAR]
+    return tonos
+
+
+def generar_perfil(nombre, perfil, destino=CARPETA_ASSETS, tonos=None):
+    """
+    Genera los sonidos de un perfil en la carpeta de assets.
+    Devuelve {nombre_original: archivo_en_assets}; los archivos repetidos se reutilizan.
+    """
+    os.makedirs(destino, exist_ok=True)
+    sample_rate = perfil["sample_rate"]
+    archivos = {}
+    for frecuencia, nombre_original in tonos or tonos_a_generar():
+        audio = sintetizar_nota(frecuencia, sample_rate=sample_rate)
+        if perfil["recortar"]:
+            audio = recortar_silencio(audio, sample_rate)
+        contenido = wav_bytes(audio, sample_rate, perfil["codec"])
+
+        # Nombre por contenido: el mismo audio en dos perfiles es un solo archivo
+        archivo = hashlib.sha1(contenido).hexdigest()[:16] + ".wav"
+        ruta = os.path.join(destino, archivo)
+        if not os.path.exists(ruta):
+            with open(ruta, "wb") as f:
+                f.write(contenido)
+        archivos[nombre_original] = archivo
+    return archivos
+
+
+def escribir_manifiesto(manifiesto, destino=CARPETA_ASSETS):
+    with open(os.path.join(destino, "manifiesto.json"), "w") as f:
+        json.dump(manifiesto, f, indent=2, sort_keys=True)
+
+
+def cargar_manifiesto(destino=CARPETA_ASSETS):
+    """Devuelve {perfil: {nombre_original: archivo}} o {} si aún no se generaron los assets."""
+    ruta = os.path.join(destino, "manifiesto.json")
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta) as f:
+        return json.load(f)
+
+
+def mapa_sonidos(sounds_map, perfil, destino=CARPETA_ASSETS, prefijo=""):
+    """
+    Traduce el mapa color -> 'soundN.wav' a rutas del perfil dentro de la carpeta de assets
+    (relativas a RAIZ_ASSETS, como las espera ft.Audio). prefijo=PREFIJO_SIMON_DICE da los
+    tonos de simon_dice/. Devuelve None si el perfil no se ha generado: esos nombres no
+    existen en la carpeta de assets y quien llama tiene que seguir con los WAV originales.
+    """
+    archivos = cargar_manifiesto(destino).get(perfil)
+    if not archivos or any(prefijo + nombre not in archivos for nombre in sounds_map.values()):
+        return None
+    relativa = os.path.relpath(destino, RAIZ_ASSETS)
+    return {color: f"{relativa}/{archivos[prefijo + nombre]}" for color, nombre in sounds_map.items()}
+
+
+def raiz_del_perfil(perfil, destino=CARPETA_ASSETS):
+    """RAIZ_ASSETS si el perfil está generado; None si no (Flet sirve entonces la carpeta de la app)."""
+    return RAIZ_ASSETS if cargar_manifiesto(destino).get(perfil) else None
+
+
+def reporte_perfil(archivos, destino=CARPETA_ASSETS, repeticiones=20):
+    """Tamaño total en bytes y tiempo medio (ms) para decodificar todo el juego de sonidos a int16."""
+    rutas = [os.path.join(destino, archivo) for archivo in archivos.values()]
+    tamano = sum(os.path.getsize(ruta) for ruta in rutas)
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        # Sin caché: se mide abrir el archivo, leer la cabecera y decodificar
+        vaciar_cache()
+        for ruta in rutas:
+            np.asarray(a_pcm16(cargar_wav(ruta))).sum()
+    ms_decodificacion = (time.perf_counter() - inicio) * 1000 / repeticiones
+    vaciar_cache()
+    return tamano, ms_decodificacion
+
+
+def generar(nombres=None, destino=CARPETA_ASSETS):
+    """Genera los perfiles pedidos (todos por defecto) con los tonos de las dos versiones y el reporte."""
+    nombres = nombres or list(PERFILES)
+    manifiesto = cargar_manifiesto(destino)
+    tonos = tonos_a_generar()
+
+    print("Perfiles de audio para Simon Dice")
+    print("========================================")
+    print(f"{'perfil':<10}{'Hz':>7}{'códec':>7}{'recorte':>9}{'tamaño':>12}{'decodif.':>12}")
+    for nombre in nombres:
+        perfil = PERFILES[nombre]
+        archivos = generar_perfil(nombre, perfil, destino, tonos)
+        manifiesto[nombre] = archivos
+        tamano, ms = reporte_perfil(archivos, destino)
+        print(f"{nombre:<10}{perfil['sample_rate']:>7}{perfil['codec']:>7}"
+              f"{'sí' if perfil['recortar'] else 'no':>9}{tamano / 1024:>9.1f} KB{ms:>9.3f} ms")
+
+    escribir_manifiesto(manifiesto, destino)
+    print("========================================")
+    print(f"Assets en: {destino}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera los sonidos del juego según perfiles de salida")
+    parser.add_argument("--perfil", choices=sorted(PERFILES), action="append",
+                        help="Perfil a generar (se puede repetir). Por defecto, todos.")
+    parser.add_argument("--destino", default=CARPETA_ASSETS, help="Carpeta única de assets")
+    args = parser.parse_args()
+    generar(args.perfil, args.destino)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# prueba_resistencia.py (Prueba de resistencia: fugas de hilos, tareas, controles y memoria)
+#
+# Juega miles de partidas sin ventana a través de las clases reales de la UI
+# (SimonFletApp, GestorTemas, ColaEntrada, SimonGame) contra una página simulada
+# que se comporta como ft.Page: run_thread usa un pool de hilos, run_task un
+# event loop propio, update() enlaza los controles nuevos a la página y las
+# llamadas a métodos (play/seek del audio) solo se cuentan.
+#
+# Cada partida pasa por handle_button_click y termina en restart_game_click;
+# cada tanto se cambia de tema, se reconstruye la app sobre la misma página
+# (reconexión) o se cierra la sesión y se abre otra (como en lanzador_web.py).
+# Se muestrean hilos vivos, tareas pendientes, tamaño del overlay, controles
+# enlazados, apps vivas y RSS; si alguno crece sin límite, termina con código 1.
+#
+# Los retardos del juego se aceleran (--escala) para que miles de partidas
+# entren en pocos minutos; los caminos de código son los mismos.
+#
+# Uso:
+#   python prueba_resistencia.py                     -> 1000 partidas
+#   python prueba_resistencia.py --partidas 5000 --muestras 50
+
+import argparse
+import asyncio
+import gc
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+Muestra = namedtuple("Muestra", ["partidas", "segundos", "hilos", "tareas", "overlay", "controles",
+                                 "apps", "rss_kb"])
+EventoClic = namedtuple("EventoClic", ["control"])
+
+# Crecimiento tolerado entre el primer y el último cuarto de la prueba
+TOLERANCIAS = {
+    "hilos": 0,         # Un solo hilo de temporizadores (reposo.planificador), no uno por flash
+    "tareas": 2,
+    "overlay": 6,       # Un tema precargado suma sus reproductores hasta el cambio
+    "controles": 40,
+    "apps": 1,
+    "rss_kb": 16 * 1024,
+}
+
+
+def _rss_kb():
+    """RSS actual del proceso en KB (Linux: /proc/self/statm)."""
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class PaginaSimulada:
+    """Lo que SimonFletApp usa de ft.Page, sin conexión con un cliente."""
+
+    def __init__(self):
+        self.controls = []
+        self.overlay = []
+        self.updates = 0
+        self.metodos = 0            # play/seek/... invocados sobre controles
+        self.on_app_lifecycle_state_change = None
+        self.title = None
+        self.bgcolor = None
+        self.vertical_alignment = None
+        # Como Flet: run_thread va a un pool de hilos y run_task al loop de la sesión
+        self._pool = ThreadPoolExecutor(thread_name_prefix="pagina")
+        self._loop = asyncio.new_event_loop()
+        self._hilo_loop = threading.Thread(target=self._loop.run_forever, name="pagina-loop", daemon=True)
+        self._hilo_loop.start()
+
+    def add(self, *controles):
+        self.controls.extend(controles)
+        self.update()
+
+    def update(self, *controles):
+        """Enlaza a la página los controles nuevos (lo que hace el diff real) y cuenta la llamada."""
+        self.updates += 1
+        for control in self.recorrer():
+            if control.page is None:
+                control.page = self
+
+    def recorrer(self):
+        pendientes = list(self.controls) + list(self.overlay)
+        while pendientes:
+            control = pendientes.pop()
+            yield control
+            pendientes.extend(control._get_children())
+
+    def _invoke_method(self, control_id, method_name, arguments=None, wait_for_result=False, wait_timeout=5):
+        self.metodos += 1
+
+    def run_thread(self, handler, *args):
+        self._pool.submit(handler, *args)
+
+    def run_task(self, handler, *args):
+        return asyncio.run_coroutine_threadsafe(handler(*args), self._loop)
+
+    def tareas_pendientes(self):
+        async def contar():
+            return len(asyncio.all_tasks()) - 1
+        return asyncio.run_coroutine_threadsafe(contar(), self._loop).result()
+
+    def cerrar(self):
+        """Fin de la sesión: se detienen el pool y el loop (los de Flet mueren con la conexión)."""
+        self._pool.shutdown(wait=True)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._hilo_loop.join()
+        self._loop.close()
+
+
+class Bot:
+    """Juega partidas completas a través de la UI: mira la secuencia y hace clic en los botones."""
+
+    def __init__(self, interfaz, escala, rnd, max_rondas):
+        self.interfaz = interfaz
+        self.escala = escala
+        self.rnd = rnd
+        self.max_rondas = max_rondas
+        self.pagina = None
+        self.app = None
+
+    def abrir(self, pagina=None):
+        self.pagina = pagina or PaginaSimulada()
+        self.app = self.interfaz.SimonFletApp(self.pagina)
+        game = self.app.game
+        # Misma lógica, tiempos más cortos: los retardos pasan igual por execute_delayed_action
+        game.flash_duration = game.flash_inicial = 0.3 * self.escala
+        game.pausa_flash = game.pausa_inicial = 0.25 * self.escala
+        game.on_delay_request = lambda action, seconds: self.app.execute_delayed_action(action, seconds * self.escala)
+
+    def cerrar_sesion(self):
+        self.app.cerrar()
+        self.pagina.cerrar()
+
+    def _esperar(self, condicion, limite=10.0):
+        hasta = time.perf_counter() + limite
+        while not condicion():
+            if time.perf_counter() > hasta:
+                raise TimeoutError("La UI no respondió a tiempo")
+            time.sleep(0.0005)
+
+    def jugar_partida(self):
+        app, game = self.app, self.app.game
+        rondas = self.rnd.randint(1, self.max_rondas)
+        while True:
+            self._esperar(lambda: app.entrada.aceptando or not game.game_active)
+            if not game.game_active:
+                break
+            largo = len(game.sequence)
+            pasos = [game.sequence[i] for i in range(game.inicio_ventana(), largo)]
+            if largo >= rondas:
+                # Se falla a propósito en un paso al azar: termina la partida
+                fallo = self.rnd.randrange(len(pasos))
+                pasos = pasos[:fallo] + [(pasos[fallo] + 1) % game.num_botones]
+            anterior = None
+            for boton in pasos:
+                if boton == anterior:
+                    # Dos clics iguales seguidos más rápido que el rebote se fusionarían
+                    time.sleep(app.entrada.ventana_rebote)
+                app.handle_button_click(EventoClic(app.buttons[boton]))
+                anterior = boton
+            self._esperar(lambda: not app.entrada.aceptando or not game.game_active)
+            if not game.game_active:
+                break
+        # Esperar al overlay de Game Over y volver a jugar por el botón de la UI
+        self._esperar(lambda: app.game_over_overlay is not None and app.game_over_overlay.visible)
+        app.restart_game_click(None)
+
+
+def muestrear(bot, partidas, inicio, interfaz):
+    gc.collect()
+    return Muestra(
+        partidas=partidas,
+        segundos=time.perf_counter() - inicio,
+        hilos=threading.active_count(),
+        tareas=bot.pagina.tareas_pendientes(),
+        overlay=len(bot.pagina.overlay),
+        controles=sum(1 for _ in bot.pagina.recorrer()),
+        apps=sum(1 for objeto in gc.get_objects() if isinstance(objeto, interfaz.SimonFletApp)),
+        rss_kb=_rss_kb(),
+    )
+
+
+def crecimientos(muestras):
+    """Campos cuyo máximo en el último cuarto supera al del primero por más de la tolerancia."""
+    cuarto = max(1, len(muestras) // 4)
+    primero, ultimo = muestras[:cuarto], muestras[-cuarto:]
+    problemas = []
+    for campo, tolerancia in TOLERANCIAS.items():
+        antes = max(getattr(m, campo) for m in primero)
+        despues = max(getattr(m, campo) for m in ultimo)
+        if despues - antes > tolerancia:
+            problemas.append(f"{campo}: {antes} -> {despues} (tolerancia +{tolerancia})")
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de resistencia de la UI de Simon Dice")
+    parser.add_argument("--partidas", type=int, default=1000)
+    parser.add_argument("--muestras", type=int, default=20, help="Cantidad de muestras a lo largo de la prueba")
+    parser.add_argument("--escala", type=float, default=0.01,
+                        help="Factor de tiempo de flashes y retardos (1 = velocidad real)")
+    parser.add_argument("--max-rondas", type=int, default=4, help="Rondas máximas por partida")
+    parser.add_argument("--tema-cada", type=int, default=7, help="Partidas entre cambios de tema (0 = nunca)")
+    parser.add_argument("--sesion-cada", type=int, default=50,
+                        help="Partidas entre reconstrucciones de la app / sesiones nuevas (0 = nunca)")
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    # El juego guarda instantáneas en storage/: la prueba trabaja en una carpeta temporal
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, carpeta)
+    os.environ.setdefault("SIMON_PERFIL_ARRANQUE", "0")
+    directorio_original = os.getcwd()
+    temporal = tempfile.TemporaryDirectory()
+    os.chdir(temporal.name)
+
+    import contextlib
+    import io
+    import interfaz
+
+    rnd = random.Random(args.semilla)
+    bot = Bot(interfaz, args.escala, rnd, args.max_rondas)
+    salida = io.StringIO()
+    cada = max(1, args.partidas // args.muestras)
+    muestras = []
+    inicio = time.perf_counter()
+    try:
+        # Los prints de la UI (Game Over, métricas) no interesan aquí
+        with contextlib.redirect_stdout(salida):
+            bot.abrir()
+            muestras.append(muestrear(bot, 0, inicio, interfaz))
+            for partida in range(1, args.partidas + 1):
+                if args.tema_cada and partida % args.tema_cada == 0:
+                    bot.app.cambiar_tema_click(None)
+                bot.jugar_partida()
+                if partida % cada == 0:
+                    salida.seek(0)
+                    salida.truncate()
+                    muestras.append(muestrear(bot, partida, inicio, interfaz))
+                if args.sesion_cada and partida % args.sesion_cada == 0:
+                    if (partida // args.sesion_cada) % 2:
+                        # Reconexión: una app nueva sobre la misma página
+                        bot.abrir(bot.pagina)
+                    else:
+                        # Sesión nueva: se cierra la anterior como lo hace lanzador_web
+                        bot.cerrar_sesion()
+                        bot.abrir()
+            bot.cerrar_sesion()
+    finally:
+        os.chdir(directorio_original)
+        temporal.cleanup()
+
+    print("Prueba de resistencia de Simon Dice")
+    print("========================================")
+    print(f"{'partidas':>9}{'seg':>8}{'hilos':>7}{'tareas':>8}{'overlay':>9}{'controles':>11}"
+          f"{'apps':>6}{'RSS KB':>10}")
+    for m in muestras:
+        print(f"{m.partidas:>9}{m.segundos:>8.1f}{m.hilos:>7}{m.tareas:>8}{m.overlay:>9}{m.controles:>11}"
+              f"{m.apps:>6}{m.rss_kb:>10,}")
+    print("========================================")
+    segundos = time.perf_counter() - inicio
+    print(f"{args.partidas} partidas en {segundos:.1f} s ({args.partidas / segundos:.1f} partidas/s)")
+    problemas = crecimientos(muestras)
+    if problemas:
+        print("CRECIMIENTO SIN LÍMITE:")
+        for problema in problemas:
+            print(f"  {problema}")
+        return 1
+    print("Sin crecimiento: hilos, tareas, overlay, controles, apps y RSS estables")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
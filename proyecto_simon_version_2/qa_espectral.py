@@ -0,0 +1,275 @@
+# qa_espectral.py (Control de calidad espectral de los juegos de tonos, por lotes)
+#
+# Nada verificaba que generar_sonido/sintetizar_nota produzcan la frecuencia
+# pedida, sin recorte y con ataque/decaimiento limpios, y los temas se
+# multiplican (las dos sonidos.py ya usan afinaciones distintas). Aquí los
+# tonos se cargan en un solo arreglo 2-D (una fila por tono, la ventana central
+# de cada uno) y se hace una única FFT por lotes (np.fft.rfft sobre el eje 1).
+# Las medidas en el tiempo (pico, recorte, energía en los bordes) también son
+# vectorizadas: reduceat e índices sobre todos los tonos concatenados (int16).
+#
+# Por tono: frecuencia medida (pico del espectro + interpolación gaussiana),
+# error en cents, pico en dBFS, muestras recortadas (mesetas en el tope) y
+# energía de clic en los bordes respecto al tramo sostenido. Por paquete:
+# separación mínima en semitonos entre botones y similitud espectral máxima
+# entre dos botones (coseno de los espectros).
+#
+# Uso:
+#   python qa_espectral.py                     -> WAV del repositorio + catálogo de render_temas
+#   python qa_espectral.py --repeticiones 5    -> más paquetes (600) para medir velocidad
+#   python qa_espectral.py archivo1.wav ...    -> un juego de tonos concreto
+
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Umbrales de aprobación
+TOLERANCIA_CENTS = 10       # Desafinación máxima respecto a la frecuencia pedida
+RECORTE_MAX_MUESTRAS = 0    # Muestras en mesetas sobre el tope de 16 bits
+CLIC_MAX_DB = -20           # Energía de los bordes respecto al tramo sostenido
+SEPARACION_MIN = 1.0        # Semitonos entre los dos botones más parecidos
+SIMILITUD_MAX = 0.9         # Coseno entre espectros de dos botones (1 = indistinguibles)
+
+BORDE_SEGUNDOS = 0.005      # Ventana de cada borde donde se busca el clic
+BLOQUE_TONOS = 256          # Filas por FFT (acota la memoria con miles de tonos)
+
+PaqueteTonos = namedtuple("PaqueteTonos", ["nombre", "sample_rate", "esperadas", "tonos"])
+ResultadoTono = namedtuple("ResultadoTono",
+                           ["frecuencia", "error_cents", "pico_dbfs", "recortadas", "clic_db"])
+ResultadoPaquete = namedtuple("ResultadoPaquete",
+                              ["nombre", "tonos", "separacion_min", "similitud_max", "problemas"])
+
+_ventanas = {}
+
+
+def _largo_fft(sample_rate):
+    """Potencia de 2 de unos 0.1-0.2 s: cabe en el tono más corto del catálogo (0.3 s)."""
+    return 1 << int(np.log2(sample_rate * 0.2))
+
+
+def _hann(n):
+    ventana = _ventanas.get(n)
+    if ventana is None:
+        ventana = _ventanas[n] = np.hanning(n)
+    return ventana
+
+
+def _medir_bloque(tonos, sample_rate):
+    """Mide un bloque de tonos de la misma frecuencia de muestreo. Devuelve arreglos (uno por tono)."""
+    cantidad = len(tonos)
+    n_fft = _largo_fft(sample_rate)
+
+    # --- Frecuencia: ventana central de cada tono, una fila por tono, una sola FFT ---
+    filas = np.zeros((cantidad, n_fft))
+    en_ventana = np.empty(cantidad)
+    for i, tono in enumerate(tonos):
+        inicio = max(0, len(tono) // 2 - n_fft // 2)
+        segmento = tono[inicio:inicio + n_fft]
+        filas[i, :len(segmento)] = segmento
+        en_ventana[i] = len(segmento)
+    # Nivel del tramo sostenido (referencia para los clics), antes de aplicar la ventana
+    rms_sostenido = np.sqrt(np.einsum("ij,ij->i", filas, filas) / en_ventana)
+    filas *= _hann(n_fft)
+    espectro = np.abs(np.fft.rfft(filas, axis=1))
+
+    filas_idx = np.arange(cantidad)
+    k = np.argmax(espectro[:, 1:-1], axis=1) + 1
+    # Interpolación gaussiana (parábola sobre el logaritmo): con Hann el error es de centésimas de bin
+    a, b, c = (np.log(espectro[filas_idx, k + d] + 1e-12) for d in (-1, 0, 1))
+    curvatura = a - 2 * b + c
+    delta = np.where(curvatura < 0, 0.5 * (a - c) / np.where(curvatura < 0, curvatura, -1), 0.0)
+    frecuencia = (k + delta) * sample_rate / n_fft
+
+    # --- Pico, recorte y bordes: todos los tonos concatenados (int16), reducidos por tono ---
+    largos = np.fromiter((len(t) for t in tonos), dtype=np.int64, count=cantidad)
+    inicios = np.concatenate(([0], np.cumsum(largos)[:-1]))
+    muestras = np.concatenate(tonos)
+    pico = np.maximum(np.maximum.reduceat(muestras, inicios).astype(np.int32),
+                      -np.minimum.reduceat(muestras, inicios).astype(np.int32))
+    # Recorte = meseta en el tope: una muestra sola en el máximo puede ser el pico exacto de la onda
+    en_tope = (muestras >= 32767) | (muestras <= -32767)
+    mesetas = np.flatnonzero(en_tope[1:] & en_tope[:-1])
+    recortadas = np.bincount(np.searchsorted(inicios, mesetas, side="right") - 1, minlength=cantidad)
+
+    borde = max(1, int(BORDE_SEGUNDOS * sample_rate))
+    desplazamiento = np.arange(borde)
+    ultimo = len(muestras) - 1
+    bordes = (np.minimum(inicios[:, None] + desplazamiento, ultimo),
+              np.maximum(inicios + largos - borde, inicios)[:, None] + desplazamiento)
+    rms_bordes = np.maximum(*(np.sqrt(np.square(muestras[indices], dtype=np.float64).mean(axis=1))
+                              for indices in bordes))
+    with np.errstate(divide="ignore"):
+        pico_dbfs = 20 * np.log10(pico / 32768)
+        clic_db = 20 * np.log10(rms_bordes / np.maximum(rms_sostenido, 1e-12))
+
+    # Espectros normalizados, para comparar botones entre sí
+    normas = np.linalg.norm(espectro, axis=1, keepdims=True)
+    espectro /= np.maximum(normas, 1e-12)
+    return frecuencia, pico_dbfs, recortadas, clic_db, espectro
+
+
+def _evaluar_paquete(paquete, frecuencia, pico_dbfs, recortadas, clic_db, espectro):
+    problemas = []
+    if paquete.esperadas is not None:
+        error_cents = 1200 * np.log2(frecuencia / np.asarray(paquete.esperadas, dtype=np.float64))
+    else:
+        error_cents = np.full(len(frecuencia), np.nan)
+
+    for i in range(len(frecuencia)):
+        if abs(error_cents[i]) > TOLERANCIA_CENTS:
+            problemas.append(f"botón {i + 1}: {frecuencia[i]:.1f} Hz "
+                             f"({error_cents[i]:+.0f} cents de {paquete.esperadas[i]} Hz)")
+        if recortadas[i] > RECORTE_MAX_MUESTRAS:
+            problemas.append(f"botón {i + 1}: {recortadas[i]} muestras recortadas")
+        if clic_db[i] > CLIC_MAX_DB:
+            problemas.append(f"botón {i + 1}: clic en los bordes ({clic_db[i]:.0f} dB)")
+
+    separacion_min = similitud_max = float("nan")
+    if len(frecuencia) > 1:
+        semitonos = np.abs(12 * np.log2(frecuencia[:, None] / frecuencia[None, :]))
+        similitud = espectro @ espectro.T
+        fuera_diagonal = ~np.eye(len(frecuencia), dtype=bool)
+        separacion_min = float(semitonos[fuera_diagonal].min())
+        similitud_max = float(similitud[fuera_diagonal].max())
+        if separacion_min < SEPARACION_MIN:
+            problemas.append(f"dos botones a {separacion_min:.2f} semitonos")
+        if similitud_max > SIMILITUD_MAX:
+            problemas.append(f"dos botones con espectros casi iguales (similitud {similitud_max:.2f})")
+
+    tonos = [ResultadoTono(float(frecuencia[i]), float(error_cents[i]), float(pico_dbfs[i]),
+                           int(recortadas[i]), float(clic_db[i])) for i in range(len(frecuencia))]
+    return ResultadoPaquete(paquete.nombre, tonos, separacion_min, similitud_max, problemas)
+
+
+def analizar(paquetes):
+    """
+    Analiza una lista de PaqueteTonos (cada tono: arreglo int16 mono, puede ser una vista).
+    Los tonos se agrupan por frecuencia de muestreo en bloques de hasta BLOQUE_TONOS filas.
+    Devuelve un ResultadoPaquete por paquete, en el mismo orden.
+    """
+    resultados = [None] * len(paquetes)
+    por_sample_rate = {}
+    for indice, paquete in enumerate(paquetes):
+        por_sample_rate.setdefault(paquete.sample_rate, []).append(indice)
+
+    for sample_rate, indices in por_sample_rate.items():
+        bloque = []
+        for posicion, indice in enumerate(indices):
+            bloque.append(indice)
+            filas = sum(len(paquetes[i].tonos) for i in bloque)
+            siguiente = indices[posicion + 1] if posicion + 1 < len(indices) else None
+            if siguiente is not None and filas + len(paquetes[siguiente].tonos) <= BLOQUE_TONOS:
+                continue
+            tonos = [tono for i in bloque for tono in paquetes[i].tonos]
+            medidas = _medir_bloque(tonos, sample_rate)
+            fila = 0
+            for i in bloque:
+                n = len(paquetes[i].tonos)
+                resultados[i] = _evaluar_paquete(paquetes[i], *(m[fila:fila + n] for m in medidas))
+                fila += n
+            bloque = []
+    return resultados
+
+
+def paquete_desde_wav(nombre, rutas, esperadas=None):
+    """Arma un PaqueteTonos con archivos WAV (vistas memmap de cargador_wav, sin copias)."""
+    from cargador_wav import a_pcm16, cargar_wav
+
+    sample_rate = None
+    tonos = []
+    for ruta in rutas:
+        sonido = cargar_wav(ruta)
+        if sample_rate is not None and sonido.sample_rate != sample_rate:
+            raise ValueError(f"{ruta} tiene {sonido.sample_rate} Hz, se esperaban {sample_rate} Hz")
+        sample_rate = sonido.sample_rate
+        datos = a_pcm16(sonido)
+        tonos.append(datos if datos.ndim == 1 else datos[:, 0])
+    return PaqueteTonos(nombre, sample_rate, esperadas, tonos)
+
+
+def paquetes_desde_render(paquetes, buffer, tareas):
+    """PaqueteTonos a partir de la salida de render_temas.renderizar (vistas del bloque compartido)."""
+    return [PaqueteTonos(paquetes[indice]["nombre"], paquetes[indice]["sample_rate"],
+                         paquetes[indice]["frecuencias"],
+                         [buffer[offset:offset + n] for offset, n in posiciones])
+            for indice, posiciones in tareas]
+
+
+def imprimir_resultado(resultado):
+    print(f"{resultado.nombre}: separación mín. {resultado.separacion_min:.2f} semitonos, "
+          f"similitud máx. {resultado.similitud_max:.2f}")
+    for i, tono in enumerate(resultado.tonos, start=1):
+        print(f"  botón {i}: {tono.frecuencia:8.2f} Hz  {tono.error_cents:+6.1f} cents  "
+              f"pico {tono.pico_dbfs:6.2f} dBFS  recortadas {tono.recortadas}  clic {tono.clic_db:6.1f} dB")
+    for problema in resultado.problemas:
+        print(f"  PROBLEMA: {problema}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Control de calidad espectral de los tonos de Simon Dice")
+    parser.add_argument("archivos", nargs="*", help="WAV de un juego de tonos (uno por botón)")
+    parser.add_argument("--esperadas", help="Frecuencias pedidas para 'archivos', p. ej. 440,523,659,784")
+    parser.add_argument("--repeticiones", type=int, default=3,
+                        help="Copias del catálogo de render_temas a verificar")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos para renderizar el catálogo")
+    args = parser.parse_args()
+
+    print("Control de calidad espectral")
+    print("========================================")
+    if args.archivos:
+        esperadas = [float(f) for f in args.esperadas.split(",")] if args.esperadas else None
+        resultado, = analizar([paquete_desde_wav("archivos", args.archivos, esperadas)])
+        imprimir_resultado(resultado)
+        return 1 if resultado.problemas else 0
+
+    # 1. Los WAV que usan las dos interfaces, cada una con su afinación
+    from render_temas import AFINACIONES, construir_paquetes, renderizar
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    juegos = [
+        ("proyecto_simon_version_2", carpeta, AFINACIONES["clasica"]),
+        ("simon_dice", os.path.join(os.path.dirname(carpeta), "simon_dice"), AFINACIONES["original"]),
+    ]
+    del_repo = [paquete_desde_wav(nombre, [os.path.join(ruta, f"sound{i}.wav") for i in range(1, 5)],
+                                  esperadas)
+                for nombre, ruta, esperadas in juegos]
+    fallas = 0
+    for resultado in analizar(del_repo):
+        imprimir_resultado(resultado)
+        fallas += bool(resultado.problemas)
+
+    # 2. El catálogo de temas completo, renderizado en memoria compartida
+    catalogo = construir_paquetes(args.repeticiones)
+    shm, buffer, tareas, segundos_render = renderizar(catalogo, args.procesos)
+    try:
+        paquetes = paquetes_desde_render(catalogo, buffer, tareas)
+        tonos = sum(len(p.tonos) for p in paquetes)
+        inicio = time.perf_counter()
+        resultados = analizar(paquetes)
+        segundos = time.perf_counter() - inicio
+        del paquetes
+    finally:
+        del buffer
+        shm.close()
+        shm.unlink()
+
+    con_problemas = [r for r in resultados if r.problemas]
+    fallas += len(con_problemas)
+    print("========================================")
+    print(f"Catálogo: {len(resultados)} paquetes, {tonos} tonos (render {segundos_render:.2f} s)")
+    print(f"Análisis: {segundos:.3f} s  ({tonos / segundos:,.0f} tonos/s, "
+          f"{len(resultados) / segundos:,.0f} paquetes/s)")
+    peor_cents = max(abs(t.error_cents) for r in resultados for t in r.tonos)
+    peor_clic = max(t.clic_db for r in resultados for t in r.tonos)
+    print(f"Peor desafinación: {peor_cents:.2f} cents  |  peor clic: {peor_clic:.1f} dB")
+    print(f"Paquetes con problemas: {len(con_problemas)}")
+    for resultado in con_problemas[:10]:
+        print(f"  {resultado.nombre}: {'; '.join(resultado.problemas)}")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
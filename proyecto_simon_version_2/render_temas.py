@@ -0,0 +1,207 @@
+# render_temas.py (Renderizador paralelo de paquetes de temas de sonido)
+#
+# Cada paquete de tema es un juego completo de tonos (uno por botón) con su
+# propia afinación, duración, frecuencia de muestreo y timbre. Los paquetes se
+# reparten entre un pool de procesos; cada proceso escribe sus tonos
+# directamente en un bloque de memoria compartida, así que los resultados
+# nunca se serializan (pickle) de vuelta al proceso principal.
+#
+# Uso:
+#   python render_temas.py                     -> renderiza con todos los núcleos
+#   python render_temas.py --procesos 2        -> número fijo de procesos
+#   python render_temas.py --escalado          -> mide tonos/seg de 1..N núcleos
+#   python render_temas.py --destino temas/    -> además escribe los WAV
+#
+# Un --destino relativo se resuelve como lo lee el juego (tablero.ruta_sonido):
+# en la carpeta de la app, o bajo la raíz de assets si SIMON_PERFIL_AUDIO está
+# definida. Así los paquetes de temas.py ("temas/...") se encuentran siempre.
+
+import argparse
+import itertools
+import os
+import time
+from multiprocessing import Pool, cpu_count, get_start_method, resource_tracker, shared_memory
+
+import numpy as np
+
+from sonidos import sintetizar_nota, SONIDOS_A_GENERAR
+from tablero import ruta_sonido
+
+# ============================================================================
+#  CATÁLOGO DE TEMAS
+# ============================================================================
+
+AFINACIONES = {
+    "clasica": [freq for freq, _ in SONIDOS_A_GENERAR],  # 466/587/740/932
+    "original": [440, 523, 659, 784],                    # La/Do/Mi/Sol
+    "grave": [220, 277, 330, 415],
+    "aguda": [880, 1047, 1319, 1568],
+    "pentatonica": [392, 440, 523, 587],
+}
+DURACIONES = [0.3, 0.5, 0.8]
+SAMPLE_RATES = [22050, 44100]
+TIMBRES = ["seno", "cuadrada", "triangular", "organo"]
+
+
+def construir_paquetes(repeticiones=1):
+    """Devuelve la lista de paquetes (dicts) que resulta de combinar todo el catálogo."""
+    paquetes = []
+    combinaciones = itertools.product(AFINACIONES.items(), DURACIONES, SAMPLE_RATES, TIMBRES)
+    for (afinacion, frecuencias), duracion, sample_rate, timbre in combinaciones:
+        for i in range(repeticiones):
+            sufijo = f"_{i}" if repeticiones > 1 else ""
+            paquetes.append({
+                "nombre": f"{afinacion}_{timbre}_{int(duracion * 1000)}ms_{sample_rate}{sufijo}",
+                "frecuencias": frecuencias,
+                "duracion": duracion,
+                "sample_rate": sample_rate,
+                "timbre": timbre,
+            })
+    return paquetes
+
+
+def planificar(paquetes):
+    """
+    Calcula dónde va cada tono dentro del bloque compartido.
+    Devuelve (tareas, total_muestras); cada tarea es (indice_paquete, [(offset, n_muestras), ...]).
+    """
+    tareas = []
+    offset = 0
+    for indice, paquete in enumerate(paquetes):
+        n = int(paquete["sample_rate"] * paquete["duracion"])
+        posiciones = []
+        for _ in paquete["frecuencias"]:
+            posiciones.append((offset, n))
+            offset += n
+        tareas.append((indice, posiciones))
+    return tareas, offset
+
+# ============================================================================
+#  TRABAJADORES (se ejecutan dentro de cada proceso del pool)
+# ============================================================================
+
+_shm = None
+_buffer = None
+_paquetes = None
+
+
+def _iniciar_trabajador(nombre_shm, total_muestras, paquetes, desregistrar):
+    """Se conecta al bloque compartido una sola vez por proceso."""
+    global _shm, _buffer, _paquetes
+    _shm = shared_memory.SharedMemory(name=nombre_shm)
+    # El proceso principal es el dueño del bloque. Con 'spawn' cada trabajador tiene
+    # su propio resource_tracker, que intentaría liberarlo (o avisaría de una "fuga")
+    # al terminar; con 'fork' el tracker es el mismo del padre y no hay que tocarlo.
+    if desregistrar:
+        resource_tracker.unregister(_shm._name, "shared_memory")
+    _buffer = np.ndarray((total_muestras,), dtype=np.int16, buffer=_shm.buf)
+    _paquetes = paquetes
+
+
+def _renderizar_paquete(tarea):
+    """Sintetiza todos los tonos de un paquete y los escribe en su sitio. Solo devuelve un entero."""
+    indice, posiciones = tarea
+    paquete = _paquetes[indice]
+    for frecuencia, (offset, n) in zip(paquete["frecuencias"], posiciones):
+        nota = sintetizar_nota(frecuencia, paquete["duracion"], paquete["sample_rate"], paquete["timbre"])
+        _buffer[offset:offset + n] = nota[:n]
+    return len(posiciones)
+
+# ============================================================================
+#  API PRINCIPAL
+# ============================================================================
+
+def renderizar(paquetes, procesos=None):
+    """
+    Renderiza todos los paquetes en paralelo.
+    Devuelve (shm, buffer, tareas, segundos). El llamador debe cerrar y liberar shm.
+    """
+    procesos = procesos or cpu_count()
+    tareas, total_muestras = planificar(paquetes)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(total_muestras * 2, 1))
+    buffer = np.ndarray((total_muestras,), dtype=np.int16, buffer=shm.buf)
+
+    inicio = time.perf_counter()
+    with Pool(procesos, initializer=_iniciar_trabajador,
+              initargs=(shm.name, total_muestras, paquetes,
+                        get_start_method() != "fork")) as pool:
+        # Trozos pequeños para que el reparto quede equilibrado entre núcleos
+        tamano_trozo = max(1, len(tareas) // (procesos * 8))
+        tonos = sum(pool.imap_unordered(_renderizar_paquete, tareas, chunksize=tamano_trozo))
+    segundos = time.perf_counter() - inicio
+
+    assert tonos == sum(len(p["frecuencias"]) for p in paquetes)
+    return shm, buffer, tareas, segundos
+
+
+def escribir_paquetes(paquetes, buffer, tareas, destino):
+    """Escribe cada paquete en su propia carpeta (sound1.wav - soundN.wav)."""
+    from scipy.io.wavfile import write
+
+    for indice, posiciones in tareas:
+        paquete = paquetes[indice]
+        carpeta = os.path.join(destino, paquete["nombre"])
+        os.makedirs(carpeta, exist_ok=True)
+        for numero, (offset, n) in enumerate(posiciones, start=1):
+            write(os.path.join(carpeta, f"sound{numero}.wav"), paquete["sample_rate"],
+                  buffer[offset:offset + n])
+
+
+def medir(paquetes, procesos):
+    """Renderiza una vez y devuelve los tonos por segundo obtenidos."""
+    shm, buffer, tareas, segundos = renderizar(paquetes, procesos)
+    del buffer
+    shm.close()
+    shm.unlink()
+    tonos = sum(len(p["frecuencias"]) for p in paquetes)
+    return tonos / segundos, segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Renderizador paralelo de temas de sonido para Simon Dice")
+    parser.add_argument("--procesos", type=int, default=cpu_count(), help="Procesos del pool")
+    parser.add_argument("--repeticiones", type=int, default=1,
+                        help="Copias de cada combinación (para medir con más carga)")
+    parser.add_argument("--escalado", action="store_true", help="Medir con 1..N procesos")
+    parser.add_argument("--destino", help="Carpeta donde escribir los WAV de cada paquete")
+    args = parser.parse_args()
+
+    paquetes = construir_paquetes(args.repeticiones)
+    tonos = sum(len(p["frecuencias"]) for p in paquetes)
+
+    print("Renderizador de temas para Simon Dice")
+    print("========================================")
+    print(f"Paquetes: {len(paquetes)}  |  Tonos: {tonos}  |  Núcleos disponibles: {cpu_count()}")
+
+    if args.escalado:
+        base = None
+        for procesos in range(1, cpu_count() + 1):
+            tonos_seg, segundos = medir(paquetes, procesos)
+            base = base or tonos_seg
+            print(f"{procesos:>3} procesos: {tonos_seg:10.1f} tonos/seg  "
+                  f"({segundos:.3f} s, aceleración x{tonos_seg / base:.2f})")
+        return
+
+    shm, buffer, tareas, segundos = renderizar(paquetes, args.procesos)
+    try:
+        print(f"{args.procesos} procesos: {tonos / segundos:.1f} tonos/seg ({segundos:.3f} s)")
+        if args.destino:
+            destino = args.destino
+            if not os.path.isabs(destino):
+                # La misma raíz que usará la interfaz (la del perfil solo si está generado)
+                raiz = None
+                if os.environ.get("SIMON_PERFIL_AUDIO"):
+                    from perfiles_audio import raiz_del_perfil
+                    raiz = raiz_del_perfil(os.environ["SIMON_PERFIL_AUDIO"])
+                destino = ruta_sonido(destino, raiz)
+            escribir_paquetes(paquetes, buffer, tareas, destino)
+            print(f"Paquetes escritos en: {destino}")
+    finally:
+        del buffer
+        shm.close()
+        shm.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+# reposo.py (Reposo de bajo consumo: cuántas veces se despierta la app mientras espera)
+#
+# En el teléfono cada hilo que duerme y despierta, cada temporizador y cada
+# page.update() gasta batería aunque la pantalla no cambie. SimonFletApp entra
+# en reposo cuando no hay nada que mostrar:
+#   - "turno":          espera la presión del jugador,
+#   - "game_over":      el overlay de Game Over está en pantalla,
+#   - "segundo_plano":  el sistema ocultó o pausó la app.
+# En el turno no hay nada programado (y la última nota todavía suena): solo se
+# mide. En los otros dos cancela sus temporizadores (las acciones del juego
+# quedan aplazadas en SimonGame), corta la secuencia en curso, pausa los
+# reproductores y retiene los page.update(). Solo despierta con una presión o
+# al volver a primer plano. ContadorDespertares mide lo que queda: despertares
+# por minuto de reposo, por motivo y por origen.
+#
+# Los temporizadores (apagar un botón, las acciones diferidas del juego) van
+# todos al Planificador del proceso: un solo hilo con un heap ordenado por
+# instante de disparo, en lugar de un hilo por flash. Cancelar solo marca el
+# temporizador; un reposo no deja hilos durmiendo.
+#
+# Uso:
+#   python reposo.py                -> 10 s en cada reposo, con la UI real sobre una página simulada
+#   python reposo.py --segundos 30
+
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from collections import Counter, defaultdict, namedtuple
+
+MOTIVOS = ("turno", "game_over", "segundo_plano")
+
+
+class ContadorDespertares:
+    """Despertares (temporizadores, pasos de secuencia, updates, entradas) ocurridos en reposo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.motivo = None          # Reposo actual (None = la app está trabajando)
+        self._desde = 0.0
+        self._segundos = defaultdict(float)
+        self.despertares = Counter()    # (motivo, origen) -> cantidad
+
+    def _cerrar_tramo(self, ahora):
+        if self.motivo is not None:
+            self._segundos[self.motivo] += ahora - self._desde
+
+    def entrar(self, motivo):
+        ahora = time.perf_counter()
+        with self._lock:
+            self._cerrar_tramo(ahora)
+            self.motivo = motivo
+            self._desde = ahora
+
+    def salir(self):
+        with self._lock:
+            self._cerrar_tramo(time.perf_counter())
+            self.motivo = None
+
+    def despertar(self, origen):
+        """Anota un despertar; fuera del reposo no cuenta (es trabajo normal de la partida)."""
+        if self.motivo is None:
+            return
+        with self._lock:
+            if self.motivo is not None:
+                self.despertares[(self.motivo, origen)] += 1
+
+    def segundos(self, motivo):
+        with self._lock:
+            segundos = self._segundos[motivo]
+            if self.motivo == motivo:
+                segundos += time.perf_counter() - self._desde
+            return segundos
+
+    def por_minuto(self, motivo):
+        """
+        Despertares por minuto de reposo con ese motivo (0 si todavía no hubo reposo).
+        Las presiones no entran: son justamente lo que debe despertar a la app.
+        """
+        minutos = self.segundos(motivo) / 60
+        total = sum(n for (m, o), n in self.despertares.items() if m == motivo and o != "entrada")
+        return round(total / minutos, 2) if minutos else 0.0
+
+    def resumen(self):
+        """Por motivo: segundos en reposo, despertares por minuto y su desglose por origen."""
+        return {
+            motivo: {
+                "segundos": round(self.segundos(motivo), 1),
+                "por_minuto": self.por_minuto(motivo),
+                "origenes": {o: n for (m, o), n in self.despertares.items() if m == motivo},
+            }
+            for motivo in MOTIVOS if self.segundos(motivo)
+        }
+
+
+class Temporizador:
+    """Una llamada programada en el Planificador; cancelar() la descarta si todavía no se disparó."""
+
+    __slots__ = ("funcion", "args")
+
+    def __init__(self, funcion, args):
+        self.funcion = funcion
+        self.args = args
+
+    def cancelar(self):
+        self.funcion = None
+
+
+class Planificador:
+    """
+    Un solo hilo para todos los temporizadores del proceso: heap de (instante,
+    orden, Temporizador) y una Condition que se despierta cuando llega uno más
+    próximo. Las funciones corren en ese hilo y tienen que ser cortas (la
+    interfaz las pasa a page.run_thread).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._orden = itertools.count()
+        self._cond = threading.Condition()
+        self._hilo = None
+
+    def programar(self, segundos, funcion, *args):
+        temporizador = Temporizador(funcion, args)
+        entrada = (time.monotonic() + segundos, next(self._orden), temporizador)
+        with self._cond:
+            heapq.heappush(self._heap, entrada)
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._correr, name="planificador", daemon=True)
+                self._hilo.start()
+            elif self._heap[0] is entrada:
+                self._cond.notify()
+        return temporizador
+
+    def pendientes(self):
+        """Temporizadores sin disparar ni cancelar."""
+        with self._cond:
+            return sum(1 for _, _, temporizador in self._heap if temporizador.funcion is not None)
+
+    def _siguiente(self):
+        with self._cond:
+            while True:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                instante, _, temporizador = self._heap[0]
+                if temporizador.funcion is None:
+                    heapq.heappop(self._heap)   # Cancelado: se descarta sin esperarlo
+                    continue
+                espera = instante - time.monotonic()
+                if espera > 0:
+                    self._cond.wait(espera)
+                    continue
+                heapq.heappop(self._heap)
+                funcion, args = temporizador.funcion, temporizador.args
+                temporizador.cancelar()
+                return funcion, args
+
+    def _correr(self):
+        while True:
+            funcion, args = self._siguiente()
+            try:
+                funcion(*args)
+            except Exception:
+                # Un temporizador que falla no puede dejar sin reloj al resto del proceso
+                print("Planificador: error en un temporizador")
+                traceback.print_exc()
+
+
+# Uno por proceso, compartido por todas las sesiones
+planificador = Planificador()
+
+# ============================================================================
+#  MEDICIÓN CON LA UI REAL
+# ============================================================================
+
+EventoCiclo = namedtuple("EventoCiclo", ["state"])
+
+
+def _medir(app, pagina, segundos):
+    """Deja la app quieta 'segundos' y devuelve lo que pasó mientras tanto."""
+    hilos, updates, metodos = threading.active_count(), pagina.updates, pagina.metodos
+    time.sleep(segundos)
+    return {
+        "reposo": app.reposo,
+        "temporizadores": len(app._temporizadores),
+        "hilos_extra": threading.active_count() - hilos,
+        "updates": pagina.updates - updates,
+        "metodos": pagina.metodos - metodos,
+    }
+
+
+def main():
+    import argparse
+    import contextlib
+    import io
+    import os
+    import sys
+    import tempfile
+
+    import flet as ft
+
+    parser = argparse.ArgumentParser(description="Despertares por minuto de reposo de Simon Dice")
+    parser.add_argument("--segundos", type=float, default=10.0, help="Duración de cada reposo medido")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.environ.setdefault("SIMON_PERFIL_ARRANQUE", "0")
+    directorio_original = os.getcwd()
+    temporal = tempfile.TemporaryDirectory()
+    os.chdir(temporal.name)
+
+    from prueba_resistencia import EventoClic, PaginaSimulada
+    import interfaz
+
+    def esperar(condicion, limite=10.0):
+        hasta = time.perf_counter() + limite
+        while not condicion():
+            if time.perf_counter() > hasta:
+                raise TimeoutError("La UI no respondió a tiempo")
+            time.sleep(0.01)
+
+    filas = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pagina = PaginaSimulada()
+            app = interfaz.SimonFletApp(pagina)
+            game = app.game
+
+            # 1. Turno del jugador: nadie toca nada
+            esperar(lambda: app.reposo == "turno")
+            filas.append(("turno", _medir(app, pagina, args.segundos)))
+
+            # 2. Ronda completa y la app pasa a segundo plano con la próxima ronda programada
+            app.handle_button_click(EventoClic(app.buttons[game.sequence[0]]))
+            esperar(lambda: not app.entrada.aceptando)
+            app.handle_lifecycle_change(EventoCiclo(ft.AppLifecycleState.HIDE))
+            filas.append(("segundo_plano", _medir(app, pagina, args.segundos)))
+            app.handle_lifecycle_change(EventoCiclo(ft.AppLifecycleState.SHOW))
+            # Al volver, la ronda aplazada se juega completa
+            esperar(lambda: app.reposo == "turno" and len(game.sequence) == 2)
+
+            # 3. Fallo: Game Over en pantalla
+            app.handle_button_click(EventoClic(app.buttons[(game.sequence[0] + 1) % game.num_botones]))
+            esperar(lambda: app.reposo == "game_over" and app.game_over_overlay.visible)
+            filas.append(("game_over", _medir(app, pagina, args.segundos)))
+
+            app.cerrar()
+            pagina.cerrar()
+    finally:
+        os.chdir(directorio_original)
+        temporal.cleanup()
+
+    print("Reposo de bajo consumo de Simon Dice")
+    print("========================================")
+    print(f"{'reposo':<15}{'desp/min':>10}{'timers':>8}{'hilos+':>8}{'updates':>9}{'métodos':>9}  orígenes")
+    resumen = app.despertares.resumen()
+    for motivo, medida in filas:
+        datos = resumen.get(motivo, {"por_minuto": 0.0, "origenes": {}})
+        print(f"{motivo:<15}{datos['por_minuto']:>10}{medida['temporizadores']:>8}{medida['hilos_extra']:>8}"
+              f"{medida['updates']:>9}{medida['metodos']:>9}  {datos['origenes'] or '-'}")
+    print("========================================")
+    print(f"page.update pedidos: {app.updates_pedidos}, enviados: {app.updates_enviados}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# tablero.py (Tableros configurables de 2 a 16 botones)
+#
+# El botón se identifica por su índice (0..N-1) en todo el juego: la secuencia,
+# los botones, los estilos y los sonidos son listas indexadas, no diccionarios
+# por nombre de color. Aquí se genera todo lo que depende del tamaño del
+# tablero: nombres, tonos, archivos de sonido y la distribución en filas.
+
+import math
+import os
+
+from main import COLORES, SIMON_SOUNDS_MAP
+
+MIN_BOTONES = 2
+MAX_BOTONES = 16
+
+# Los cuatro primeros coinciden con el tablero clásico (COLORES)
+NOMBRES_COLORES = COLORES + [
+    "orange", "purple", "cyan", "pink", "lime", "teal", "amber", "indigo",
+    "brown", "grey", "white", "deep_orange",
+]
+
+# Escala pentatónica mayor (semitonos desde la tónica): nunca suenan dos botones
+# a menos de un tono de distancia, así se distinguen bien de oído.
+ESCALA_PENTATONICA = [0, 2, 4, 7, 9]
+TONICA_HZ = 392  # Sol 4
+
+CARPETA_SONIDOS_TABLEROS = "tableros"
+CARPETA_APP = os.path.dirname(os.path.abspath(__file__))
+
+
+def ruta_sonido(relativa, raiz_assets=None):
+    """
+    Archivo en disco de un sonido que ft.Audio pide como 'relativa'. Sin raíz de assets es
+    relativo a la carpeta de la app; con RAIZ_ASSETS (perfil de audio, ver perfiles_audio.py)
+    es relativo a esa raíz, que es donde Flet lo busca. Lo usan quienes escriben sonidos
+    generados (tableros, paquetes de temas) y quienes los leen.
+    """
+    return os.path.join(raiz_assets or CARPETA_APP, relativa)
+
+
+def frecuencias_tablero(num_botones):
+    """Un tono por botón, subiendo por la escala pentatónica (y de octava cuando hace falta)."""
+    frecuencias = []
+    for i in range(num_botones):
+        octava, grado = divmod(i, len(ESCALA_PENTATONICA))
+        semitonos = 12 * octava + ESCALA_PENTATONICA[grado]
+        frecuencias.append(round(TONICA_HZ * 2 ** (semitonos / 12)))
+    return frecuencias
+
+
+def filas_tablero(num_botones):
+    """Índices de botón agrupados por fila: la cuadrícula más cuadrada posible."""
+    columnas = math.ceil(math.sqrt(num_botones))
+    return [list(range(inicio, min(inicio + columnas, num_botones)))
+            for inicio in range(0, num_botones, columnas)]
+
+
+class Tablero:
+    """Descripción completa de un tablero de N botones."""
+
+    def __init__(self, num_botones):
+        if not MIN_BOTONES <= num_botones <= MAX_BOTONES:
+            raise ValueError(f"El tablero debe tener entre {MIN_BOTONES} y {MAX_BOTONES} botones")
+        self.num_botones = num_botones
+        self.nombres = NOMBRES_COLORES[:num_botones]
+        self.filas = filas_tablero(num_botones)
+        self.columnas = max(len(fila) for fila in self.filas)
+
+        if num_botones == len(COLORES):
+            # Tablero clásico: se usan los WAV de siempre
+            self.frecuencias = None
+            self.sonidos = [SIMON_SOUNDS_MAP[color] for color in COLORES]
+        else:
+            self.frecuencias = frecuencias_tablero(num_botones)
+            self.sonidos = [f"{CARPETA_SONIDOS_TABLEROS}/{num_botones}/sound{i + 1}.wav"
+                            for i in range(num_botones)]
+
+    @property
+    def es_clasico(self):
+        return self.frecuencias is None
+
+    def asegurar_sonidos(self, raiz_assets=None):
+        """
+        Genera los WAV del tablero si aún no existen (bajo raiz_assets si la app usa una raíz
+        de assets). Devuelve False si no se pudieron generar.
+        """
+        if self.es_clasico:
+            return True
+        faltantes = [(freq, ruta_sonido(ruta, raiz_assets))
+                     for freq, ruta in zip(self.frecuencias, self.sonidos)
+                     if not os.path.exists(ruta_sonido(ruta, raiz_assets))]
+        if not faltantes:
+            return True
+        try:
+            from sonidos import generar_sonido
+        except ImportError:
+            print("No se pudieron generar los sonidos del tablero: faltan numpy/scipy.")
+            return False
+        for freq, ruta in faltantes:
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            generar_sonido(freq, nombre_archivo=ruta)
+        return True
+
+
+def crear_tablero(num_botones=len(COLORES)):
+    return Tablero(num_botones)
@@ -0,0 +1,237 @@
+# temas.py (Temas visuales/sonoros con cambio en caliente)
+#
+# Un tema reúne los colores de los botones, los objetos de estilo (sombras
+# encendida/apagada), los reproductores ft.Audio y la pista pre-mezclada.
+# GestorTemas prepara el siguiente tema en un hilo de fondo (doble búfer) y lo
+# intercambia de forma atómica entre rondas: nunca bloquea la entrada y nunca
+# vacía page.overlay, solo quita los reproductores del tema anterior.
+
+import os
+import threading
+import time
+import tracemalloc
+
+import flet as ft
+
+from tablero import ruta_sonido
+
+# "colores" es la paleta indexada por botón (mismo orden que tablero.NOMBRES_COLORES,
+# 16 entradas para cubrir el tablero más grande).
+# "sonidos": None usa los sonidos del tablero. Las demás carpetas son paquetes de
+# 4 tonos escritos por render_temas.py --destino temas (solo para el tablero clásico).
+# Si el paquete no está, el tema usa los tonos del tablero y se avisa una vez por consola.
+TEMAS = {
+    "clasico": {
+        "colores": [
+            ft.Colors.GREEN_700, ft.Colors.RED_700, ft.Colors.YELLOW_ACCENT_700, ft.Colors.BLUE_700,
+            ft.Colors.ORANGE_700, ft.Colors.PURPLE_700, ft.Colors.CYAN_700, ft.Colors.PINK_700,
+            ft.Colors.LIME_700, ft.Colors.TEAL_700, ft.Colors.AMBER_700, ft.Colors.INDIGO_700,
+            ft.Colors.BROWN_700, ft.Colors.GREY_700, ft.Colors.BLUE_GREY_200, ft.Colors.DEEP_ORANGE_700,
+        ],
+        "flash": ft.Colors.WHITE,
+        "sonidos": None,
+    },
+    "neon": {
+        "colores": [
+            ft.Colors.GREEN_ACCENT_400, ft.Colors.PINK_ACCENT_400, ft.Colors.LIME_ACCENT_400, ft.Colors.CYAN_ACCENT_400,
+            ft.Colors.ORANGE_ACCENT_400, ft.Colors.PURPLE_ACCENT_400, ft.Colors.LIGHT_BLUE_ACCENT_400, ft.Colors.RED_ACCENT_400,
+            ft.Colors.YELLOW_ACCENT_400, ft.Colors.TEAL_ACCENT_400, ft.Colors.AMBER_ACCENT_400, ft.Colors.INDIGO_ACCENT_400,
+            ft.Colors.DEEP_PURPLE_ACCENT_400, ft.Colors.LIGHT_GREEN_ACCENT_400, ft.Colors.BLUE_ACCENT_400, ft.Colors.DEEP_ORANGE_ACCENT_400,
+        ],
+        "flash": ft.Colors.WHITE,
+        "sonidos": "temas/original_cuadrada_500ms_44100",
+    },
+    "pastel": {
+        "colores": [
+            ft.Colors.GREEN_200, ft.Colors.RED_200, ft.Colors.AMBER_200, ft.Colors.BLUE_200,
+            ft.Colors.ORANGE_200, ft.Colors.PURPLE_200, ft.Colors.CYAN_200, ft.Colors.PINK_200,
+            ft.Colors.LIME_200, ft.Colors.TEAL_200, ft.Colors.YELLOW_200, ft.Colors.INDIGO_200,
+            ft.Colors.BROWN_200, ft.Colors.GREY_400, ft.Colors.BLUE_GREY_100, ft.Colors.DEEP_ORANGE_200,
+        ],
+        "flash": ft.Colors.WHITE70,
+        "sonidos": "temas/pentatonica_seno_500ms_44100",
+    },
+}
+
+
+# Temas cuyo paquete de sonidos faltante ya se avisó (una vez por proceso, no por sesión)
+_avisados = set()
+
+
+class RecursosTema:
+    """Todo lo que la UI necesita de un tema, ya construido y listo para usar."""
+
+    def __init__(self, nombre, definicion, sonidos, raiz_assets=None):
+        self.nombre = nombre
+        num_botones = len(sonidos)
+        self.colores = list(definicion["colores"][:num_botones])
+        self.flash = definicion["flash"]
+        self.sonidos = self._resolver_sonidos(nombre, definicion["sonidos"], sonidos, raiz_assets)
+
+        # Estilos precalculados: el flash solo intercambia referencias
+        self.sombra_apagada = [
+            ft.BoxShadow(spread_radius=-10, blur_radius=25, color=valor,
+                         offset=ft.Offset(0, 0), blur_style=ft.ShadowBlurStyle.OUTER)
+            for valor in self.colores
+        ]
+        self.sombra_encendida = [
+            ft.BoxShadow(spread_radius=1, blur_radius=20, color=valor,
+                         offset=ft.Offset(0, 0), blur_style=ft.ShadowBlurStyle.OUTER)
+            for valor in self.colores
+        ]
+
+        self.audio_players = []
+        self.mezclador = None
+
+    @staticmethod
+    def _resolver_sonidos(nombre, carpeta, sonidos, raiz_assets=None):
+        """Usa la carpeta del paquete de sonidos si existe y encaja con el tablero; si no, los del tablero."""
+        if carpeta is None:
+            return list(sonidos)
+        rutas = [f"{carpeta}/sound{i + 1}.wav" for i in range(len(sonidos))]
+        if all(os.path.exists(ruta_sonido(ruta, raiz_assets)) for ruta in rutas):
+            return rutas
+        if nombre not in _avisados:
+            _avisados.add(nombre)
+            print(f"Tema '{nombre}': no se encontró el paquete de sonidos {ruta_sonido(carpeta, raiz_assets)} "
+                  f"para {len(sonidos)} botones; se usan los sonidos del tablero. "
+                  f"Para generarlo: python render_temas.py --destino temas")
+        return list(sonidos)
+
+    def cargar_audio(self, page, fabrica_mezclador=None, raiz_assets=None):
+        """Crea los reproductores (y la pista pre-mezclada) y los agrega a page.overlay."""
+        for ruta in self.sonidos:
+            audio = ft.Audio(src=ruta)
+            self.audio_players.append(audio)
+            page.overlay.append(audio)
+
+        if fabrica_mezclador is not None:
+            # El mezclador lee los mismos archivos que pide ft.Audio
+            rutas = [ruta_sonido(ruta, raiz_assets) for ruta in self.sonidos]
+            try:
+                self.mezclador = fabrica_mezclador(rutas)
+            except (ImportError, OSError, ValueError) as error:
+                print(f"No se pudo preparar la pista pre-mezclada del tema '{self.nombre}': {error}")
+                self.mezclador = None
+
+    def controles_audio(self):
+        return list(self.audio_players)
+
+
+class GestorTemas:
+    """
+    Doble búfer de temas: 'activo' es el que usa la UI y 'pendiente' el que se
+    prepara en segundo plano. aplicar_pendiente() hace el cambio entre rondas.
+    """
+
+    def __init__(self, page, sonidos, fabrica_mezclador=None, raiz_assets=None):
+        self.page = page
+        self.sonidos = sonidos  # Un archivo por botón (índice)
+        self.fabrica_mezclador = fabrica_mezclador
+        self.raiz_assets = raiz_assets
+
+        self.activo = None
+        self.pendiente = None
+        self._lock = threading.Lock()
+        self._hilo = None
+
+        # Métricas del último cambio
+        self.ultima_latencia_swap_ms = None
+        self.ultima_precarga_ms = None
+        self.bytes_pendiente = None  # Solo si tracemalloc está activo
+
+    # --- Carga inicial (síncrona) ---
+
+    def cargar_inicial(self, nombre="clasico", con_audio=True):
+        self.activo = RecursosTema(nombre, TEMAS[nombre], self.sonidos, self.raiz_assets)
+        if con_audio:
+            self.activo.cargar_audio(self.page, self.fabrica_mezclador, self.raiz_assets)
+        return self.activo
+
+    # --- Precarga en segundo plano ---
+
+    def precargar(self, nombre):
+        """Empieza a preparar un tema sin bloquear la UI. Devuelve False si ya hay una precarga en curso."""
+        if self._hilo is not None and self._hilo.is_alive():
+            return False
+        self._hilo = threading.Thread(target=self._precargar, args=(nombre,), daemon=True)
+        self._hilo.start()
+        return True
+
+    def _precargar(self, nombre):
+        inicio = time.perf_counter()
+        memoria_antes = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+
+        recursos = RecursosTema(nombre, TEMAS[nombre], self.sonidos, self.raiz_assets)
+        recursos.cargar_audio(self.page, self.fabrica_mezclador, self.raiz_assets)
+        # Los reproductores nuevos ya están en el overlay: el cliente los va cargando
+        self.page.update()
+
+        with self._lock:
+            anterior, self.pendiente = self.pendiente, recursos
+            self.ultima_precarga_ms = (time.perf_counter() - inicio) * 1000
+            if memoria_antes is not None:
+                self.bytes_pendiente = tracemalloc.get_traced_memory()[0] - memoria_antes
+        # Si había otro pendiente sin aplicar, se descarta
+        if anterior is not None:
+            self._liberar(anterior)
+
+    def siguiente(self):
+        """Nombre del tema que sigue al activo (para ciclar entre temas)."""
+        nombres = list(TEMAS)
+        return nombres[(nombres.index(self.activo.nombre) + 1) % len(nombres)]
+
+    # --- Cambio atómico ---
+
+    def aplicar_pendiente(self):
+        """
+        Si hay un tema precargado, lo convierte en el activo (intercambio de referencias).
+        Devuelve el tema anterior, o None si no hubo cambio. Llamar entre rondas.
+        """
+        if self.pendiente is None:
+            return None
+        inicio = time.perf_counter()
+        with self._lock:
+            anterior, self.activo, self.pendiente = self.activo, self.pendiente, None
+        self.ultima_latencia_swap_ms = (time.perf_counter() - inicio) * 1000
+        self._liberar(anterior)
+        return anterior
+
+    def _liberar(self, recursos):
+        """Quita del overlay solo los reproductores de ese tema."""
+        for control in recursos.controles_audio():
+            if control in self.page.overlay:
+                self.page.overlay.remove(control)
+        recursos.audio_players.clear()
+        recursos.mezclador = None
+
+    def descartar(self, recursos):
+        """
+        Quita del overlay los reproductores de un tema que ya no es el activo ni el
+        pendiente (una carga que terminó después del cambio). Devuelve True si lo quitó.
+        """
+        with self._lock:
+            if recursos is self.activo or recursos is self.pendiente:
+                return False
+        self._liberar(recursos)
+        return True
+
+    def liberar(self):
+        """Quita del overlay los reproductores del tema activo y del pendiente (la sesión se cerró)."""
+        with self._lock:
+            temas = [recursos for recursos in (self.activo, self.pendiente) if recursos is not None]
+            self.pendiente = None
+        for recursos in temas:
+            self._liberar(recursos)
+
+    def metricas(self):
+        """Latencia del último intercambio y lo que ocupa el tema pendiente."""
+        pendiente = self.pendiente
+        return {
+            "tema_activo": self.activo.nombre if self.activo else None,
+            "tema_pendiente": pendiente.nombre if pendiente else None,
+            "precarga_ms": self.ultima_precarga_ms,
+            "latencia_swap_ms": self.ultima_latencia_swap_ms,
+            "controles_extra": len(pendiente.audio_players) if pendiente else 0,
+            "bytes_extra": self.bytes_pendiente if pendiente else 0,
+        }
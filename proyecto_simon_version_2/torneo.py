@@ -0,0 +1,212 @@
+# torneo.py (Modo torneo: todos los jugadores enfrentan la misma secuencia)
+#
+# En lugar de que cada SimonGame genere su propia secuencia al azar, el torneo
+# tiene UN búfer de secuencia, de solo agregar, generado a partir de una
+# semilla compartida (SecuenciaCompartida, en motor_simon/compartida.py). Cada
+# jugador es un motor en modo compartido: su secuencia es solo una vista (el
+# largo de su ronda) sobre ese búfer, y la validación y el avance de rondas
+# son los de MotorSimon. La memoria es O(largo de la secuencia + jugadores) y
+# no O(jugadores x largo). La clasificación se mantiene ordenada y se
+# actualiza de forma incremental con los eventos de cada motor.
+#
+# Con la interfaz:  SIMON_TORNEO=2024 python interfaz.py   (todas las sesiones del proceso)
+# Con el anfitrión: python anfitrion_sesiones.py --torneo 2024
+# Demo / medición:
+#   python torneo.py --participantes 5000 --rondas 200
+
+import bisect
+import random
+import threading
+from array import array
+
+from main import COLORES
+from motor_simon import (FALLO, IGNORADA, RONDA_COMPLETA, MotorSimon, PartidaIniciada,
+                         PartidaTerminada, RondaCompleta, SecuenciaCompartida)
+
+
+class Participante(MotorSimon):
+    """Jugador sin interfaz: un motor en modo compartido más su nombre."""
+
+    __slots__ = ("nombre",)
+
+    def __init__(self, nombre, secuencia):
+        super().__init__(num_botones=secuencia.num_botones, secuencia_compartida=secuencia)
+        self.nombre = nombre
+
+
+class Torneo:
+    """
+    Clasificación de varios motores que leen la misma SecuenciaCompartida.
+    Los motores pueden ser Participante (torneo sin interfaz, se juega con presionar())
+    o los SimonGame de cada sesión (interfaz Flet, anfitrión de sesiones): la
+    clasificación se entera de los cambios por el bus de eventos de cada motor
+    (las sesiones web corren en hilos distintos: la clasificación va con un lock).
+    on_clasificacion(nombre, posicion_anterior, posicion_nueva) se llama en cada cambio.
+    """
+
+    def __init__(self, semilla, num_botones=len(COLORES), on_clasificacion=None):
+        self.secuencia = SecuenciaCompartida(semilla, num_botones)
+        self.participantes = {}     # nombre -> motor (mientras siga inscrito)
+        self._claves = {}           # nombre -> su clave en la clasificación
+        self._oyentes = {}          # nombre -> suscripción a su bus de eventos
+        self._clasificacion = []    # Lista ordenada de claves
+        self._lock = threading.Lock()
+        self.on_clasificacion = on_clasificacion
+
+    @staticmethod
+    def clave(nombre, motor):
+        """Orden de la clasificación: activos primero, luego mayor puntaje, luego nombre."""
+        return (not motor.game_active, -motor.score, nombre)
+
+    def inscribir(self, nombre, motor=None):
+        """
+        Inscribe un jugador y devuelve su motor. Sin 'motor' se crea un Participante
+        con la partida ya empezada; uno propio tiene que leer self.secuencia.
+        """
+        if motor is None:
+            motor = Participante(nombre, self.secuencia)
+            motor.reiniciar()
+            motor.agregar_paso()
+        elif motor.compartida is not self.secuencia:
+            raise ValueError(f"El motor de '{nombre}' no juega la secuencia de este torneo")
+        with self._lock:
+            if nombre in self._claves:
+                raise ValueError(f"'{nombre}' ya está inscrito")
+            self.participantes[nombre] = motor
+            clave = self.clave(nombre, motor)
+            self._claves[nombre] = clave
+            bisect.insort(self._clasificacion, clave)
+        if not isinstance(motor, Participante):
+            # Los de las sesiones juegan por su cuenta: los cambios llegan por su bus
+            self._oyentes[nombre] = motor.suscribir(lambda evento: self._reordenar(nombre),
+                                                    PartidaIniciada, RondaCompleta, PartidaTerminada,
+                                                    inmediato=True)
+        return motor
+
+    def retirar(self, nombre, conservar=True):
+        """
+        La sesión se cerró: su último resultado queda en la clasificación, su motor no.
+        Con conservar=False tampoco queda el resultado (una sesión que no llegó a jugar).
+        """
+        with self._lock:
+            motor = self.participantes.pop(nombre, None)
+            oyente = self._oyentes.pop(nombre, None)
+            if not conservar and nombre in self._claves:
+                clave = self._claves.pop(nombre)
+                del self._clasificacion[bisect.bisect_left(self._clasificacion, clave)]
+        if motor is not None and oyente is not None:
+            motor.eventos.desuscribir(oyente)
+
+    def reproduccion(self, nombre):
+        """Pasos que hay que mostrarle al participante en su ronda actual."""
+        return self.participantes[nombre].iterar_reproduccion()
+
+    def presionar(self, nombre, boton):
+        """
+        Presión de un Participante (sin interfaz ni bus de eventos). Devuelve True
+        (correcto), False (eliminado) o None si el participante ya estaba eliminado.
+        """
+        motor = self.participantes[nombre]
+        resultado = motor.presionar(boton)
+        if resultado == IGNORADA:
+            return None
+        if resultado == FALLO:
+            motor.terminar()
+            self._reordenar(nombre)
+            return False
+        if resultado == RONDA_COMPLETA:
+            # Sin retardos que esperar: la próxima ronda, un paso más larga, empieza ya
+            motor.agregar_paso()
+            self._reordenar(nombre)
+        return True
+
+    def _reordenar(self, nombre):
+        """Cambió el puntaje o el estado: se mueve solo la clave de ese jugador."""
+        with self._lock:
+            motor = self.participantes.get(nombre)
+            if motor is None:
+                return
+            anterior = self._claves[nombre]
+            nueva = self.clave(nombre, motor)
+            if nueva == anterior:
+                return
+            posicion_anterior = bisect.bisect_left(self._clasificacion, anterior)
+            del self._clasificacion[posicion_anterior]
+            posicion_nueva = bisect.bisect_left(self._clasificacion, nueva)
+            self._clasificacion.insert(posicion_nueva, nueva)
+            self._claves[nombre] = nueva
+
+        if self.on_clasificacion and posicion_nueva != posicion_anterior:
+            self.on_clasificacion(nombre, posicion_anterior, posicion_nueva)
+
+    def clasificacion(self, top=10):
+        """Las primeras posiciones como (posición, nombre, puntaje, activo)."""
+        with self._lock:
+            primeras = self._clasificacion[:top]
+        return [(i + 1, nombre, -menos_score, not eliminado)
+                for i, (eliminado, menos_score, nombre) in enumerate(primeras)]
+
+    def posicion(self, nombre):
+        """Posición actual (1 = primero) de un jugador."""
+        with self._lock:
+            return bisect.bisect_left(self._clasificacion, self._claves[nombre]) + 1
+
+    def __len__(self):
+        return len(self._clasificacion)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    import tracemalloc
+
+    parser = argparse.ArgumentParser(description="Demo del modo torneo de Simon Dice")
+    parser.add_argument("--participantes", type=int, default=2000)
+    parser.add_argument("--rondas", type=int, default=100)
+    parser.add_argument("--error", type=float, default=0.003, help="Probabilidad de fallar cada paso")
+    args = parser.parse_args()
+
+    rnd = random.Random(7)
+    tracemalloc.start()
+    torneo = Torneo(semilla=2024)
+    nombres = [f"jugador{i:05d}" for i in range(args.participantes)]
+    for nombre in nombres:
+        torneo.inscribir(nombre)
+    memoria_inscripcion = tracemalloc.get_traced_memory()[0]
+
+    cambios = 0
+    def contar(*_):
+        global cambios
+        cambios += 1
+    torneo.on_clasificacion = contar
+
+    inicio = time.perf_counter()
+    presiones = 0
+    for _ in range(args.rondas):
+        for nombre in nombres:
+            participante = torneo.participantes[nombre]
+            if not participante.game_active:
+                continue
+            for boton in torneo.reproduccion(nombre):
+                if rnd.random() < args.error:
+                    boton = (boton + 1) % torneo.secuencia.num_botones
+                presiones += 1
+                if not torneo.presionar(nombre, boton):
+                    break
+    segundos = time.perf_counter() - inicio
+    memoria_final = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Lo que ocuparían N secuencias independientes del mismo largo
+    por_jugador = array('B', bytes(len(torneo.secuencia))).buffer_info()[1] * args.participantes
+
+    print("Torneo de Simon Dice")
+    print("========================================")
+    print(f"Participantes: {args.participantes}  |  Largo de la secuencia: {len(torneo.secuencia)}")
+    print(f"Presiones: {presiones:,} en {segundos:.2f} s ({presiones / segundos:,.0f}/s)")
+    print(f"Cambios de clasificación notificados: {cambios:,}")
+    print(f"Memoria tras inscribir: {memoria_inscripcion / 1024:.1f} KB  |  al final: {memoria_final / 1024:.1f} KB")
+    print(f"Secuencia compartida: {len(torneo.secuencia)} B  vs  una por jugador: {por_jugador:,} B")
+    print("Top 5:")
+    for posicion, nombre, score, activo in torneo.clasificacion(5):
+        print(f"  {posicion}. {nombre}  {score} pts{'' if activo else '  (eliminado)'}")
@@ -1,42 +1,68 @@
-import numpy as np
-from scipy.io.wavfile import write
- 
-def generar_sonido(frecuencia, duracion=0.5, nombre_archivo="sonido.wav"):
-    sample_rate = 44100
-    t = np.linspace(0, duracion, int(sample_rate * duracion), False)
-    nota = np.sin(frecuencia * t * 2 * np.pi)
-    envelope = np.ones_like(nota)
-    attack = int(0.1 * sample_rate)
-    release = int(0.2 * sample_rate)
-    envelope[:attack] = np.linspace(0, 1, attack)
-    envelope[-release:] = np.linspace(1, 0, release)
-    nota = nota * envelope
-    audio = nota * (2**15 - 1)
-    audio = audio.astype(np.int16)
-    write(nombre_archivo, sample_rate, audio)
-    print(f"Sonido generado: {nombre_archivo} ({frecuencia} Hz)")
- 
-def main():
-    print("Generador de sonidos para Simon Dice")
-    print("========================================")
-    sonidos = [
-        (440, "sound1.wav"),
-        (523, "sound2.wav"),
-        (659, "sound3.wav"),
-        (784, "sound4.wav")
-    ]
-    for freq, nombre in sonidos:
-        generar_sonido(frecuencia=freq, nombre_archivo=nombre)
-    print("========================================")
-    print("Todos los sonidos han sido generados")
-    print("Archivos creados: sound1.wav, sound2.wav, sound3.wav, sound4.wav")
- 
-if __name__ == "__main__":
-    try:
-        import numpy as np
-        from scipy.io.wavfile import write
-    except ImportError:
-        print("Error: Faltan dependencias")
-        print("Instala con: pip install numpy scipy")
-        exit(1)
-    main()
\ No newline at end of file
+# sonidos.py (Tonos de simon_dice)
+#
+# Uso:
+#   python sonidos.py          -> genera los tonos (los de las dos versiones) en la carpeta única de assets
+#   python sonidos.py --local  -> escribe sound1.wav ... sound4.wav en la carpeta actual
+
+import os
+import sys
+
+import numpy as np
+from scipy.io.wavfile import write
+ 
+def generar_sonido(frecuencia, duracion=0.5, nombre_archivo="sonido.wav"):
+    sample_rate = 44100
+    t = np.linspace(0, duracion, int(sample_rate * duracion), False)
+    nota = np.sin(frecuencia * t * 2 * np.pi)
+    envelope = np.ones_like(nota)
+    attack = int(0.1 * sample_rate)
+    release = int(0.2 * sample_rate)
+    envelope[:attack] = np.linspace(0, 1, attack)
+    envelope[-release:] = np.linspace(1, 0, release)
+    nota = nota * envelope
+    audio = nota * (2**15 - 1)
+    audio = audio.astype(np.int16)
+    write(nombre_archivo, sample_rate, audio)
+    print(f"Sonido generado: {nombre_archivo} ({frecuencia} Hz)")
+ 
+# Tonos de esta versión (también los genera perfiles_audio.py en la carpeta única de assets)
+SONIDOS_A_GENERAR = [
+    (440, "sound1.wav"),
+    (523, "sound2.wav"),
+    (659, "sound3.wav"),
+    (784, "sound4.wav")
+]
+
+def generar_en_assets():
+    """
+    Genera los tonos de las dos versiones en la carpeta única de assets (perfiles de
+    audio de proyecto_simon_version_2/perfiles_audio.py), sin copias por carpeta.
+    """
+    carpeta_v2 = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              "proyecto_simon_version_2")
+    sys.path.insert(0, carpeta_v2)
+    from perfiles_audio import generar
+    generar()
+
+def main():
+    print("Generador de sonidos para Simon Dice")
+    print("========================================")
+    for freq, nombre in SONIDOS_A_GENERAR:
+        generar_sonido(frecuencia=freq, nombre_archivo=nombre)
+    print("========================================")
+    print("Todos los sonidos han sido generados")
+    print("Archivos creados: sound1.wav, sound2.wav, sound3.wav, sound4.wav")
+ 
+if __name__ == "__main__":
+    try:
+        import numpy as np
+        from scipy.io.wavfile import write
+    except ImportError:
+        print("Error: Faltan dependencias")
+        print("Instala con: pip install numpy scipy")
+        exit(1)
+    # Por defecto, a la carpeta única de assets; --local escribe aquí las copias de siempre
+    if "--local" in sys.argv:
+        main()
+    else:
+        generar_en_assets()
\ No newline at end of file